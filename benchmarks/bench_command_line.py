@@ -0,0 +1,50 @@
+"""
+Command line length benchmark
+
+Measures the time needed to parse command lines with a large number of arguments, as built by
+job launchers. The time per argument should not depend on the length of the command line.
+
+Run with ``poetry run python benchmarks/bench_command_line.py``.
+"""
+
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Sequence
+
+from typing_extensions import Annotated
+
+from configpile import Config, Param, Positional, parsers
+
+
+@dataclass(frozen=True)
+class Job(Config):
+    """
+    Configuration with parameters given many times
+    """
+
+    tag: Annotated[Sequence[str], Param.append1(parsers.stripped_str_parser)]
+
+    inputs: Annotated[
+        Sequence[str],
+        Param.append1(
+            parsers.stripped_str_parser, positional=Positional.ZERO_OR_MORE, long_flag_name=None
+        ),
+    ]
+
+
+def bench(n: int) -> None:
+    """
+    Prints the time per argument for a command line of ``n`` arguments
+    """
+    args = [a for i in range(n // 3) for a in ["--tag", f"t{i}", f"input{i}"]]
+    start = time.perf_counter()
+    res = Job.parse_command_line_(cwd=Path.cwd(), args=args, env={})
+    elapsed = time.perf_counter() - start
+    assert isinstance(res, Job)
+    print(f"{len(args):>8} arguments: {elapsed/len(args)*1e9:8.1f} ns/argument")
+
+
+if __name__ == "__main__":
+    for n in [1000, 10000, 100000, 200000, 1000000]:
+        bench(n)
@@ -0,0 +1,68 @@
+"""
+Configuration directory benchmark
+
+Measures the time needed to parse a configuration reading a directory of INI fragments, with
+the INI file cache cleared before each parse, when the fragments are read by a single thread
+and by a thread pool. An optional delay per file read simulates a network filesystem.
+
+Run with ``poetry run python benchmarks/bench_conf_d.py``.
+"""
+
+import tempfile
+import time
+import timeit
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Sequence
+
+from typing_extensions import Annotated
+
+from configpile import Config, Param, ini, parsers
+from configpile.ini import IniContents, ini_cache
+
+
+@dataclass(frozen=True)
+class Service(Config):
+    """
+    Configuration reading a directory of fragments
+    """
+
+    config: Annotated[Sequence[Path], Param.config()]
+    value: Annotated[int, Param.store(parsers.int_parser, default_value="0")]
+
+
+def bench(n_files: int, delay: float, number: int = 3) -> None:
+    """
+    Prints the parsing time for ``n_files`` fragments, each read taking ``delay`` more seconds
+    """
+    read = IniContents.read
+
+    def slow_read(path: Path, scanner: Any = None, cache_dir: Any = None) -> Any:
+        time.sleep(delay)
+        return read(path, scanner, cache_dir)
+
+    IniContents.read = staticmethod(slow_read)  # type: ignore
+    with tempfile.TemporaryDirectory() as tmp:
+        for i in range(n_files):
+            (Path(tmp) / f"{i:04d}.ini").write_text(f"[common]\nvalue = {i}\n")
+        args = ["--config", tmp]
+
+        def parse() -> None:
+            ini_cache.invalidate()
+            res = Service.parse_command_line_(args=args, env={})
+            assert isinstance(res, Service) and res.value == n_files - 1
+
+        timings = {}
+        for readers in [1, 16]:
+            ini.MAX_READERS = readers
+            timings[readers] = min(timeit.repeat(parse, number=number, repeat=3)) / number
+    IniContents.read = read  # type: ignore
+    print(
+        f"{n_files:>4} files, {delay*1e3:4.1f} ms per read: sequential {timings[1]*1e3:8.1f} ms, "
+        f"thread pool {timings[16]*1e3:8.1f} ms"
+    )
+
+
+if __name__ == "__main__":
+    for n, d in [(50, 0.0), (200, 0.0), (50, 0.002), (200, 0.002)]:
+        bench(n, d)
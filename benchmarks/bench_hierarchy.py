@@ -0,0 +1,77 @@
+"""
+Hierarchy benchmark
+
+Measures the time needed to build the processors of a configuration class hierarchy, where a
+base class with many shared parameters has many subclasses (wide) or a long chain of subclasses
+(deep), each adding a few parameters. The incremental build, which extends the processor of the
+parent class, is compared to building each processor from scratch.
+
+Run with ``poetry run python benchmarks/bench_hierarchy.py``.
+"""
+
+import dataclasses
+import timeit
+from typing import Any, List, Tuple
+
+from typing_extensions import Annotated
+
+from configpile import Config, Param, parsers
+from configpile.processor import Processor, processor_cache
+
+
+def make_config(name: str, base: Any, first: int, n: int) -> Any:
+    """
+    Creates a configuration class with ``n`` integer parameters deriving from ``base``
+    """
+    fields: List[Tuple[str, Any]] = [
+        (f"p{i}", Annotated[int, Param.store(parsers.int_parser, default_value=str(i))])
+        for i in range(first, first + n)
+    ]
+    return dataclasses.make_dataclass(name, fields, bases=(base,), frozen=True)
+
+
+def wide(n_shared: int, n_subclasses: int, n_own: int) -> List[Any]:
+    """
+    Creates a base class with ``n_subclasses`` direct subclasses
+    """
+    base = make_config("Base", Config, 0, n_shared)
+    return [base] + [make_config(f"Sub{i}", base, n_shared, n_own) for i in range(n_subclasses)]
+
+
+def deep(n_shared: int, depth: int, n_own: int) -> List[Any]:
+    """
+    Creates a chain of ``depth`` subclasses of a base class
+    """
+    res = [make_config("Base", Config, 0, n_shared)]
+    for i in range(depth):
+        res.append(make_config(f"Sub{i}", res[-1], n_shared + i * n_own, n_own))
+    return res
+
+
+def bench(name: str, config_types: List[Any], number: int = 5) -> None:
+    """
+    Prints the timings for a hierarchy
+    """
+
+    def incremental() -> None:
+        processor_cache.invalidate()
+        for t in config_types:
+            t.processor_()
+
+    def from_scratch() -> None:
+        for t in config_types:
+            Processor.make(t)
+
+    t_incremental = min(timeit.repeat(incremental, number=number, repeat=5)) / number
+    t_scratch = min(timeit.repeat(from_scratch, number=number, repeat=5)) / number
+    print(
+        f"{name:>24}: incremental {t_incremental*1e3:8.3f} ms, "
+        f"from scratch {t_scratch*1e3:8.3f} ms"
+    )
+
+
+if __name__ == "__main__":
+    bench("wide (80 + 30 x 5)", wide(80, 30, 5))
+    bench("wide (80 + 100 x 5)", wide(80, 100, 5))
+    bench("deep (80 + 10 x 5)", deep(80, 10, 5))
+    bench("deep (80 + 40 x 5)", deep(80, 40, 5))
@@ -0,0 +1,63 @@
+"""
+INI file cache benchmark
+
+Measures the time needed to parse a configuration that reads five INI files, as done when the
+configuration is parsed again for each request, with the INI file cache and with the cache
+cleared before each parse.
+
+Run with ``poetry run python benchmarks/bench_ini_cache.py``.
+"""
+
+import tempfile
+import timeit
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Sequence
+
+from typing_extensions import Annotated
+
+from configpile import Config, Param, parsers
+from configpile.ini import ini_cache
+
+
+@dataclass(frozen=True)
+class Service(Config):
+    """
+    Configuration reading several INI files
+    """
+
+    config: Annotated[Sequence[Path], Param.config()]
+    value: Annotated[int, Param.store(parsers.int_parser, default_value="0")]
+
+
+def bench(n_keys: int, number: int = 200) -> None:
+    """
+    Prints the parsing time with five INI files of ``n_keys`` keys each
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        args = []
+        for i in range(5):
+            path = Path(tmp) / f"service{i}.ini"
+            lines = ["[common]", f"value = {i}"] + [f"other{j} = {j}" for j in range(n_keys)]
+            path.write_text("\n".join(lines) + "\n")
+            args.extend(["--config", str(path)])
+
+        def parse() -> None:
+            res = Service.parse_command_line_(args=args, env={})
+            assert isinstance(res, Service) and res.value == 4
+
+        def parse_uncached() -> None:
+            ini_cache.invalidate()
+            parse()
+
+        t_cached = min(timeit.repeat(parse, number=number, repeat=5)) / number
+        t_uncached = min(timeit.repeat(parse_uncached, number=number, repeat=5)) / number
+    print(
+        f"{n_keys:>5} keys per file: cached {t_cached*1e6:9.1f} us, "
+        f"uncached {t_uncached*1e6:9.1f} us"
+    )
+
+
+if __name__ == "__main__":
+    for n in [10, 100, 1000]:
+        bench(n)
@@ -0,0 +1,46 @@
+"""
+Stored INI contents benchmark
+
+Measures the time needed by a new process to read a large INI file, by parsing it and by
+loading the parsed contents stored by a previous run.
+
+Run with ``poetry run python benchmarks/bench_ini_compiled.py``.
+"""
+
+import tempfile
+import timeit
+from pathlib import Path
+
+from configpile.ini import IniContents, IniScanner
+
+
+def bench(n_keys: int, number: int = 5) -> None:
+    """
+    Prints the reading time of a file with ``n_keys`` keys in its single section
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "generated.ini"
+        lines = ["[common]"] + [f"key{j} = {j}" for j in range(n_keys)]
+        path.write_text("\n".join(lines) + "\n")
+        cache_dir = Path(tmp) / "cache"
+        scanner = IniScanner(frozenset(["common"]))
+        IniContents.read(path, cache_dir=cache_dir)
+        IniContents.read(path, scanner, cache_dir)
+        for name, s in [("ConfigParser", None), ("scanner", scanner)]:
+            t_parse = min(
+                timeit.repeat(lambda: IniContents.read(path, s), number=number, repeat=3)
+            )
+            t_stored = min(
+                timeit.repeat(
+                    lambda: IniContents.read(path, s, cache_dir), number=number, repeat=3
+                )
+            )
+            print(
+                f"{n_keys:>7} keys, {name:>12}: parsed {t_parse/number*1e3:8.2f} ms, "
+                f"stored {t_stored/number*1e3:8.2f} ms"
+            )
+
+
+if __name__ == "__main__":
+    for n in [1000, 100000]:
+        bench(n)
@@ -0,0 +1,42 @@
+"""
+Streaming INI scanner benchmark
+
+Measures the time needed to read a generated INI file where only one of many sections is
+relevant, with :class:`configparser.ConfigParser` and with the streaming scanner.
+
+Run with ``poetry run python benchmarks/bench_ini_scanner.py``.
+"""
+
+import tempfile
+import timeit
+from pathlib import Path
+
+from configpile.ini import IniContents, IniScanner
+
+
+def bench(n_sections: int, n_keys: int = 20, number: int = 5) -> None:
+    """
+    Prints the reading time of a file with ``n_sections`` sections of ``n_keys`` keys each
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "generated.ini"
+        lines = ["[common]", "value = 1"]
+        for i in range(n_sections):
+            lines.append(f"[generated{i}]")
+            lines.extend(f"key{j} = {i}:{j}" for j in range(n_keys))
+        path.write_text("\n".join(lines) + "\n")
+        scanner = IniScanner(frozenset(["common"]))
+
+        t_parser = min(timeit.repeat(lambda: IniContents.read(path), number=number, repeat=3))
+        t_scanner = min(
+            timeit.repeat(lambda: IniContents.read(path, scanner), number=number, repeat=3)
+        )
+    print(
+        f"{n_sections:>6} sections: ConfigParser {t_parser/number*1e3:8.2f} ms, "
+        f"scanner {t_scanner/number*1e3:8.2f} ms"
+    )
+
+
+if __name__ == "__main__":
+    for n in [100, 1000, 10000]:
+        bench(n)
@@ -0,0 +1,60 @@
+"""
+Instances benchmark
+
+Measures the time needed to record a large number of values for an ``append1`` parameter
+through the command-line and key/value handlers, and to collect them. The time per value
+should not depend on the number of values.
+
+Run with ``poetry run python benchmarks/bench_instances.py``.
+"""
+
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Sequence
+
+from typing_extensions import Annotated
+
+from configpile import Config, Param, parsers
+
+
+@dataclass(frozen=True)
+class Tagged(Config):
+    """
+    Configuration with a parameter given many times
+    """
+
+    tag: Annotated[Sequence[str], Param.append1(parsers.stripped_str_parser)]
+
+
+def bench(n: int) -> None:
+    """
+    Prints the time per value when recording ``n`` values with each kind of handler
+    """
+    processor = Tagged.processor_()
+    cl_handler = processor.cl_handler.flags["--tag"]
+    kv_handler = processor.ini_processor.kv_handlers["tag"]
+    values = [f"shard{i}" for i in range(n)]
+
+    state = processor._state_with_default_values(Path.cwd())  # pylint: disable=protected-access
+    start = time.perf_counter()
+    for value in values:
+        cl_handler.handle([value], state)
+    cl = time.perf_counter() - start
+
+    state = processor._state_with_default_values(Path.cwd())  # pylint: disable=protected-access
+    start = time.perf_counter()
+    for value in values:
+        kv_handler.handle(value, state)
+    res = processor._finish_processing_state(state)  # pylint: disable=protected-access
+    kv = time.perf_counter() - start
+    assert isinstance(res, Tagged) and len(res.tag) == n
+
+    print(
+        f"{n:>8} values: command line {cl/n*1e9:8.1f} ns/value, key/value {kv/n*1e9:8.1f} ns/value"
+    )
+
+
+if __name__ == "__main__":
+    for n in [1000, 10000, 100000, 1000000]:
+        bench(n)
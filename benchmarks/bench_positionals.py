@@ -0,0 +1,49 @@
+"""
+Positional arguments benchmark
+
+Measures the time needed to parse a command line made of a large number of positional
+arguments, as produced by a shell glob, with and without the ``--`` end-of-options marker.
+
+Run with ``poetry run python benchmarks/bench_positionals.py``.
+"""
+
+import timeit
+from dataclasses import dataclass
+from typing import Sequence
+
+from typing_extensions import Annotated
+
+from configpile import Config, Param, Positional, parsers
+
+
+@dataclass(frozen=True)
+class Files(Config):
+    """
+    Configuration with a variadic positional parameter
+    """
+
+    verbose: Annotated[int, Param.store(parsers.int_parser, default_value="0")]
+    files: Annotated[
+        Sequence[str],
+        Param.append1(parsers.str_parser, positional=Positional.ONE_OR_MORE, long_flag_name=None),
+    ]
+
+
+def bench(n: int, number: int = 5) -> None:
+    """
+    Prints the parsing time for ``n`` positional arguments
+    """
+    paths = [f"data/file{i:06d}.txt" for i in range(n)]
+    for name, args in [("run", paths), ("--", ["--"] + paths)]:
+        t = min(
+            timeit.repeat(
+                lambda: Files.parse_command_line_(args=args, env={}), number=number, repeat=5
+            )
+        )
+        print(f"{n:>8} arguments ({name:>3}): {t / number * 1e3:8.2f} ms")
+
+
+if __name__ == "__main__":
+    Files.processor_()
+    for n in [1000, 10000, 100000]:
+        bench(n)
@@ -0,0 +1,61 @@
+"""
+Response file benchmark
+
+Measures the time needed to parse a response file containing a large number of paths, and the
+peak memory used while parsing it, which should not include a copy of the whole argument list
+on top of the parsed values.
+
+Run with ``poetry run python benchmarks/bench_response_files.py``.
+"""
+
+import tempfile
+import time
+import tracemalloc
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Sequence
+
+from typing_extensions import Annotated
+
+from configpile import Config, Param, Positional, parsers
+
+
+@dataclass(frozen=True)
+class Files(Config):
+    """
+    Configuration taking a list of files
+    """
+
+    response_file_prefix_ = "@"
+
+    inputs: Annotated[
+        Sequence[Path],
+        Param.append1(
+            parsers.path_parser, positional=Positional.ZERO_OR_MORE, long_flag_name=None
+        ),
+    ]
+
+
+def bench(n: int) -> None:
+    """
+    Prints the timings for a response file with ``n`` paths
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        response_file = Path(tmp) / "args.txt"
+        response_file.write_text("".join(f"data/shard-{i:08d}.bin\n" for i in range(n)))
+        args = [f"@{response_file}"]
+        start = time.perf_counter()
+        res = Files.parse_command_line_(cwd=Path(tmp), args=args, env={})
+        elapsed = time.perf_counter() - start
+        assert isinstance(res, Files) and len(res.inputs) == n
+        del res
+        tracemalloc.start()
+        Files.parse_command_line_(cwd=Path(tmp), args=args, env={})
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    print(f"{n:>8} paths: {elapsed/n*1e9:8.1f} ns/path, peak memory {peak/n:6.1f} bytes/path")
+
+
+if __name__ == "__main__":
+    for n in [1000, 10000, 100000, 500000]:
+        bench(n)
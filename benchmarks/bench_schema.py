@@ -0,0 +1,53 @@
+"""
+Schema benchmark
+
+Measures the time needed to create a configuration with :func:`configpile.config.make_config`,
+build its processor, parse a command line and format the help, for schemas with up to
+10,000 parameters. The timings should grow linearly with the number of parameters.
+
+Run with ``poetry run python benchmarks/bench_schema.py``.
+"""
+
+import time
+from pathlib import Path
+from typing import Any, List, Tuple
+
+from configpile import Param, parsers
+from configpile.config import make_config
+
+
+def entries(n: int) -> List[Tuple[str, Param[Any], str]]:
+    """
+    Returns a schema with ``n`` integer parameters
+    """
+    return [
+        (f"p{i}", Param.store(parsers.int_parser, default_value=str(i)), f"Parameter {i}")
+        for i in range(n)
+    ]
+
+
+def bench(n: int) -> None:
+    """
+    Prints the timings for a schema with ``n`` parameters
+    """
+    schema = entries(n)
+    start = time.perf_counter()
+    config_type = make_config("Schema", schema)
+    created = time.perf_counter()
+    processor = config_type.processor_()
+    built = time.perf_counter()
+    res = config_type.parse_command_line_(cwd=Path.cwd(), args=["--p0", "5"], env={})
+    assert isinstance(res, config_type)
+    parsed = time.perf_counter()
+    processor.argument_parser.format_help()
+    documented = time.perf_counter()
+    print(
+        f"{n:>6} params: create {(created - start)*1e3:8.1f} ms, "
+        f"build {(built - created)*1e3:8.1f} ms, parse {(parsed - built)*1e3:8.1f} ms, "
+        f"help {(documented - parsed)*1e3:8.1f} ms"
+    )
+
+
+if __name__ == "__main__":
+    for n in [100, 1000, 10000, 20000]:
+        bench(n)
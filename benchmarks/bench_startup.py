@@ -0,0 +1,54 @@
+"""
+Startup benchmark
+
+Measures the time needed to build a processor and parse a command line with a fresh processor,
+which is what a short-lived command-line tool pays at each invocation. The time needed to
+construct the argument parser, which is only used to display help, is reported separately.
+
+Run with ``poetry run python benchmarks/bench_startup.py``.
+"""
+
+import dataclasses
+import timeit
+from pathlib import Path
+from typing import Any, List, Tuple
+
+from typing_extensions import Annotated
+
+from configpile import Config, Param, parsers
+from configpile.calculator import Calc
+
+
+def make_config(n: int) -> Any:
+    """
+    Creates a configuration class with ``n`` integer parameters
+    """
+    fields: List[Tuple[str, Any]] = [
+        (f"p{i}", Annotated[int, Param.store(parsers.int_parser, default_value=str(i))])
+        for i in range(n)
+    ]
+    return dataclasses.make_dataclass("Wide", fields, bases=(Config,), frozen=True)
+
+
+def bench(name: str, config_type: Any, args: List[str], number: int = 20) -> None:
+    """
+    Prints the timings for a configuration
+    """
+
+    def startup() -> None:
+        config_type.invalidate_processor_()
+        config_type.parse_command_line_(cwd=Path.cwd(), args=args, env={})
+
+    def with_help() -> None:
+        config_type.invalidate_processor_()
+        config_type.processor_().argument_parser.format_help()
+
+    t_startup = min(timeit.repeat(startup, number=number, repeat=5)) / number
+    t_help = min(timeit.repeat(with_help, number=number, repeat=5)) / number
+    print(f"{name:>12}: parse {t_startup*1e3:8.3f} ms, build with help {t_help*1e3:8.3f} ms")
+
+
+if __name__ == "__main__":
+    bench("calculator", Calc, ["1", "2", "3"])
+    for n in [10, 100, 1000]:
+        bench(f"{n} params", make_config(n), ["--p0", "5"], number=5)
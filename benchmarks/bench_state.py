@@ -0,0 +1,76 @@
+"""
+Parsing state benchmark
+
+Measures the time and memory needed to create the parsing state of a configuration with many
+parameters, and to parse a short command line, comparing the slot layout with the previous
+layout, a dictionary holding one list of values per parameter name.
+
+Run with ``poetry run python benchmarks/bench_state.py``.
+"""
+
+import timeit
+import tracemalloc
+from typing import Any, Callable, Dict, List
+
+from configpile import Param, parsers
+from configpile.config import make_config
+
+
+def dict_state(params: List[Param[Any]]) -> Dict[str, List[Any]]:
+    """
+    Creates the instances of a parse as done by the previous layout
+    """
+    instances: Dict[str, List[Any]] = {}
+    for p in params:
+        assert p.name is not None
+        if p.default_value is not None:
+            instances[p.name] = [p.parser.parse(p.default_value)]
+        else:
+            instances[p.name] = []
+    return instances
+
+
+def allocated(f: Callable[[], Any]) -> int:
+    """
+    Returns the number of bytes allocated by a function call, and still held by its result
+    """
+    tracemalloc.start()
+    res = f()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del res
+    return size
+
+
+def bench(n: int, number: int = 200) -> None:
+    """
+    Prints the timings and memory for a configuration with ``n`` parameters
+    """
+    entries = [
+        (f"p{i}", Param.store(parsers.int_parser, default_value=str(i)), f"Parameter {i}")
+        for i in range(n)
+    ]
+    config_type = make_config("Wide", entries)
+    processor = config_type.processor_()
+    params = [*processor.params_by_name.values()]
+    args = ["--p0", "1", "--p1", "2"]
+
+    t_dict = min(timeit.repeat(lambda: dict_state(params), number=number, repeat=5)) / number
+    t_slots = min(timeit.repeat(lambda: processor.layout.new_state(None), number=number, repeat=5))
+    t_parse = min(
+        timeit.repeat(
+            lambda: config_type.parse_command_line_(args=args, env={}), number=number, repeat=5
+        )
+    )
+    m_dict = allocated(lambda: dict_state(params))
+    m_slots = allocated(lambda: processor.layout.new_state(None))
+    print(
+        f"{n:>6} parameters: state dict {t_dict*1e6:9.1f} us {m_dict:>9} B, "
+        f"slots {t_slots/number*1e6:9.1f} us {m_slots:>9} B, "
+        f"parse {t_parse/number*1e6:9.1f} us"
+    )
+
+
+if __name__ == "__main__":
+    for n in [10, 100, 1000, 10000]:
+        bench(n)
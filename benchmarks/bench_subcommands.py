@@ -0,0 +1,68 @@
+"""
+Subcommand dispatch benchmark
+
+Writes a package with a given number of subcommand modules in a temporary directory, and
+measures in a fresh interpreter the time needed to parse the command line of one subcommand.
+With lazy subcommands, this time should not depend on the number of subcommands.
+
+Run with ``poetry run python benchmarks/bench_subcommands.py``.
+"""
+
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+COMMAND_MODULE = '''
+from dataclasses import dataclass
+
+from typing_extensions import Annotated
+
+from configpile import Config, Param, parsers
+
+
+@dataclass(frozen=True)
+class Command(Config):
+    """
+    Subcommand {i}
+    """
+
+    value: Annotated[int, Param.store(parsers.int_parser, default_value="0")]
+'''
+
+MAIN_MODULE = """
+import sys
+
+from configpile.subcommands import Subcommand, Subcommands
+
+cli = Subcommands.make(
+    *[Subcommand.make(f"cmd{{i}}", f"commands.cmd{{i}}:Command") for i in range({n})]
+)
+name, config = cli.from_command_line(args=["cmd0", "--value", "1"], env={{}})
+assert config.value == 1
+"""
+
+
+def bench(n: int, repeat: int = 5) -> None:
+    """
+    Prints the dispatch time for ``n`` subcommands
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        package = Path(tmp) / "commands"
+        package.mkdir()
+        (package / "__init__.py").write_text("")
+        for i in range(n):
+            (package / f"cmd{i}.py").write_text(COMMAND_MODULE.format(i=i))
+        (Path(tmp) / "main.py").write_text(MAIN_MODULE.format(n=n))
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            subprocess.run([sys.executable, "main.py"], cwd=tmp, check=True)
+            timings.append(time.perf_counter() - start)
+    print(f"{n:>5} subcommands: {min(timings)*1e3:8.1f} ms")
+
+
+if __name__ == "__main__":
+    for n in [1, 10, 100, 1000]:
+        bench(n)
@@ -1,10 +1,13 @@
 __version__ = "10.1.1"
 
-from . import parsers
-from .arg import Derived, Expander, Param, Positional
-from .config import Config
-from .parsers import ForceCase, Parser
-from .userr import Err, Res
+from typing import TYPE_CHECKING, Any, List
+
+if TYPE_CHECKING:
+    from . import parsers
+    from .arg import Derived, Expander, Param, Positional
+    from .config import Config
+    from .parsers import ForceCase, Parser
+    from .userr import Err, Res
 
 # when updating this, update the docs/source/api.rst list
 
@@ -20,3 +23,31 @@ __all__ = [
     "parsers",
     "ForceCase",
 ]
+
+# the reexported symbols are imported on first access, so that "import configpile" stays cheap
+_lazy_attributes = {
+    "Config": "config",
+    "Derived": "arg",
+    "Err": "userr",
+    "Expander": "arg",
+    "Res": "userr",
+    "Param": "arg",
+    "Parser": "parsers",
+    "Positional": "arg",
+    "parsers": "parsers",
+    "ForceCase": "parsers",
+}
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _lazy_attributes.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module = __import__(f"{__name__}.{module_name}", fromlist=[name])
+    value = module if name == module_name else getattr(module, name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted([*globals(), *__all__])
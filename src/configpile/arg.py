@@ -66,9 +66,11 @@ from .handlers import (
     CLInserter,
     CLParam,
     CLRootParam,
+    CLUnparsedParam,
     KVConfigParam,
     KVParam,
     KVRootParam,
+    KVUnparsedParam,
 )
 from .parsers import Parser, path_parser
 
@@ -80,7 +82,7 @@ _Item_co = TypeVar("_Item_co", covariant=True)
 
 if TYPE_CHECKING:
     from .config import Config
-    from .processor import ProcessorFactory
+    from .processor import ArgumentParserGroups, ProcessorFactory
 
 
 _Arg = TypeVar("_Arg", bound="Arg")
@@ -149,7 +151,7 @@ class Arg:
     def updated(
         self: _Arg,
         name: str,
-        help: str,  # pylint: disable=redefined-builtin
+        help: Optional[str],  # pylint: disable=redefined-builtin
         env_prefix: Optional[str],
     ) -> _Arg:
         """
@@ -158,7 +160,7 @@ class Arg:
         Args:
             self:
             name: Identifier name
-            help: Help string (derived from autodoc syntax)
+            help: Help string (derived from autodoc syntax), if known
             env_prefix: Environment prefix
 
         Returns:
@@ -175,6 +177,17 @@ class Arg:
         """
         raise NotImplementedError
 
+    def update_argument_parser(self, groups: ArgumentParserGroups) -> None:
+        """
+        Adds this argument to the argument parser used to display help
+
+        This is called lazily, only when help is displayed or documentation is generated.
+
+        Args:
+            groups: Argument parser groups to update
+        """
+        raise NotImplementedError
+
     def argparse_argument_kwargs(self) -> Mapping[str, Any]:
         """
         Returns the keyword arguments for use with argparse.ArgumentParser.add_argument
@@ -204,7 +217,9 @@ class Expander(Arg):
     def update_processor(self, pf: ProcessorFactory[_Config]) -> None:
         for flag in self.all_flags():
             pf.cl_flag_handlers[flag] = CLInserter([self.new_flag, self.new_value])
-        pf.ap_commands.add_argument(*self.all_flags(), **self.argparse_argument_kwargs())
+
+    def update_argument_parser(self, groups: ArgumentParserGroups) -> None:
+        groups.commands.add_argument(*self.all_flags(), **self.argparse_argument_kwargs())
 
     @staticmethod
     def make(
@@ -296,6 +311,9 @@ class Param(Arg, Generic[_Value_co]):
     #: This prefix is provided by :attr:`.App.env_prefix_`
     env_var_name: Union[str, Derived, None]
 
+    #: Index of the parameter in the parsing state, assigned when the processor is built
+    index: Optional[int] = None
+
     def update_dict_(
         self,
         name: str,
@@ -352,33 +370,52 @@ class Param(Arg, Generic[_Value_co]):
     def update_processor(self, pf: ProcessorFactory[_Config]) -> None:
 
         assert self.name is not None
-        pf.params_by_name[self.name] = self
+        assert self.name not in pf.params_by_name, f"Parameter {self.name} is already present"
+        param = dataclasses.replace(self, index=len(pf.params_by_name))
+        pf.params_by_name[self.name] = param
         if self.positional is not None:
-            pf.cl_positionals.append(self)
+            pf.cl_positionals.append(param)
+        # only the last value of the parameter is used, so values can be parsed at the end
+        unparsed = (
+            pf.parse_mode.is_lazy()
+            and self.collector.keeps_last()
+            and not self.is_config
+            and not self.is_root_path
+        )
         for flag in self.all_flags():
             if self.is_config:
-                pf.cl_flag_handlers[flag] = CLConfigParam(cast(Param[Sequence[Path]], self))
+                pf.cl_flag_handlers[flag] = CLConfigParam(cast(Param[Sequence[Path]], param))
             elif self.is_root_path:
-                pf.cl_flag_handlers[flag] = CLRootParam(cast(Param[Path], self))
+                pf.cl_flag_handlers[flag] = CLRootParam(cast(Param[Path], param))
+            elif unparsed:
+                pf.cl_flag_handlers[flag] = CLUnparsedParam(param)
             else:
-                pf.cl_flag_handlers[flag] = CLParam(self)
+                pf.cl_flag_handlers[flag] = CLParam(param)
 
         for key in self.all_config_key_names():
-            pf.ini_handlers[key] = KVParam(self)
+            if self.is_config:
+                pf.ini_handlers[key] = KVConfigParam(cast(Param[Sequence[Path]], param))
+            elif unparsed:
+                pf.ini_handlers[key] = KVUnparsedParam(param)
+            else:
+                pf.ini_handlers[key] = KVParam(param)
 
         for name in self.all_env_var_names():
             if self.is_config:
-                pf.env_handlers[name] = KVConfigParam(cast(Param[Sequence[Path]], self))
+                pf.env_handlers[name] = KVConfigParam(cast(Param[Sequence[Path]], param))
             elif self.is_root_path:
-                pf.env_handlers[name] = KVRootParam(cast(Param[Path], self))
+                pf.env_handlers[name] = KVRootParam(cast(Param[Path], param))
+            elif unparsed:
+                pf.env_handlers[name] = KVUnparsedParam(param)
             else:
-                pf.env_handlers[name] = KVParam(self)
+                pf.env_handlers[name] = KVParam(param)
 
+    def update_argument_parser(self, groups: ArgumentParserGroups) -> None:
         flags = self.all_flags()
         if self.is_required():
-            pf.ap_required.add_argument(*flags, dest=self.name, **self.argparse_argument_kwargs())
+            groups.required.add_argument(*flags, dest=self.name, **self.argparse_argument_kwargs())
         else:
-            pf.ap_optional.add_argument(*flags, dest=self.name, **self.argparse_argument_kwargs())
+            groups.optional.add_argument(*flags, dest=self.name, **self.argparse_argument_kwargs())
 
     @staticmethod
     def store(
@@ -471,15 +508,25 @@ class Param(Arg, Generic[_Value_co]):
         help: Optional[str] = None,  # pylint: disable=redefined-builtin
         short_flag_name: Optional[str] = None,
         long_flag_name: Union[str, Derived, None] = Derived.KEBAB_CASE,
+        config_key_name: Union[str, Derived, None] = None,
         env_var_name: Union[str, Derived, None] = None,
     ) -> Param[Sequence[Path]]:
         """
         Creates a parameter that parses configuration files and stores their names
 
+        A path can designate a directory, standing for the ``*.ini`` files it contains in lexical
+        order, or a glob pattern that does not name an existing file.
+
+        When a configuration key name is given, configuration files can include other files
+        using that key, with paths relative to the including file. Included files are processed
+        before the file including them, which thus overrides their values.
+
         Keyword Args:
             help: Help description (autodoc/docstring is used otherwise)
             short_flag_name: Short option name (optional)
             long_flag_name: Long option name (auto. derived from fieldname by default)
+            config_key_name: Key used to include files in configuration files (forbidden by
+                             default)
             env_var_name: Environment variable name (forbidden by default)
 
         Returns:
@@ -493,7 +540,7 @@ class Param(Arg, Generic[_Value_co]):
             positional=None,
             short_flag_name=short_flag_name,
             long_flag_name=long_flag_name,
-            config_key_name=None,
+            config_key_name=config_key_name,
             env_var_name=env_var_name,
             is_config=True,
             is_root_path=False,
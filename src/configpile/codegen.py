@@ -0,0 +1,532 @@
+"""
+Ahead-of-time compilation of configuration processors
+
+This module turns a :class:`~configpile.config.Config` subclass into the Python source of a module
+that processes command lines and environment variables for that configuration, without building
+a :class:`~configpile.processor.Processor`.
+
+The generated ``process_command_line`` function is a straight-line loop over a flag dispatch
+dictionary. The built-in parsers of :mod:`configpile.parsers` are inlined, other parsers are
+retrieved from the class annotations, and the configuration dataclass is constructed directly.
+
+The generated code only handles the successful path. Whenever it meets a situation it does not
+handle (an error, a configuration file, an unknown flag...), it delegates the whole processing
+to :meth:`.Processor.process_command_line`, so that results and errors are always identical.
+
+Importing the generated module imports the module defining the configuration, and thus
+:mod:`configpile.config` and the modules defining parameters (:mod:`configpile.arg`,
+:mod:`configpile.handlers`, :mod:`configpile.collector` and :mod:`configpile.parsers`). The
+processor, and the modules reading INI files or building schema snapshots, are only imported
+when the processing is delegated.
+
+The generated module is written using :func:`.write_module`, or from the command line::
+
+    python -m configpile.codegen package.module:ConfigClass output.py
+
+and its behavior can be compared with the processor using :func:`.check_equivalence`.
+"""
+
+from __future__ import annotations
+
+import inspect
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+    Type,
+    cast,
+)
+
+from . import parsers
+from .arg import Param
+from .enums import ForceCase, Positional
+from .handlers import CLInserter, CLParam, CLSpecialAction, CLUnparsedParam
+from .parsers import Parser, _Choices, _SequenceOfOne
+from .snapshot import SchemaSnapshot
+
+if TYPE_CHECKING:
+    from .config import Config
+
+#: Helper functions for the built-in parsers that can be inlined
+_BUILTIN_HELPERS: Mapping[str, str] = {
+    "_int": """
+def _int(value: str) -> int:
+    try:
+        return int(value)
+    except Exception:
+        raise _Fallback from None
+""",
+    "_float": """
+def _float(value: str) -> float:
+    try:
+        return float(value)
+    except Exception:
+        raise _Fallback from None
+""",
+    "_path": """
+def _path(value: str) -> Path:
+    try:
+        return Path(value)
+    except Exception:
+        raise _Fallback from None
+""",
+}
+
+#: Types whose values can be written as literals in the generated code
+_LITERAL_TYPES = (str, int, float, bool, type(None))
+
+_HEADER = '''"""
+Command-line processing for {module}.{qualname}
+
+Generated by configpile {version}, do not edit: regenerate using ``python -m configpile.codegen``.
+"""
+# pylint: skip-file
+# mypy: ignore-errors
+from pathlib import Path
+from typing import Any, Iterator, List, Mapping, Optional, Sequence
+
+from configpile.enums import SpecialAction
+from configpile.userr import Err
+
+from {module} import {root}
+
+#: Configuration processed by this module
+config_type = {qualname}
+
+#: Hash of the configuration source when this module was generated
+SOURCE_HASH = {source_hash!r}
+
+
+class _Fallback(Exception):
+    """
+    Raised when the processing must be delegated to the configuration processor
+    """
+
+
+_MISSING = object()
+
+_params_by_name: Optional[Mapping[str, Any]] = None
+
+
+def _param(name: str) -> Any:
+    global _params_by_name
+    if _params_by_name is None:
+        from typing_extensions import get_args, get_type_hints
+
+        from configpile.arg import Param
+
+        hints = get_type_hints(config_type, include_extras=True)
+        _params_by_name = {{
+            n: p for n, t in hints.items() for p in get_args(t)[1:] if isinstance(p, Param)
+        }}
+    return _params_by_name[name]
+
+
+def _parse(name: str, value: str) -> Any:
+    res = _param(name).parser.parse(value)
+    if isinstance(res, Err):
+        raise _Fallback
+    return res
+
+
+def _collect(name: str, instances: List[Any]) -> Any:
+    res = _param(name).collector.collect(instances)
+    if isinstance(res, Err):
+        raise _Fallback
+    return res
+
+
+def _next_value(stack: List[Iterator[str]]) -> str:
+    while stack:
+        token = next(stack[-1], None)
+        if token is not None:
+            return token
+        stack.pop()
+    raise _Fallback
+'''
+
+_FOOTER = '''
+
+def process_command_line(cwd: Path, args: Sequence[str], env: Mapping[str, str]) -> Any:
+    """
+    Processes command-line arguments and environment variables
+
+    See :meth:`configpile.processor.Processor.process_command_line`.
+    """
+    try:
+        return _process(cwd, args, env)
+    except _Fallback:
+        return config_type.processor_().process_command_line(cwd, args, env)
+'''
+
+
+@dataclass
+class _Generator:
+    """
+    Accumulates the generated code
+    """
+
+    #: Helper functions by name
+    helpers: Dict[str, str] = field(default_factory=dict)
+
+    #: Lines of the processing function body
+    lines: List[str] = field(default_factory=list)
+
+    #: Names of the helpers generated for parsers, indexed by parser identity
+    parser_helpers: Dict[int, str] = field(default_factory=dict)
+
+    def emit(self, indent: int, line: str) -> None:
+        """
+        Adds a line to the processing function
+
+        Args:
+            indent: Indentation level
+            line: Line to add
+        """
+        self.lines.append("    " * indent + line)
+
+    def inline(self, parser: Parser[Any], name: str, value: str) -> str:
+        """
+        Returns an expression that parses a value, raising ``_Fallback`` on error
+
+        Args:
+            parser: Parser to inline
+            name: Name of the parameter the parser belongs to
+            value: Expression of the string to parse
+
+        Returns:
+            A Python expression
+        """
+        if parser is parsers.str_parser:
+            return value
+        if parser is parsers.stripped_str_parser:
+            return f"{value}.strip()"
+        for helper, builtin in [
+            ("_int", parsers.int_parser),
+            ("_float", parsers.float_parser),
+            ("_path", parsers.path_parser),
+        ]:
+            if parser is builtin:
+                self.helpers[helper] = _BUILTIN_HELPERS[helper]
+                return f"{helper}({value})"
+        if isinstance(parser, _SequenceOfOne):
+            return f"[{self.inline(parser.wrapped, name, value)}]"
+        if isinstance(parser, _Choices):
+            choices = {**parser.mapping, **parser.aliases}
+            if id(parser) in self.parser_helpers:
+                return f"{self.parser_helpers[id(parser)]}({value})"
+            if all(isinstance(v, _LITERAL_TYPES) for v in choices.values()):
+                helper = f"_choices_{len(self.parser_helpers)}"
+                self.parser_helpers[id(parser)] = helper
+                normalize = "value.strip()" if parser.strip else "value"
+                if parser.force_case is ForceCase.LOWER:
+                    normalize += ".lower()"
+                elif parser.force_case is ForceCase.UPPER:
+                    normalize += ".upper()"
+                self.helpers[helper] = f"""
+{helper.upper()} = {choices!r}
+
+
+def {helper}(value: str) -> Any:
+    try:
+        return {helper.upper()}[{normalize}]
+    except KeyError:
+        raise _Fallback from None
+"""
+                return f"{helper}({value})"
+        return f"_parse({name!r}, {value})"
+
+
+def _store(gen: _Generator, indent: int, i: int, param: Param[Any], value: str) -> None:
+    """
+    Emits the code that parses a value and stores it as an instance of a parameter
+
+    Args:
+        gen: Code generator
+        indent: Indentation level
+        i: Parameter index
+        param: Parameter
+        value: Expression of the string to parse
+    """
+    assert param.name is not None
+    if param.collector.keeps_last():
+        gen.emit(indent, f"v{i} = {gen.inline(param.parser, param.name, value)}")
+    elif param.collector.appends():
+        if isinstance(param.parser, _SequenceOfOne):
+            item = gen.inline(param.parser.wrapped, param.name, value)
+            gen.emit(indent, f"v{i}.append({item})")
+        else:
+            gen.emit(indent, f"v{i}.extend({gen.inline(param.parser, param.name, value)})")
+    else:
+        gen.emit(indent, f"v{i}.append({gen.inline(param.parser, param.name, value)})")
+
+
+def _validator_names(config_type: Type[Config]) -> Sequence[str]:
+    """
+    Returns the names of the validators of a configuration
+
+    See :meth:`.Config.validators_`
+    """
+    return [
+        name
+        for name, _ in inspect.getmembers(config_type, inspect.isroutine)
+        if name.startswith("validate_")
+    ]
+
+
+def generate_source(config_type: Type[Config]) -> str:
+    """
+    Generates the source of a module processing a configuration
+
+    Args:
+        config_type: Configuration to compile
+
+    Raises:
+        ValueError: If the configuration class cannot be imported from its module
+
+    Returns:
+        Python source code
+    """
+    from . import __version__  # pylint: disable=import-outside-toplevel
+
+    qualname = config_type.__qualname__
+    if "<locals>" in qualname:
+        raise ValueError(f"Class {qualname} cannot be imported from module level")
+    processor = config_type.processor_()
+    params = list(processor.params_by_name.values())
+    index = {p.name: i for i, p in enumerate(params)}
+    gen = _Generator()
+
+    # initial state, with default values
+    for i, p in enumerate(params):
+        assert p.name is not None
+        if p.collector.keeps_last():
+            if p.default_value is None:
+                gen.emit(1, f"v{i}: Any = _MISSING")
+            else:
+                default = gen.inline(p.parser, p.name, repr(p.default_value))
+                gen.emit(1, f"v{i}: Any = {default}")
+        else:
+            gen.emit(1, f"v{i}: Any = []")
+            if p.default_value is not None:
+                _store(gen, 1, i, p, repr(p.default_value))
+    gen.emit(1, "special: Optional[SpecialAction] = None")
+
+    # environment variables
+    for name, env_handler in processor.env_handlers.items():
+        env_param = getattr(env_handler, "param", None)
+        if isinstance(env_param, Param) and not env_param.is_config and not env_param.is_root_path:
+            gen.emit(1, f"value = env.get({name!r})")
+            gen.emit(1, "if value is not None:")
+            _store(gen, 2, index[env_param.name], env_param, "value")
+        else:
+            gen.emit(1, f"if {name!r} in env:")
+            gen.emit(2, "raise _Fallback")
+
+    # command line
+    codes: Dict[str, int] = {}
+    branches: List[Tuple[int, Callable[[], None]]] = []
+
+    def add_branch(emit: Callable[[], None]) -> int:
+        branches.append((len(branches), emit))
+        return len(branches) - 1
+
+    param_codes: Dict[int, int] = {}
+    special_codes: Dict[str, int] = {}
+    for flag, handler in processor.cl_handler.flags.items():
+        # values recorded unparsed give the same result when parsed eagerly without error
+        if type(handler) in (CLParam, CLUnparsedParam):  # pylint: disable=unidiomatic-typecheck
+            p = cast(CLParam[Any], handler).param
+            i = index[p.name]
+            if i not in param_codes:
+
+                def emit_param(p: Param[Any] = p, i: int = i) -> None:
+                    gen.emit(3, "value = _next_value(stack)")
+                    _store(gen, 3, i, p, "value")
+
+                param_codes[i] = add_branch(emit_param)
+            codes[flag] = param_codes[i]
+        elif isinstance(handler, CLSpecialAction):
+            action = handler.special_action.name
+            if action not in special_codes:
+
+                def emit_special(action: str = action) -> None:
+                    gen.emit(3, "if special is not None:")
+                    gen.emit(4, "raise _Fallback")
+                    gen.emit(3, f"special = SpecialAction.{action}")
+
+                special_codes[action] = add_branch(emit_special)
+            codes[flag] = special_codes[action]
+        elif isinstance(handler, CLInserter):
+
+            def emit_inserter(inserted: Tuple[str, ...] = tuple(handler.inserted_args)) -> None:
+                gen.emit(3, f"stack.append(iter({inserted!r}))")
+
+            codes[flag] = add_branch(emit_inserter)
+        else:  # configuration files, root path and custom handlers
+            codes[flag] = -1
+
+    prefix = config_type.response_file_prefix_
+    if prefix is not None:  # response files are read by the processor
+        gen.emit(1, f"if any([arg.startswith({prefix!r}) for arg in args]):")
+        gen.emit(2, "raise _Fallback")
+    gen.emit(1, "stack: List[Iterator[str]] = [iter(args)]")
+    gen.emit(1, "pos = 0")
+    gen.emit(1, "while stack:")
+    gen.emit(2, "token = next(stack[-1], None)")
+    gen.emit(2, "if token is None:")
+    gen.emit(3, "stack.pop()")
+    gen.emit(3, "continue")
+    gen.emit(2, "code = _FLAGS.get(token)")
+    gen.emit(2, "if code is None:")
+    gen.emit(3, 'if token.startswith("-"):')
+    gen.emit(4, "raise _Fallback")
+    positionals = [p for p in params if p.positional is not None]
+    for k, p in enumerate(positionals):
+        gen.emit(3, f"{'if' if k == 0 else 'elif'} pos == {k}:")
+        _store(gen, 4, index[p.name], p, "token")
+        if p.positional == Positional.ONCE:
+            gen.emit(4, f"pos = {k + 1}")
+    if positionals:
+        gen.emit(3, "else:")
+        gen.emit(4, "raise _Fallback")
+    else:
+        gen.emit(3, "raise _Fallback")
+    for code, emit in branches:
+        gen.emit(2, f"elif code == {code}:")
+        emit()
+    gen.emit(2, "else:")
+    gen.emit(3, "raise _Fallback")
+    gen.emit(1, "if special is not None:")
+    gen.emit(2, "return special")
+
+    # collection and validation
+    for i, p in enumerate(params):
+        if p.collector.keeps_last():
+            gen.emit(1, f"if v{i} is _MISSING:")
+            gen.emit(2, "raise _Fallback")
+        elif not p.collector.appends():
+            gen.emit(1, f"v{i} = _collect({p.name!r}, v{i})")
+    gen.emit(1, "config = config_type(")
+    for i, p in enumerate(params):
+        gen.emit(2, f"{p.name}=v{i},")
+    gen.emit(1, ")")
+    gen.emit(1, "err = Err.collect(*[f(config) for f in _VALIDATORS])")
+    gen.emit(1, "if err is not None:")
+    gen.emit(2, "return err")
+    gen.emit(1, "return config")
+
+    source_hash = SchemaSnapshot.source_hash_of(config_type)
+    validators = "".join(f"config_type.{name}," for name in _validator_names(config_type))
+    parts = [
+        _HEADER.format(
+            module=config_type.__module__,
+            qualname=qualname,
+            root=qualname.split(".")[0],
+            version=__version__,
+            source_hash="" if source_hash is None else source_hash,
+        ),
+        *["\n\n" + helper.strip("\n") + "\n" for helper in gen.helpers.values()],
+        f"\n\n_FLAGS = {codes!r}\n",
+        f"\n_VALIDATORS = ({validators})\n",
+        "\n\ndef _process(cwd: Path, args: Sequence[str], env: Mapping[str, str]) -> Any:\n",
+        "\n".join(gen.lines) + "\n",
+        _FOOTER,
+    ]
+    return "".join(parts)
+
+
+def write_module(config_type: Type[Config], path: Path) -> None:
+    """
+    Writes the module processing a configuration
+
+    Args:
+        config_type: Configuration to compile
+        path: Path of the Python file to write
+    """
+    path.write_text(generate_source(config_type), encoding="utf-8")
+
+
+def is_up_to_date(module: Any) -> bool:
+    """
+    Returns whether a generated module corresponds to the current source of its configuration
+
+    Args:
+        module: Generated module
+
+    Returns:
+        Whether the configuration source and the configpile version did not change
+    """
+    return bool(module.SOURCE_HASH == SchemaSnapshot.source_hash_of(module.config_type))
+
+
+def check_equivalence(
+    config_type: Type[Config],
+    process_command_line: Callable[[Path, Sequence[str], Mapping[str, str]], Any],
+    cases: Iterable[Tuple[Sequence[str], Mapping[str, str]]],
+    cwd: Optional[Path] = None,
+) -> Sequence[str]:
+    """
+    Compares a generated processing function with the configuration processor
+
+    Args:
+        config_type: Configuration
+        process_command_line: Generated processing function
+        cases: Command-line arguments and environment variables to test
+        cwd: Working directory, default: the current working directory
+
+    Returns:
+        A description of the cases where the results differ, empty if they all agree
+    """
+    if cwd is None:
+        cwd = Path.cwd()
+    processor = config_type.processor_()
+    mismatches: List[str] = []
+    for args, env in cases:
+        results: List[Any] = []
+        for f in [processor.process_command_line, process_command_line]:
+            try:
+                results.append(f(cwd, args, env))
+            except Exception as e:  # pylint: disable=broad-except
+                results.append((type(e), str(e)))
+        expected, actual = results
+        if expected != actual:
+            mismatches.append(f"args={args!r} env={env!r}: {expected!r} != {actual!r}")
+    return mismatches
+
+
+def main(argv: Sequence[str]) -> int:
+    """
+    Generates a module from the command line
+
+    Args:
+        argv: ``package.module:ConfigClass`` followed by the output file path
+
+    Returns:
+        The exit code
+    """
+    import importlib  # pylint: disable=import-outside-toplevel
+
+    if len(argv) != 2 or ":" not in argv[0]:
+        print("Usage: python -m configpile.codegen package.module:ConfigClass output.py")
+        return 1
+    module_name, qualname = argv[0].split(":", 1)
+    obj: Any = importlib.import_module(module_name)
+    for part in qualname.split("."):
+        obj = getattr(obj, part)
+    write_module(obj, Path(argv[1]))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -63,25 +63,25 @@ class Collector(abc.ABC, Generic[_Value]):
         Returns the arguments using in documentation (piggy backing on argparse)
         """
 
+    def keeps_last(self) -> bool:
+        """
+        Returns whether the collected value is the last instance, as for :meth:`.keep_last`
+
+        Only the last instance is then needed, which lets the values be parsed lazily.
+        """
+        return False
+
+    def appends(self) -> bool:
+        """
+        Returns whether the collected value concatenates the instances, as for :meth:`.append`
+        """
+        return False
+
     @staticmethod
     def keep_last() -> Collector[_Value]:
         """
         Returns a collector that keeps the last value
         """
-
-        class _KeepLast(Collector[_Value]):
-            def arg_required(self) -> bool:
-                return True
-
-            def collect(self, seq: Sequence[_Value]) -> Res[_Value]:
-                if not seq:  # no instances provided
-                    return Err.make("Argument is required")
-                else:  # instances are provided
-                    return seq[-1]
-
-            def argparse_argument_kwargs(self) -> Mapping[str, Any]:
-                return {"action": "store"}
-
         return _KeepLast()
 
     @staticmethod
@@ -89,18 +89,48 @@ class Collector(abc.ABC, Generic[_Value]):
         """
         Returns a collector that appends sequences
         """
+        return _Append()
+
+
+class _KeepLast(Collector[_Value]):
+    """
+    Collector that keeps the last value
+    """
 
-        class _Append(Collector[Sequence[_Item]]):
-            def arg_required(self) -> bool:
-                return False
+    def arg_required(self) -> bool:
+        return True
 
-            def collect(self, seq: Sequence[Sequence[_Item]]) -> Res[Sequence[_Item]]:
-                res: List[_Item] = []
-                for i in seq:
-                    res.extend(i)
-                return res
+    def keeps_last(self) -> bool:
+        return True
 
-            def argparse_argument_kwargs(self) -> Mapping[str, Any]:
-                return {"action": "append"}
+    def collect(self, seq: Sequence[_Value]) -> Res[_Value]:
+        if not seq:  # no instances provided
+            return Err.make("Argument is required")
+        else:  # instances are provided
+            return seq[-1]
 
-        return _Append()
+    def argparse_argument_kwargs(self) -> Mapping[str, Any]:
+        return {"action": "store"}
+
+
+class _Append(Collector[Sequence[_Item]]):
+    """
+    Collector that appends sequences
+    """
+
+    def arg_required(self) -> bool:
+        return False
+
+    def appends(self) -> bool:
+        return True
+
+    def collect(self, seq: Sequence[Sequence[_Item]]) -> Res[Sequence[_Item]]:
+        if len(seq) == 1:  # values provided at once, such as positional values, are copied once
+            return list(seq[0])
+        res: List[_Item] = []
+        for i in seq:
+            res.extend(i)
+        return res
+
+    def argparse_argument_kwargs(self) -> Mapping[str, Any]:
+        return {"action": "append"}
@@ -15,18 +15,27 @@ This module uses the following types.
 
 from __future__ import annotations
 
-import argparse
 import inspect
 import os
 import sys
 import typing
 from abc import ABC
-from dataclasses import dataclass
+from dataclasses import dataclass, fields, make_dataclass, replace
 from pathlib import Path
 
-from .processor import Processor, SpecialAction
+from typing_extensions import Annotated
+
+from .arg import Param
+from .enums import ParseMode, ResponseFileSyntax, SpecialAction
 from .userr import Err, Res
 
+if typing.TYPE_CHECKING:
+    # the processor is imported on demand, so that modules generated by configpile.codegen
+    # can define configurations without loading it
+    import argparse
+
+    from .processor import Processor
+
 _Config = typing.TypeVar("_Config", bound="Config")
 
 
@@ -65,6 +74,26 @@ class Config(ABC):
     #: Names of additional sections to parse in configuration files, unknown keys error
     ini_strict_sections_: typing.ClassVar[typing.Sequence[str]] = []
 
+    #: Whether configuration files are read by a streaming scanner
+    #:
+    #: The scanner (see :class:`~configpile.ini.IniScanner`) skips the sections that are not
+    #: parsed, and reports line numbers in errors. Unlike :class:`configparser.ConfigParser`,
+    #: it does not interpolate values, and the ``DEFAULT`` section is not special.
+    ini_streaming_: typing.ClassVar[bool] = False
+
+    #: Whether keys can be repeated in a section of a configuration file
+    #:
+    #: Each occurrence provides a value, which is useful for parameters collecting values.
+    #: This requires :attr:`.ini_streaming_`.
+    ini_repeated_keys_: typing.ClassVar[bool] = False
+
+    #: Directory where the parsed contents of configuration files are stored, if any
+    #:
+    #: Later runs reading the same files load the parsed contents instead of parsing the files,
+    #: see :func:`~configpile.ini.read_compiled`. The directory must only be writable by trusted
+    #: users.
+    ini_cache_dir_: typing.ClassVar[typing.Optional[Path]] = None
+
     @classmethod
     def ini_sections_(cls) -> typing.Sequence[IniSection]:
         """
@@ -111,6 +140,59 @@ class Config(ABC):
 
     # endregion
 
+    # region Config: command-line flags
+
+    #: Whether long flags can be abbreviated to a unique prefix, such as ``--verb`` for
+    #: ``--verbose``
+    allow_abbrev_: typing.ClassVar[bool] = False
+
+    #: Whether short flags can be combined, such as ``-ab`` for ``-a -b``
+    #:
+    #: A short flag taking a value ends the cluster, and takes the rest of the cluster as its
+    #: value if not empty, such as ``-ofile`` for ``-o file``.
+    allow_short_flag_clusters_: typing.ClassVar[bool] = False
+
+    # endregion
+
+    # region Config: value parsing
+
+    #: When the values of parameters keeping the last value are parsed
+    #:
+    #: This applies to parameters created with :meth:`.Param.store`. With a lazy mode, the
+    #: values coming from the environment, INI files and the command line are recorded as
+    #: strings, and parsed when the configuration is collected. Parse errors are reported with
+    #: the context in which the value was encountered.
+    parse_mode_: typing.ClassVar[ParseMode] = ParseMode.EAGER
+
+    # endregion
+
+    # region Config: response files
+
+    #: Prefix of the command-line arguments that name response files, such as ``"@"``
+    #:
+    #: The arguments contained in a response file are processed in place of the argument naming
+    #: it. Response files are disabled when None. See :mod:`configpile.responsefiles`.
+    response_file_prefix_: typing.ClassVar[typing.Optional[str]] = None
+
+    #: Syntax of the response files
+    response_file_syntax_: typing.ClassVar[ResponseFileSyntax] = ResponseFileSyntax.LINES
+
+    #: Maximal nesting depth of response files
+    response_file_max_depth_: typing.ClassVar[int] = 8
+
+    # endregion
+
+    # region Config: schema snapshot
+
+    #: Directory where the resolved schema of this configuration is cached
+    #:
+    #: When set, the help text extracted from the class source is stored in a snapshot file,
+    #: which later processes read instead of parsing the source again.
+    #: See :mod:`configpile.snapshot`.
+    schema_cache_dir_: typing.ClassVar[typing.Optional[Path]] = None
+
+    # endregion
+
     # region Config: information constructed by configpile
 
     @classmethod
@@ -136,8 +218,23 @@ class Config(ABC):
     def processor_(cls: typing.Type[_Config]) -> Processor[_Config]:
         """
         Returns a processor for this configuration
+
+        The processor is built on first use, and then cached.
         """
-        return Processor.make(cls)
+        from .processor import processor_cache  # pylint: disable=import-outside-toplevel
+
+        return processor_cache.get(cls)
+
+    @classmethod
+    def invalidate_processor_(cls) -> None:
+        """
+        Discards the cached processor of this configuration and of its subclasses
+
+        Call this method after modifying the class at runtime.
+        """
+        from .processor import processor_cache  # pylint: disable=import-outside-toplevel
+
+        processor_cache.invalidate(cls)
 
     # endregion
 
@@ -272,3 +369,186 @@ class Config(ABC):
         return cls.processor_().argument_parser
 
     # endregion
+
+
+@typing.overload
+def precompiled(config_type: typing.Type[_Config]) -> typing.Type[_Config]:
+    pass
+
+
+@typing.overload
+def precompiled(
+    *, background: bool = False
+) -> typing.Callable[[typing.Type[_Config]], typing.Type[_Config]]:
+    pass
+
+
+def precompiled(
+    config_type: typing.Optional[typing.Type[_Config]] = None, *, background: bool = False
+) -> typing.Union[
+    typing.Type[_Config], typing.Callable[[typing.Type[_Config]], typing.Type[_Config]]
+]:
+    """
+    Class decorator that builds the processor of a configuration when the class is defined
+
+    Building the processor validates the configuration, including the parsing of the default
+    values, so that errors are reported at import time instead of at the first use.
+
+    With ``background=True``, the processor is built in a background thread instead, so that
+    the build overlaps with the rest of the program imports; errors are then reported when the
+    processor is used.
+
+    The decorator must be applied after (that is, above) the dataclass decorator.
+
+    Example:
+        .. code-block:: python
+
+            @precompiled(background=True)
+            @dataclass(frozen=True)
+            class Adder(Config):
+                x: Annotated[int, Param.store(types.int_)]
+
+    Args:
+        config_type: Configuration class, when the decorator is used without arguments
+
+    Keyword Args:
+        background: Whether to build the processor in a background thread
+
+    Raises:
+        ValueError: If a default value cannot be parsed correctly
+
+    Returns:
+        The configuration class, or a decorator
+    """
+
+    def decorate(t: typing.Type[_Config]) -> typing.Type[_Config]:
+        from .processor import processor_cache  # pylint: disable=import-outside-toplevel
+
+        if background:
+            processor_cache.warm_up(t)
+        else:
+            processor_cache.get(t)
+        return t
+
+    if config_type is None:
+        return decorate
+    return decorate(config_type)
+
+
+# methods of the configurations created by make_config; the methods generated by dataclass
+# are compiled from source code whose size grows with the number of fields, which becomes
+# slow for thousands of fields
+
+
+def _schema_names(self: typing.Any) -> typing.List[str]:
+    return [f.name for f in fields(self)]
+
+
+def _schema_init(self: typing.Any, *args: typing.Any, **kwargs: typing.Any) -> None:
+    names = _schema_names(self)
+    if len(args) > len(names):
+        raise TypeError(f"{type(self).__name__} takes {len(names)} positional arguments")
+    known = set(names)
+    values = dict(zip(names, args))
+    for name, value in kwargs.items():
+        if name not in known:
+            raise TypeError(f"{type(self).__name__} got an unexpected keyword argument {name}")
+        if name in values:
+            raise TypeError(f"{type(self).__name__} got multiple values for argument {name}")
+        values[name] = value
+    missing = [name for name in names if name not in values]
+    if missing:
+        raise TypeError(f"{type(self).__name__} missing arguments: {', '.join(missing)}")
+    for name in names:
+        object.__setattr__(self, name, values[name])
+
+
+def _schema_values(self: typing.Any) -> typing.Tuple[typing.Any, ...]:
+    return tuple([getattr(self, name) for name in _schema_names(self)])
+
+
+def _schema_repr(self: typing.Any) -> str:
+    items = [f"{name}={getattr(self, name)!r}" for name in _schema_names(self)]
+    return f"{type(self).__qualname__}({', '.join(items)})"
+
+
+def _schema_eq(self: typing.Any, other: typing.Any) -> typing.Any:
+    if other.__class__ is not self.__class__:
+        return NotImplemented
+    return _schema_values(self) == _schema_values(other)
+
+
+def _schema_hash(self: typing.Any) -> int:
+    return hash(_schema_values(self))
+
+
+def make_config(
+    name: str,
+    entries: typing.Iterable[typing.Tuple[str, Param[typing.Any], typing.Optional[str]]],
+    *,
+    bases: typing.Tuple[type, ...] = (Config,),
+    description: typing.Optional[str] = None,
+    module: typing.Optional[str] = None,
+    **settings: typing.Any,
+) -> typing.Type[typing.Any]:
+    """
+    Creates a configuration class from a schema description
+
+    This is the supported way to build configurations programmatically, for example from a
+    schema with thousands of parameters. The help text is given with each entry, so that the
+    source code of the class is never inspected. The dataclass methods (``__init__``,
+    ``__repr__``, ``__eq__`` and ``__hash__``) are shared implementations iterating over the
+    fields, so that the construction time is linear in the number of fields.
+
+    Example:
+        .. code-block:: python
+
+            Hyper = make_config(
+                "Hyper",
+                [("lr", Param.store(parsers.float_parser, default_value="0.1"), "Learning rate")],
+                env_prefix_="HYPER",
+            )
+
+    Args:
+        name: Name of the class
+        entries: Field name, parameter and help text of each field, in order
+
+    Keyword Args:
+        bases: Base classes, must include a subclass of :class:`.Config`
+        description: Text to display before the argument help
+        module: Module name to assign to the class
+        settings: Values for the class settings, such as :attr:`.Config.env_prefix_`
+
+    Raises:
+        TypeError: If the bases do not include a subclass of :class:`.Config`
+
+    Returns:
+        The frozen configuration dataclass, typed loosely as its fields are only known at run time
+    """
+    if not any(isinstance(b, type) and issubclass(b, Config) for b in bases):
+        raise TypeError("The bases must include a Config subclass")
+    field_specs = [
+        (field_name, Annotated[typing.Any, replace(param, help=help_text or "")])
+        for field_name, param, help_text in entries
+    ]
+    namespace: typing.Dict[str, typing.Any] = {
+        "__doc__": "" if description is None else description,
+        "__init__": _schema_init,
+        "__repr__": _schema_repr,
+        "__eq__": _schema_eq,
+        "__hash__": _schema_hash,
+        **settings,
+    }
+    if module is not None:
+        namespace["__module__"] = module
+    res = make_dataclass(
+        name,
+        field_specs,
+        bases=bases,
+        namespace=namespace,
+        init=False,
+        repr=False,
+        eq=False,
+        frozen=True,
+    )
+    return res
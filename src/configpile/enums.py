@@ -49,6 +49,22 @@ class ForceCase(Enum):
     LOWER = 2  #: Change to lowercase
 
 
+class ParseMode(Enum):
+    """
+    Describes when the values of parameters keeping the last value are parsed
+    """
+
+    EAGER = 1  #: Every value is parsed when it is encountered
+    LAST_ONLY = 2  #: Values are recorded as strings, only the last one is parsed
+    VALIDATE_ALL = 3  #: Values are recorded as strings, all are parsed at the end
+
+    def is_lazy(self) -> bool:
+        """
+        Returns whether values are recorded as strings and parsed at the end
+        """
+        return self != ParseMode.EAGER
+
+
 class Positional(Enum):
     """
     Describes the positional behavior of a parameter
@@ -72,3 +88,15 @@ class SpecialAction(Enum):
 
     HELP = "help"  #: Display a help message
     VERSION = "version"  #: Print the version number
+
+
+class ResponseFileSyntax(Enum):
+    """
+    Describes how the contents of a response file are split into arguments
+    """
+
+    #: Each line is an argument, without quoting; empty lines are skipped
+    LINES = 1
+
+    #: Each line is split using shell-like syntax (see :func:`shlex.split`), comments allowed
+    SHELL = 2
@@ -15,11 +15,26 @@ from __future__ import annotations
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
 from pathlib import Path
-from typing import TYPE_CHECKING, Any, Generic, List, Mapping, Optional, Sequence, Tuple, TypeVar
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    Generic,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+    TypeVar,
+    Union,
+)
 
 from .arg import Positional
 from .enums import SpecialAction
-from .userr import Err, in_context
+from .parsers import _SequenceOfOne, str_parser
+from .userr import Err, Res, in_context
+from .util import SequenceView
 
 if TYPE_CHECKING:
     from .arg import Expander, Param
@@ -28,9 +43,41 @@ if TYPE_CHECKING:
 _Value = TypeVar("_Value")
 
 
+@dataclass(frozen=True)
+class Unparsed:
+    """
+    Value of a parameter recorded as a string, parsed when the parameter is collected
+
+    See :attr:`~configpile.config.Config.parse_mode_`.
+    """
+
+    value: str  #: String to parse
+    origin: Tuple[Tuple[str, Any], ...]  #: Contexts in which the value was encountered
+
+    def parse(self, param: Param[_Value]) -> Res[_Value]:
+        """
+        Parses the value
+
+        Args:
+            param: Parameter the value belongs to
+
+        Returns:
+            The parsed value, or an error in the context of the value origin
+        """
+        res = param.parser.parse(self.value)
+        if isinstance(res, Err):
+            return res.in_context(**dict(self.origin), param=param.name)
+        return res
+
+
 class CLHandler(ABC):
     """
     A handler for command-line arguments
+
+    Handlers are called through :meth:`.handle_at`, which advances a position in a buffer of
+    arguments. Custom handlers can implement :meth:`.handle` only, in which case
+    :meth:`.handle_at` passes them a copy of the remaining arguments. The handlers provided by
+    configpile derive from :class:`.CLCursorHandler`, which does not copy the arguments.
     """
 
     @abstractmethod
@@ -46,27 +93,66 @@ class CLHandler(ABC):
             The updated command-line and an optional error
         """
 
+    def handle_at(
+        self, args: Sequence[str], pos: int, state: State
+    ) -> Tuple[Sequence[str], int, Optional[Err]]:
+        """
+        Processes arguments starting at a given position, possibly updating the state
+
+        The argument buffer is never modified. Handlers that consume arguments return the same
+        buffer with an advanced position; handlers that insert arguments return a new buffer.
+
+        Args:
+            args: Buffer of command-line arguments
+            pos: Position of the first argument not processed yet
+            state: (Mutable) state to possibly update
+
+        Returns:
+            The buffer of arguments, the position of the first argument not processed yet, and
+            an optional error
+        """
+        rest, err = self.handle(args[pos:], state)
+        return (rest, 0, err)
+
+
+class CLCursorHandler(CLHandler):
+    """
+    A handler for command-line arguments that implements :meth:`.handle_at` directly
+    """
+
+    def handle(self, args: Sequence[str], state: State) -> Tuple[Sequence[str], Optional[Err]]:
+        buffer, pos, err = self.handle_at(args, 0, state)
+        return (buffer[pos:], err)
+
+    @abstractmethod
+    def handle_at(
+        self, args: Sequence[str], pos: int, state: State
+    ) -> Tuple[Sequence[str], int, Optional[Err]]:
+        pass
+
 
 @dataclass(frozen=True)
-class CLSpecialAction(CLHandler):
+class CLSpecialAction(CLCursorHandler):
     """
     A handler that sets the special action
     """
 
     special_action: SpecialAction  #: Special action to set
 
-    def handle(self, args: Sequence[str], state: State) -> Tuple[Sequence[str], Optional[Err]]:
+    def handle_at(
+        self, args: Sequence[str], pos: int, state: State
+    ) -> Tuple[Sequence[str], int, Optional[Err]]:
         if state.special_action is not None:
             before = state.special_action.name
             now = self.special_action.name
             err = Err.make(f"We had already action {before}, conflicts with action {now}")
-            return (args, err)
+            return (args, pos, err)
         state.special_action = self.special_action
-        return (args, None)
+        return (args, pos, None)
 
 
 @dataclass(frozen=True)
-class CLInserter(CLHandler):
+class CLInserter(CLCursorHandler):
     """
     Handler that expands a flag into a sequence of args inserted into the command line to be parsed
     """
@@ -74,12 +160,93 @@ class CLInserter(CLHandler):
     #: Arguments inserted in the command-line
     inserted_args: Sequence[str]
 
-    def handle(self, args: Sequence[str], state: State) -> Tuple[Sequence[str], Optional[Err]]:
-        return ([*self.inserted_args, *args], None)
+    def handle_at(
+        self, args: Sequence[str], pos: int, state: State
+    ) -> Tuple[Sequence[str], int, Optional[Err]]:
+        return ([*self.inserted_args, *args[pos:]], 0, None)
 
 
 @dataclass(frozen=True)
-class CLParam(CLHandler, Generic[_Value]):
+class CLExpansion(CLInserter):
+    """
+    Handler that expands a flag, with the chain of expansions resolved in advance
+
+    The inserted arguments do not contain flags of other expanders, see :meth:`.resolve`.
+    When the expansion is closed, :class:`.CLStdHandler` processes the inserted arguments
+    directly, without copying the rest of the command line.
+    """
+
+    #: Whether the inserted arguments are processed without consuming the following arguments
+    closed: bool
+
+    @staticmethod
+    def _expand(
+        flags: Mapping[str, CLHandler], chain: Sequence[str]
+    ) -> Tuple[Sequence[str], bool]:
+        """
+        Expands the arguments inserted by the last flag of a chain
+
+        Args:
+            flags: Flag handlers, where expanders are not resolved yet
+            chain: Flags of the expanders being expanded, the last one being expanded now
+
+        Raises:
+            ValueError: If the expanders form a cycle
+
+        Returns:
+            The inserted arguments and whether the expansion is closed
+        """
+        handler = flags[chain[-1]]
+        assert isinstance(handler, CLInserter)
+        args = handler.inserted_args
+        res: List[str] = []
+        i = 0
+        while i < len(args):
+            inner = flags.get(args[i])
+            if isinstance(inner, CLInserter):
+                if args[i] in chain:
+                    raise ValueError(f"Expander cycle: {' -> '.join([*chain, args[i]])}")
+                inserted, closed = CLExpansion._expand(flags, [*chain, args[i]])
+                res.extend(inserted)
+                if not closed:
+                    return ([*res, *args[i + 1 :]], False)
+                i += 1
+            elif isinstance(inner, CLParam):
+                if i + 1 >= len(args):  # the value is taken from the following arguments
+                    return ([*res, *args[i:]], False)
+                res.extend(args[i : i + 2])
+                i += 2
+            elif inner is None or isinstance(inner, CLSpecialAction):
+                res.append(args[i])
+                i += 1
+            else:  # custom handler, which may consume any number of arguments
+                return ([*res, *args[i:]], False)
+        return (res, True)
+
+    @staticmethod
+    def resolve(flags: Mapping[str, CLHandler]) -> Dict[str, CLHandler]:
+        """
+        Replaces the inserters of a flag handler mapping by resolved expansions
+
+        Args:
+            flags: Flag handlers
+
+        Raises:
+            ValueError: If the expanders form a cycle
+
+        Returns:
+            The updated flag handlers
+        """
+        res: Dict[str, CLHandler] = dict(flags)
+        for flag, handler in flags.items():
+            if isinstance(handler, CLInserter):
+                inserted, closed = CLExpansion._expand(flags, [flag])
+                res[flag] = CLExpansion(inserted, closed)
+        return res
+
+
+@dataclass(frozen=True)
+class CLParam(CLCursorHandler, Generic[_Value]):
     """
     Parameter handler
 
@@ -105,23 +272,51 @@ class CLParam(CLHandler, Generic[_Value]):
         """
         return None
 
-    def handle(self, args: Sequence[str], state: State) -> Tuple[Sequence[str], Optional[Err]]:
-        if args:
-            res = self.param.parser.parse(args[0])
-            if isinstance(res, Err):
-                return (args[1:], res.in_context(param=self.param.name))
-            else:
-                assert self.param.name is not None, "Names are assigned after initialization"
-                err = in_context(self.action(res, state), param=self.param.name)
-                state.instances[self.param.name] = [*state.instances[self.param.name], res]
-                return (args[1:], err)
+    def handle_value(self, value: str, state: State) -> Optional[Err]:
+        """
+        Processes the value of the parameter
+
+        Args:
+            value: Value to parse, taken from the argument following the flag or given inline
+            state: State to update
+
+        Returns:
+            An optional error
+        """
+        res = self.param.parser.parse(value)
+        if isinstance(res, Err):
+            return res.in_context(param=self.param.name)
+        else:
+            assert self.param.index is not None, "Indices are assigned with the processor"
+            err = in_context(self.action(res, state), param=self.param.name)
+            state.append_at(self.param.index, res)
+            return err
+
+    def handle_at(
+        self, args: Sequence[str], pos: int, state: State
+    ) -> Tuple[Sequence[str], int, Optional[Err]]:
+        if pos < len(args):
+            return (args, pos + 1, self.handle_value(args[pos], state))
         else:
             return (
                 args,
+                pos,
                 Err.make("Expected value, but no argument present", param=self.param.name),
             )
 
 
+@dataclass(frozen=True)
+class CLUnparsedParam(CLParam[_Value]):
+    """
+    Command-line parameter handler that records the value as a string, parsed later
+    """
+
+    def handle_value(self, value: str, state: State) -> Optional[Err]:
+        assert self.param.index is not None, "Indices are assigned with the processor"
+        state.append_at(self.param.index, Unparsed(value, state.origin))
+        return None
+
+
 @dataclass(frozen=True)
 class CLRootParam(CLParam[Path]):
     """
@@ -149,15 +344,16 @@ class CLConfigParam(CLParam[Sequence[Path]]):
         return None
 
 
-@dataclass
-class CLPos(CLHandler):
+@dataclass(frozen=True)
+class CLPos(CLCursorHandler):
     """
     Handles positional parameters
 
-    Note that this handler has state, namely the positional parameters that are still expected.
+    The index of the positional parameter that is expected next is stored in the parsing
+    :class:`~configpile.processor.State`, so that this handler can be shared between parses.
     """
 
-    pos: List[Param[Any]]  #: (Mutable) list of positional parameters
+    pos: Sequence[Param[Any]]  #: Positional parameters, in order
 
     @staticmethod
     def make(seq: Sequence[Param[Any]]) -> CLPos:
@@ -174,50 +370,378 @@ class CLPos(CLHandler):
         assert all(
             [not p.positional.should_be_last() for p in seq[:-1] if p.positional is not None]
         ), "Positional parameters with a variable number of arguments should be last"
-        l = list(seq)  # makes a mutable copy
-        return CLPos(l)
+        return CLPos(tuple(seq))
 
-    def handle(self, args: Sequence[str], state: State) -> Tuple[Sequence[str], Optional[Err]]:
-        if not args:
-            return (args, None)  # should not happen ,but let's not crash
-        if not self.pos:
-            return (args[1:], Err.make(f"Unknown argument {args[0]}"))
-        p = self.pos[0]
-        assert p.name is not None
-        res = p.parser.parse(args[0])
+    def accepts_run(self, state: State) -> bool:
+        """
+        Returns whether the next positional parameter takes all the remaining positional values
+
+        Args:
+            state: State of the parse
+        """
+        if state.positional_index >= len(self.pos):
+            return False
+        return self.pos[state.positional_index].positional in {
+            Positional.ZERO_OR_MORE,
+            Positional.ONE_OR_MORE,
+        }
+
+    def _handle_run(
+        self, args: Sequence[str], start: int, stop: int, state: State
+    ) -> Optional[Err]:
+        """
+        Processes a run of values of the last, variadic, positional parameter in one step
+
+        For parameters collecting single values, the values are recorded as a single instance.
+        If the values are not transformed by the parser, this instance is a view over the
+        arguments, which is copied when the values are collected.
+
+        Args:
+            args: Buffer of command-line arguments
+            start: Position of the first value
+            stop: Position following the last value
+            state: State to update
+
+        Returns:
+            An optional error
+        """
+        p = self.pos[state.positional_index]
+        assert p.index is not None
+        errors: List[Err] = []
+        if isinstance(p.parser, _SequenceOfOne):
+            if p.parser.wrapped is str_parser:
+                state.append_at(p.index, SequenceView(args, start, stop))
+                return None
+            values: List[Any] = []
+            for arg in SequenceView(args, start, stop):
+                res = p.parser.wrapped.parse(arg)
+                if isinstance(res, Err):
+                    errors.append(res.in_context(param=p.name))
+                else:
+                    values.append(res)
+            state.append_at(p.index, values)
+        else:
+            for arg in SequenceView(args, start, stop):
+                res = p.parser.parse(arg)
+                if isinstance(res, Err):
+                    errors.append(res.in_context(param=p.name))
+                else:
+                    state.append_at(p.index, res)
+        return Err.collect(*errors)
+
+    def handle_positionals(
+        self, args: Sequence[str], start: int, stop: int, state: State
+    ) -> Tuple[Sequence[str], int, Optional[Err]]:
+        """
+        Processes arguments that are all positional values
+
+        Args:
+            args: Buffer of command-line arguments
+            start: Position of the first value
+            stop: Position following the last value
+            state: State to update
+
+        Returns:
+            The buffer of arguments, the position following the last value, and an optional
+            error
+        """
+        errors: List[Err] = []
+        pos = start
+        while pos < stop:
+            if self.accepts_run(state):
+                err = self._handle_run(args, pos, stop, state)
+                pos = stop
+            else:
+                _, pos, err = self.handle_at(args, pos, state)
+            if err is not None:
+                errors.append(err)
+        return (args, stop, Err.collect(*errors))
+
+    def handle_at(
+        self, args: Sequence[str], pos: int, state: State
+    ) -> Tuple[Sequence[str], int, Optional[Err]]:
+        if pos >= len(args):
+            return (args, pos, None)  # should not happen ,but let's not crash
+        if state.positional_index >= len(self.pos):
+            return (args, pos + 1, Err.make(f"Unknown argument {args[pos]}"))
+        p = self.pos[state.positional_index]
+        assert p.index is not None
+        res = p.parser.parse(args[pos])
         if isinstance(res, Err):
-            return (args[1:], in_context(res, param=p.name))
+            return (args, pos + 1, in_context(res, param=p.name))
         else:
-            state.append(p.name, res)
+            state.append_at(p.index, res)
             if p.positional == Positional.ONCE:
-                self.pos = self.pos[1:]
-            return (args[1:], None)
+                state.positional_index += 1
+            return (args, pos + 1, None)
+
+
+class _TrieNode:
+    """
+    Node of the trie of the long flags of a :class:`.FlagTable`
+    """
+
+    __slots__ = ("children", "count", "unique")
+
+    def __init__(self) -> None:
+        self.children: Dict[str, _TrieNode] = {}  #: Child nodes by character
+        self.count = 0  #: Number of flags starting with the prefix of this node
+        self.unique: Optional[str] = None  #: Flag starting with the prefix, if unique
+
+
+#: A matched flag and its inline value, if any
+FlagMatch = Tuple[str, Optional[str]]
+
+
+@dataclass(frozen=True)
+class FlagTable(Mapping[str, CLHandler]):
+    """
+    Mapping of flags to their handlers, which also matches arguments that are not flags
+
+    Besides exact flags, it matches:
+
+    - long flags with an inline value, such as ``--flag=value``,
+    - unique prefixes of long flags, such as ``--fl`` for ``--flag``, if enabled,
+    - clusters of short flags, such as ``-ab`` for ``-a -b``, where the last flag of the cluster
+      can take the rest of the cluster as its value, such as ``-ofile`` for ``-o file``,
+      if enabled.
+
+    Prefixes are matched using a trie, so that matching an argument, including the detection
+    of an ambiguous prefix, takes a time proportional to the length of the argument.
+    """
+
+    handlers: Mapping[str, CLHandler]  #: Handlers by exact flag
+    allow_abbrev: bool  #: Whether unique prefixes of long flags are matched
+    allow_clusters: bool  #: Whether clusters of short flags are matched
+    trie: _TrieNode  #: Trie of the long flags
+
+    @staticmethod
+    def make(
+        handlers: Mapping[str, CLHandler], allow_abbrev: bool = False, allow_clusters: bool = False
+    ) -> FlagTable:
+        """
+        Constructs a flag table
+
+        Args:
+            handlers: Handlers by exact flag
+            allow_abbrev: Whether unique prefixes of long flags are matched
+            allow_clusters: Whether clusters of short flags are matched
+
+        Returns:
+            The flag table
+        """
+        root = _TrieNode()
+        if allow_abbrev:
+            for flag in handlers:
+                if flag.startswith("--"):
+                    node = root
+                    for c in flag:
+                        node = node.children.setdefault(c, _TrieNode())
+                        node.count += 1
+                        node.unique = flag if node.count == 1 else None
+        return FlagTable(dict(handlers), allow_abbrev, allow_clusters, root)
+
+    def __getitem__(self, flag: str) -> CLHandler:
+        return self.handlers[flag]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.handlers)
+
+    def __len__(self) -> int:
+        return len(self.handlers)
+
+    def __contains__(self, flag: object) -> bool:
+        return flag in self.handlers
+
+    def get(self, flag: str, default: Any = None) -> Any:
+        return self.handlers.get(flag, default)
+
+    def _long_flag(self, name: str) -> Union[None, str, Err]:
+        """
+        Matches a long flag, possibly abbreviated
+
+        Args:
+            name: Argument, without inline value
+
+        Returns:
+            The matched flag, None if the argument does not match, or an error if it is ambiguous
+        """
+        if name in self.handlers:
+            return name
+        if not self.allow_abbrev or len(name) <= 2:
+            return None
+        node = self.trie
+        for c in name:
+            child = node.children.get(c)
+            if child is None:
+                return None
+            node = child
+        if node.unique is not None:
+            return node.unique
+        candidates = sorted([f for f in self.handlers if f.startswith(name)])
+        return Err.make(f"Ambiguous flag {name}, could be {', '.join(candidates)}")
+
+    def _cluster(self, arg: str) -> Union[None, Sequence[FlagMatch], Err]:
+        """
+        Matches a cluster of short flags
+
+        Args:
+            arg: Argument starting with a single hyphen
+
+        Returns:
+            The matched flags, None if the argument does not match, or an error
+        """
+        res: List[FlagMatch] = []
+        for i in range(1, len(arg)):
+            flag = "-" + arg[i]
+            handler = self.handlers.get(flag)
+            if handler is None:
+                if i == 1:
+                    return None
+                return Err.make(f"Unknown flag {flag} in {arg}")
+            rest = arg[i + 1 :]
+            if isinstance(handler, CLParam):
+                res.append((flag, rest if rest else None))
+                return res
+            res.append((flag, None))
+            closed = isinstance(handler, CLExpansion) and handler.closed
+            if rest and not (closed or isinstance(handler, CLSpecialAction)):
+                return Err.make(f"Flag {flag} cannot be followed by other flags in {arg}")
+        return res
+
+    def match(self, arg: str) -> Union[None, Sequence[FlagMatch], Err]:
+        """
+        Matches an argument that is not exactly a flag
+
+        Args:
+            arg: Command-line argument
+
+        Returns:
+            The matched flags with their inline value, None if the argument does not match any
+            flag, or an error if the argument is ambiguous
+        """
+        if arg.startswith("--"):
+            name, sep, value = arg.partition("=")
+            flag = self._long_flag(name)
+            if flag is None or isinstance(flag, Err):
+                return flag
+            return [(flag, value if sep else None)]
+        if self.allow_clusters and len(arg) > 2 and arg[0] == "-":
+            return self._cluster(arg)
+        return None
 
 
 @dataclass(frozen=True)
-class CLStdHandler(CLHandler):
+class CLStdHandler(CLCursorHandler):
     """
     The standard command line arguments handler
 
     It processes arguments one by one. If it recognizes a flag, the corresponding handler is
     called. Otherwise, control is passed to the fallback handler, which by default processes
     positional parameters.
+
+    When the flags are given as a :class:`.FlagTable`, the arguments matched by the table,
+    such as ``--flag=value``, are processed as well.
+
+    The argument ``--`` marks the end of the flags: the following arguments are positional
+    values. Runs of positional values of a trailing variadic positional parameter are
+    processed in one step.
     """
 
     flags: Mapping[str, CLHandler]
     fallback: CLHandler
 
-    def handle(self, args: Sequence[str], state: State) -> Tuple[Sequence[str], Optional[Err]]:
-        if not args:
-            return (args, None)
-        flag = args[0]
-        handler = self.flags.get(flag)
-        if handler is not None:
-            next_args, err = handler.handle(args[1:], state)
-            err = in_context(err, flag=flag)
-            return next_args, err
-        else:
-            return self.fallback.handle(args, state)
+    def _handle_flag(
+        self,
+        flag: str,
+        value: Optional[str],
+        args: Sequence[str],
+        pos: int,
+        state: State,
+    ) -> Tuple[Sequence[str], int, Optional[Err]]:
+        """
+        Processes a flag
+
+        Args:
+            flag: Flag to process
+            value: Inline value of the flag, if any
+            args: Buffer of command-line arguments
+            pos: Position of the argument following the flag
+            state: State to update
+
+        Returns:
+            The buffer of arguments, the position of the first argument not processed yet, and
+            an optional error
+        """
+        handler = self.flags[flag]
+        origin = state.origin
+        # values recorded while handling the flag are reported in its context
+        state.origin = (("flag", flag),)
+        try:
+            if value is not None:
+                if isinstance(handler, CLParam):
+                    return (args, pos, in_context(handler.handle_value(value, state), flag=flag))
+                elif isinstance(handler, CLCursorHandler):
+                    return (args, pos, Err.make(f"Flag {flag} does not take a value"))
+                else:  # custom handler, the value is inserted in the command line
+                    next_args, next_pos, err = handler.handle_at([value, *args[pos:]], 0, state)
+                    return next_args, next_pos, in_context(err, flag=flag)
+            if isinstance(handler, CLExpansion) and handler.closed:
+                inserted = handler.inserted_args
+                errors: List[Err] = []
+                i = 0
+                while i < len(inserted):
+                    buffer, i, err = self.handle_at(inserted, i, state)
+                    if err is not None:
+                        errors.append(err)
+                    if buffer is not inserted:  # a custom fallback handler changed the buffer
+                        rest = [*buffer[i:], *args[pos:]]
+                        return (rest, 0, in_context(Err.collect(*errors), flag=flag))
+                return (args, pos, in_context(Err.collect(*errors), flag=flag))
+            next_args, next_pos, err = handler.handle_at(args, pos, state)
+            return next_args, next_pos, in_context(err, flag=flag)
+        finally:
+            state.origin = origin
+
+    def handle_at(
+        self, args: Sequence[str], pos: int, state: State
+    ) -> Tuple[Sequence[str], int, Optional[Err]]:
+        if pos >= len(args):
+            return (args, pos, None)
+        arg = args[pos]
+        if arg in self.flags and not state.flags_ended:
+            return self._handle_flag(arg, None, args, pos + 1, state)
+        fallback = self.fallback
+        if isinstance(fallback, CLPos):
+            if state.flags_ended:
+                return fallback.handle_positionals(args, pos, len(args), state)
+            if arg == "--":
+                state.flags_ended = True
+                return fallback.handle_positionals(args, pos + 1, len(args), state)
+            if fallback.accepts_run(state) and not arg.startswith("-"):
+                stop = pos + 1
+                while stop < len(args):
+                    a = args[stop]
+                    if a.startswith("-") or a in self.flags:
+                        break
+                    stop += 1
+                return fallback.handle_positionals(args, pos, stop, state)
+        if isinstance(self.flags, FlagTable):
+            matched = self.flags.match(arg)
+            if isinstance(matched, Err):
+                return (args, pos + 1, matched)
+            if matched is not None:
+                # in a cluster, only the last flag can consume the following arguments
+                errors: List[Err] = []
+                next_args, next_pos = args, pos + 1
+                for flag, value in matched:
+                    next_args, next_pos, err = self._handle_flag(
+                        flag, value, next_args, next_pos, state
+                    )
+                    if err is not None:
+                        errors.append(err)
+                return (next_args, next_pos, Err.collect(*errors))
+        return self.fallback.handle_at(args, pos, state)
 
 
 class KVHandler(ABC):
@@ -270,12 +794,24 @@ class KVParam(KVHandler, Generic[_Value]):
         if isinstance(res, Err):
             return res
         else:
-            assert self.param.name is not None
+            assert self.param.index is not None
             err = self.action(res, state)
-            state.instances[self.param.name] = [*state.instances[self.param.name], res]
+            state.append_at(self.param.index, res)
             return in_context(err, param=self.param.name)
 
 
+@dataclass(frozen=True)
+class KVUnparsedParam(KVParam[_Value]):
+    """
+    Key/value handler that records the value as a string, parsed later
+    """
+
+    def handle(self, value: str, state: State) -> Optional[Err]:
+        assert self.param.index is not None
+        state.append_at(self.param.index, Unparsed(value, state.origin))
+        return None
+
+
 @dataclass(frozen=True)
 class KVConfigParam(KVParam[Sequence[Path]]):
     """
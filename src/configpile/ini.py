@@ -0,0 +1,530 @@
+"""
+INI file contents
+
+This module reads INI files into :class:`.IniContents`, the key/value pairs present in each
+section, and caches the contents of the files read by the processors.
+
+Files are read either by :class:`configparser.ConfigParser`, or by the streaming
+:class:`.IniScanner` when enabled by :attr:`~configpile.config.Config.ini_streaming_`.
+
+The cache is keyed by the device and inode of the file, so that a file reached through
+different paths, such as symbolic links, is read once. Each entry is validated by a single
+``stat`` call, comparing the modification time and size of the file. A file
+rewritten in place with the same size and modification time is not detected: in that case, or
+when files are modified by other means, use :meth:`.IniCache.invalidate`.
+
+A configuration file path can also designate a directory, or a glob pattern, such as
+``conf.d`` or ``conf.d/*.ini``. It then stands for all the INI files of the directory, or
+matching the pattern, in lexical order; see :func:`.fragments`. A path is only a pattern when
+no file exists at that path, and a pattern matching no file is an error. Those files are read
+concurrently, see :meth:`.IniCache.entries`.
+
+The parsed contents of files can also be stored on disk, in a directory given by
+:attr:`~configpile.config.Config.ini_cache_dir_`, so that short-lived processes reading the
+same large files do not parse them again; see :func:`.read_compiled`.
+
+This module is imported on demand, when INI files are read.
+"""
+
+from __future__ import annotations
+
+import configparser
+import glob
+import hashlib
+import io
+import os
+import pickle
+import stat
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import (
+    FrozenSet,
+    Iterable,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    Union,
+)
+
+from . import __version__
+from .userr import Err, Res
+
+#: Identity of a version of a file: device, inode, modification time in nanoseconds, and size
+FileKey = Tuple[int, int, int, int]
+
+#: Maximal number of threads reading files concurrently
+MAX_READERS = 16
+
+
+def fragments(path: Path) -> Res[Optional[List[Path]]]:
+    """
+    Returns the files designated by a directory or a glob pattern, in lexical order
+
+    A directory designates the ``*.ini`` files it contains. A path that does not exist is a
+    pattern if it contains ``*``, ``?`` or ``[``, and designates the files matching it: an
+    existing file whose name contains those characters is thus read as is.
+
+    This function is called for the paths that could not be read as files, so that reading a
+    file only requires a single ``stat`` call.
+
+    Args:
+        path: Path to a file or a directory, or glob pattern
+
+    Returns:
+        The files sorted by path, None if the path is neither a directory nor a pattern, or an
+        error if the pattern does not match any file
+    """
+    if os.path.isdir(path):
+        with os.scandir(path) as it:
+            names = sorted(e.name for e in it if e.name.endswith(".ini") and e.is_file())
+        return [path / name for name in names]
+    if os.path.lexists(path) or not any(c in str(path) for c in "*?["):
+        return None
+    matches = [Path(p) for p in sorted(glob.glob(str(path))) if os.path.isfile(p)]
+    if not matches:
+        return Err.make(f"Pattern {path} does not match any file")
+    return matches
+
+
+#: Key, value, and line number of the key when known
+IniItem = Tuple[str, str, Optional[int]]
+
+
+@dataclass(frozen=True)
+class IniContents:
+    """
+    Key/value pairs of an INI file, by section
+    """
+
+    #: Sections in order, with their key/value pairs in order
+    sections: Sequence[Tuple[str, Sequence[IniItem]]]
+
+    @staticmethod
+    def parse(ini_contents: str, lowercase_keys: bool = False) -> Res[IniContents]:
+        """
+        Parses the contents of an INI file
+
+        Values are interpolated as done by :class:`configparser.ConfigParser`, and the values of
+        the ``DEFAULT`` section are present in every section.
+
+        Args:
+            ini_contents: Contents of the INI file
+            lowercase_keys: Whether keys are converted to lower-case
+
+        Returns:
+            The parsed contents or an error
+        """
+        parser = configparser.ConfigParser()
+        if not lowercase_keys:
+            parser.optionxform = str  # type: ignore
+        try:
+            parser.read_string(ini_contents)
+            return IniContents(
+                [
+                    (name, [(k, v, None) for k, v in parser[name].items()])
+                    for name in parser.sections()
+                ]
+            )
+        except configparser.Error:
+            return Err.make("Parse error")
+
+    @staticmethod
+    def read(
+        ini_file_path: Path,
+        scanner: Optional[IniScanner] = None,
+        cache_dir: Optional[Path] = None,
+    ) -> Res[IniContents]:
+        """
+        Reads and parses an INI file
+
+        Args:
+            ini_file_path: Path to the INI file
+            scanner: Streaming scanner to use, instead of :class:`configparser.ConfigParser`
+            cache_dir: Directory storing parsed contents, see :func:`.read_compiled`
+
+        Returns:
+            The parsed contents or an error
+        """
+        if cache_dir is not None:
+            return read_compiled(ini_file_path, cache_dir, scanner)
+        try:
+            with open(ini_file_path, "r", encoding="utf-8") as file:
+                if scanner is not None:
+                    return scanner.scan(file)
+                text = file.read()
+        except (IOError, UnicodeDecodeError):
+            return Err.make("IO Error")
+        return IniContents.parse(text)
+
+
+@dataclass(frozen=True)
+class IniScanner:
+    """
+    Streaming INI scanner
+
+    The scanner reads a file line by line, and only keeps the key/value pairs of the given
+    sections: the lines of the other sections are skipped without being parsed. The line
+    numbers of keys are recorded, and parse errors are reported with their line number.
+
+    Compared to :class:`configparser.ConfigParser`:
+
+    - values are not interpolated, and the ``DEFAULT`` section is not special,
+    - section headers must start at the beginning of a line,
+    - keys can be repeated in a section, if enabled,
+    - lines starting with ``#`` or ``;`` are comments, and empty lines are ignored, even in
+      multiline values.
+
+    Values span multiple lines when the following lines are indented, as with
+    :class:`configparser.ConfigParser`.
+    """
+
+    sections: Optional[FrozenSet[str]]  #: Sections whose contents are kept, or None for all
+    repeated_keys: bool = False  #: Whether keys can be repeated in a section
+    lowercase_keys: bool = False  #: Whether keys are converted to lower-case
+
+    def scan(self, lines: Iterable[str]) -> Res[IniContents]:
+        """
+        Scans the lines of an INI file
+
+        Args:
+            lines: Lines, with or without their line terminator
+
+        Returns:
+            The contents of the kept sections, or an error
+        """
+        sections: List[Tuple[str, Sequence[IniItem]]] = []
+        seen_sections: Set[str] = set()
+        items: Optional[List[IniItem]] = None  # items of the current section, if kept
+        keys: Set[str] = set()
+        in_section = False
+        for number, line in enumerate(lines, 1):
+            if line[:1] == "[":
+                header = line.rstrip()
+                end = header.rfind("]")
+                if end < 2:
+                    return Err.make("Invalid section header", ini_line=number)
+                name = header[1:end]
+                if name in seen_sections and not self.repeated_keys:
+                    return Err.make(f"Duplicate section {name}", ini_line=number)
+                seen_sections.add(name)
+                in_section = True
+                if self.sections is None or name in self.sections:
+                    items = []
+                    keys = set()
+                    sections.append((name, items))
+                else:
+                    items = None
+                continue
+            if items is None:
+                if not in_section and line.strip() and line.lstrip()[:1] not in "#;":
+                    return Err.make("Key outside of a section", ini_line=number)
+                continue
+            stripped = line.strip()
+            if not stripped or stripped[0] in "#;":
+                continue
+            if line[0] in " \t" and items:
+                key, value, key_line = items[-1]
+                items[-1] = (key, f"{value}\n{stripped}" if value else stripped, key_line)
+                continue
+            equal, colon = stripped.find("="), stripped.find(":")
+            split = min(equal, colon) if equal >= 0 and colon >= 0 else max(equal, colon)
+            if split <= 0:
+                return Err.make("Expected key = value", ini_line=number)
+            key = stripped[:split].rstrip()
+            if self.lowercase_keys:
+                key = key.lower()
+            if key in keys and not self.repeated_keys:
+                return Err.make(f"Duplicate key {key}", ini_line=number)
+            keys.add(key)
+            items.append((key, stripped[split + 1 :].lstrip(), number))
+        return IniContents(sections)
+
+
+def read_compiled(
+    ini_file_path: Path, cache_dir: Path, scanner: Optional[IniScanner] = None
+) -> Res[IniContents]:
+    """
+    Reads and parses an INI file, using the parsed contents stored in a directory if present
+
+    The stored contents are keyed by a hash of the file contents, of the configpile version and
+    of the scanner settings, so that they are never stale. Successfully parsed contents are
+    stored in the directory, which is created if needed; failures to store them are ignored.
+
+    The stored contents are unpickled: the directory must only be writable by trusted users.
+
+    Args:
+        ini_file_path: Path to the INI file
+        cache_dir: Directory storing the parsed contents
+        scanner: Streaming scanner to use, instead of :class:`configparser.ConfigParser`
+
+    Returns:
+        The parsed contents or an error
+    """
+    try:
+        with open(ini_file_path, "rb") as file:
+            data = file.read()
+    except IOError:
+        return Err.make("IO Error")
+    settings = None
+    if scanner is not None:
+        sections = None if scanner.sections is None else sorted(scanner.sections)
+        settings = (sections, scanner.repeated_keys, scanner.lowercase_keys)
+    digest = hashlib.sha256(repr((__version__, settings)).encode("utf-8"))
+    digest.update(data)
+    compiled_path = cache_dir / f"{digest.hexdigest()}.pickle"
+    try:
+        with open(compiled_path, "rb") as file:
+            compiled = pickle.load(file)
+        if isinstance(compiled, IniContents):
+            return compiled
+    except Exception:  # pylint: disable=broad-except
+        pass  # missing or unreadable entry, parsed again below
+    try:
+        text = data.decode("utf-8")
+    except UnicodeDecodeError:
+        return Err.make("IO Error")
+    if scanner is not None:
+        # split lines as when reading the file, str.splitlines splits on more characters
+        contents = scanner.scan(io.StringIO(text, newline=None))
+    else:
+        contents = IniContents.parse(text)
+    if isinstance(contents, IniContents):
+        temp_path = compiled_path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            with open(temp_path, "wb") as file:
+                pickle.dump(contents, file, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_path, compiled_path)
+        except OSError:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+    return contents
+
+
+class IniCacheInfo(NamedTuple):
+    """
+    Statistics about an :class:`.IniCache`
+    """
+
+    hits: int  #: Number of file reads avoided
+    misses: int  #: Number of file reads performed
+    maxsize: int  #: Maximal number of files stored, including the growth of the cache
+    currsize: int  #: Number of files currently stored
+
+
+class IniCache:
+    """
+    Thread-safe, bounded cache of the contents of INI files
+
+    The least recently used files are discarded first. Parse errors are cached too, so that an
+    invalid file is not parsed again until it changes.
+
+    When more files than the maximal size are read at once, for example the fragments of a
+    directory, the cache grows so that those files do not evict each other.
+    """
+
+    def __init__(self, maxsize: int = 128) -> None:
+        """
+        Creates an empty cache
+
+        Args:
+            maxsize: Maximal number of files stored, before the cache grows
+        """
+        assert maxsize > 0, "The cache must be able to store a file"
+        self.maxsize = maxsize  #: Maximal number of files stored, before the cache grows
+        self._capacity = maxsize
+        self._lock = threading.Lock()
+        # entries by device, inode and scanner, with the path they were last read from
+        self._entries: OrderedDict[
+            Tuple[int, int, Optional[IniScanner]], Tuple[FileKey, Res[IniContents], str]
+        ] = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+
+    def get(
+        self,
+        ini_file_path: Path,
+        scanner: Optional[IniScanner] = None,
+        cache_dir: Optional[Path] = None,
+    ) -> Res[IniContents]:
+        """
+        Returns the contents of an INI file, reading it if it changed since it was cached
+
+        Args:
+            ini_file_path: Path to the INI file
+            scanner: Streaming scanner to use, instead of :class:`configparser.ConfigParser`
+            cache_dir: Directory storing parsed contents, see :func:`.read_compiled`
+
+        Returns:
+            The parsed contents or an error
+        """
+        entry = self.entry(ini_file_path, scanner, cache_dir)
+        if isinstance(entry, Err):
+            return entry
+        return entry[1]
+
+    def entry(
+        self,
+        ini_file_path: Path,
+        scanner: Optional[IniScanner] = None,
+        cache_dir: Optional[Path] = None,
+    ) -> Res[Tuple[FileKey, IniContents]]:
+        """
+        Returns the identity of the current version of an INI file along with its contents
+
+        The first two items of the key, the device and inode, identify the file independently
+        of the path used to reach it. Contents read by different scanners are cached separately.
+
+        Args:
+            ini_file_path: Path to the INI file
+            scanner: Streaming scanner to use, instead of :class:`configparser.ConfigParser`
+            cache_dir: Directory storing parsed contents, see :func:`.read_compiled`
+
+        Returns:
+            The key of the file and its parsed contents, or an error
+        """
+        return self.entries([ini_file_path], scanner, cache_dir)[0]
+
+    def entries(
+        self,
+        paths: Sequence[Path],
+        scanner: Optional[IniScanner] = None,
+        cache_dir: Optional[Path] = None,
+    ) -> List[Res[Tuple[FileKey, IniContents]]]:
+        """
+        Returns the result of :meth:`.entry` for several files, reading them concurrently
+
+        The cache is looked up first, and only the files that are missing or changed are read,
+        once even if they are reached through several paths.
+
+        Args:
+            paths: Paths to the INI files
+            scanner: Streaming scanner to use, instead of :class:`configparser.ConfigParser`
+            cache_dir: Directory storing parsed contents, see :func:`.read_compiled`
+
+        Returns:
+            The keys and contents of the files, or errors, in the order of the paths
+        """
+        if len(paths) > self.maxsize:
+            with self._lock:
+                self._capacity = max(self._capacity, len(paths) + self.maxsize)
+        found = [self._lookup(p, scanner) for p in paths]
+        misses = list(
+            {f[1][:2]: f for f in found if not isinstance(f, Err) and f[2] is None}.values()
+        )
+        if len(misses) > 1:
+            # pylint: disable=import-outside-toplevel
+            from concurrent.futures import ThreadPoolExecutor
+
+            with ThreadPoolExecutor(max_workers=min(MAX_READERS, len(misses))) as executor:
+                read = list(executor.map(lambda f: self._read(f, scanner, cache_dir), misses))
+        else:
+            read = [self._read(f, scanner, cache_dir) for f in misses]
+        contents_read = {f[1][:2]: contents for f, contents in zip(misses, read)}
+        results: List[Res[Tuple[FileKey, IniContents]]] = []
+        for f in found:
+            if isinstance(f, Err):
+                results.append(f)
+                continue
+            key, contents = f[1], f[2]
+            if contents is None:
+                contents = contents_read[key[:2]]
+            results.append(contents if isinstance(contents, Err) else (key, contents))
+        return results
+
+    def _lookup(
+        self, ini_file_path: Path, scanner: Optional[IniScanner]
+    ) -> Res[Tuple[str, FileKey, Optional[Res[IniContents]]]]:
+        """
+        Looks up the contents of a file in the cache
+
+        Args:
+            ini_file_path: Path to the INI file
+            scanner: Streaming scanner used to read the file
+
+        Returns:
+            The absolute path of the file, its key and its cached contents if they are current,
+            or an error if the file cannot be read
+        """
+        path = os.path.abspath(ini_file_path)
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            return Err.make(f"Config file {ini_file_path} does not exist")
+        except OSError:
+            return Err.make("IO Error")
+        if not stat.S_ISREG(st.st_mode):
+            return Err.make(f"Path {ini_file_path} is not a file")
+        key: FileKey = (st.st_dev, st.st_ino, st.st_mtime_ns, st.st_size)
+        with self._lock:
+            cached = self._entries.get((st.st_dev, st.st_ino, scanner))
+            if cached is not None and cached[0] == key:
+                self._entries.move_to_end((st.st_dev, st.st_ino, scanner))
+                self._hits += 1
+                return (path, key, cached[1])
+        return (path, key, None)
+
+    def _read(
+        self,
+        found: Tuple[str, FileKey, Optional[Res[IniContents]]],
+        scanner: Optional[IniScanner],
+        cache_dir: Optional[Path],
+    ) -> Res[IniContents]:
+        """
+        Reads a file missing from the cache, and stores its contents
+
+        Args:
+            found: Result of :meth:`._lookup` for the file
+            scanner: Streaming scanner to use, instead of :class:`configparser.ConfigParser`
+            cache_dir: Directory storing parsed contents, see :func:`.read_compiled`
+
+        Returns:
+            The parsed contents or an error
+        """
+        path, key, _ = found
+        contents = IniContents.read(Path(path), scanner, cache_dir)
+        with self._lock:
+            self._misses += 1
+            self._entries[(key[0], key[1], scanner)] = (key, contents, path)
+            self._entries.move_to_end((key[0], key[1], scanner))
+            while len(self._entries) > self._capacity:
+                self._entries.popitem(last=False)
+        return contents
+
+    def invalidate(self, ini_file_path: Union[Path, str, None] = None) -> None:
+        """
+        Discards cached contents
+
+        Args:
+            ini_file_path: File whose contents are discarded; if omitted, the whole cache is
+                           cleared
+        """
+        with self._lock:
+            if ini_file_path is None:
+                self._entries.clear()
+            else:
+                path = os.path.abspath(ini_file_path)
+                try:
+                    st = os.stat(path)
+                    file_id: Optional[Tuple[int, int]] = (st.st_dev, st.st_ino)
+                except OSError:
+                    file_id = None
+                for cached, (_, _, cached_path) in list(self._entries.items()):
+                    if cached[:2] == file_id or cached_path == path:
+                        del self._entries[cached]
+
+    def info(self) -> IniCacheInfo:
+        """
+        Returns statistics about the cache usage
+        """
+        with self._lock:
+            return IniCacheInfo(self._hits, self._misses, self._capacity, len(self._entries))
+
+
+#: INI file cache used by the processors
+ini_cache = IniCache()
@@ -61,8 +61,6 @@ if TYPE_CHECKING:
 
 # those types are documented in the module docstring
 
-_I = TypeVar("_I")  # type used only internally
-
 _Value = TypeVar("_Value")
 
 _Value_contra = TypeVar("_Value_contra", contravariant=True)
@@ -177,8 +175,7 @@ class Parser(ABC, Generic[_Value]):
         Returns:
             Updated parser
         """
-        f: Callable[[_I], Sequence[_I]] = lambda t: [t]
-        return self.map(f)
+        return _SequenceOfOne(self)
 
     def empty_means_none(self, strip: bool = True) -> Parser[Optional[_Value]]:
         """
@@ -470,6 +467,24 @@ class _Mapped(Parser[_ReturnType], Generic[_Parameter, _ReturnType]):
         return self.wrapped.choices()
 
 
+@dataclass(frozen=True)
+class _SequenceOfOne(Parser[Sequence[_Item]]):
+    """
+    Wraps an existing parser so that its successful result is wrapped in a list
+    """
+
+    wrapped: Parser[_Item]  #: Wrapped parser
+
+    def parse(self, arg: str) -> Res[Sequence[_Item]]:
+        res = self.wrapped.parse(arg)
+        if isinstance(res, Err):
+            return res
+        return [res]
+
+    def choices(self) -> Optional[Sequence[str]]:
+        return self.wrapped.choices()
+
+
 @dataclass(frozen=True)
 class _SeparatedBy(Parser[Sequence[_Item]]):
     """
@@ -20,74 +20,265 @@ This module uses the following types.
 
 from __future__ import annotations
 
-import argparse
-import configparser
+import copy
+import dataclasses
+import inspect
+import itertools
 import sys
+import threading
 import warnings
-from configparser import ConfigParser
+import weakref
 from dataclasses import dataclass
-from pathlib import Path
+from enum import Enum
+from functools import cached_property
+from pathlib import Path, PurePath
 from typing import (
     TYPE_CHECKING,
     Any,
     Callable,
     ClassVar,
     Dict,
+    FrozenSet,
     Generic,
     Iterable,
+    Iterator,
     List,
     Mapping,
+    MutableMapping,
+    NamedTuple,
     Optional,
     Sequence,
+    Set,
+    Tuple,
     Type,
     TypeVar,
     Union,
+    cast,
 )
 
 from typing_extensions import Annotated, get_args, get_origin, get_type_hints
 
 from .arg import Arg, Expander, Param
-from .enums import SpecialAction
-from .handlers import CLHandler, CLPos, CLSpecialAction, CLStdHandler, KVHandler
+from .enums import ParseMode, SpecialAction
+from .handlers import (
+    CLExpansion,
+    CLHandler,
+    CLPos,
+    CLSpecialAction,
+    CLStdHandler,
+    FlagTable,
+    KVConfigParam,
+    KVHandler,
+    KVRootParam,
+    Unparsed,
+)
 from .userr import Err, Res
 from .util import ClassDoc, filter_types_single
 
 if TYPE_CHECKING:
+    # those modules are imported on demand, when INI files are read or help is displayed
+    import argparse
+
     from .config import Config
+    from .ini import FileKey, IniContents, IniScanner
+    from .responsefiles import Origin
 
 _Config = TypeVar("_Config", bound="Config")
 
 
+def _is_immutable(value: Any) -> bool:
+    """
+    Returns whether a value can be shared between parses, as it cannot be modified
+
+    Args:
+        value: Value to check
+
+    Returns:
+        True if the value is known to be immutable, False if it may be mutable
+    """
+    if value is None or isinstance(value, (bool, int, float, complex, str, bytes, PurePath, Enum)):
+        return True
+    if isinstance(value, (tuple, frozenset)):
+        return all(_is_immutable(v) for v in value)
+    return False
+
+
+@dataclass(frozen=True)
+class StateLayout:
+    """
+    Numbering of the parameters of a configuration, with their parsed default values
+
+    The layout is computed once, when the processor is built, so that creating the
+    :class:`.State` of a parse only allocates an array of slots. Default values that may be
+    mutable are copied for each parse, so that modifying a parsed configuration does not
+    affect the next ones.
+    """
+
+    indices: Mapping[str, int]  #: Slot index of each parameter, by parameter name
+    defaults: Sequence[Sequence[Any]]  #: Instances present by default, by slot index
+
+    #: Slot indices whose default value may be mutable, and is copied for each parse
+    copied: FrozenSet[int] = frozenset()
+
+    @staticmethod
+    def make(params: Iterable[Param[Any]], base: Optional[StateLayout] = None) -> StateLayout:
+        """
+        Numbers parameters and parses their default values
+
+        Args:
+            params: Sequence of parameters, in the order of their indices
+            base: Layout of the parameters that precede the given ones
+
+        Raises:
+            ValueError: If a default value cannot be parsed correctly
+
+        Returns:
+            The layout
+        """
+        indices: Dict[str, int] = {} if base is None else dict(base.indices)
+        defaults: List[Sequence[Any]] = [] if base is None else list(base.defaults)
+        copied: Set[int] = set() if base is None else set(base.copied)
+        for p in params:
+            assert p.name is not None, "Arguments have names after initialization"
+            assert p.index is None or p.index == len(defaults), "Parameters are out of order"
+            if p.default_value is not None:
+                res = p.parser.parse(p.default_value)
+                if isinstance(res, Err):
+                    raise ValueError(f"Invalid default {p.default_value} for parameter {p.name}")
+                if not _is_immutable(res):
+                    copied.add(len(defaults))
+                defaults.append((res,))
+            else:
+                defaults.append(())
+            indices[p.name] = len(indices)
+        return StateLayout(indices, tuple(defaults), frozenset(copied))
+
+    def default_instances(self, index: int) -> Sequence[Any]:
+        """
+        Returns the instances present by default for the parameter with the given slot index
+
+        Args:
+            index: Slot index of the parameter
+
+        Returns:
+            The default instances, copied if they may be mutable
+        """
+        if index in self.copied:
+            return copy.deepcopy(self.defaults[index])
+        return self.defaults[index]
+
+    def new_state(self, root_path: Optional[Path]) -> State:
+        """
+        Creates the initial state of a parse, where no parameter was touched yet
+
+        Args:
+            root_path: Base path to use to resolve relative config file paths
+
+        Returns:
+            The initial mutable state
+        """
+        slots: List[Optional[List[Any]]] = [None] * len(self.defaults)
+        return State(root_path, slots, self, config_files_to_process=[], special_action=None)
+
+
 @dataclass
 class State:
     """
     Describes the (mutable) state of a configuration being parsed
+
+    The values of each parameter are stored in a slot, whose index is given by
+    :attr:`.Param.index`. The list of values of a parameter is only allocated when the
+    parameter receives its first value.
     """
 
     root_path: Optional[Path]  #: Base path to use to resolve relative config file paths
-    instances: Dict[str, List[Any]]  #: Contains the sequence of values for each parameter
+
+    #: Values recorded for each parameter by slot index, or None if the parameter is untouched
+    slots: List[Optional[List[Any]]]
+
+    layout: StateLayout  #: Numbering and default values of the parameters
     config_files_to_process: List[Path]  #: Contains a list of configuration files to process
     special_action: Optional[SpecialAction]  #: Contains a special action if flag was encountered
+    flags_ended: bool = False  #: Whether the end of the flags ``--`` was encountered
+    positional_index: int = 0  #: Index of the next expected positional parameter
+
+    #: Contexts of the values being processed, recorded with the :class:`.Unparsed` values
+    origin: Tuple[Tuple[str, Any], ...] = ()
+
+    def append_at(self, index: int, value: Any) -> None:
+        """
+        Appends a value to the parameter with the given slot index
+
+        The sequence of values is updated in place, in amortized constant time. Handlers should
+        use this method to record values. No type checking is performed, be careful.
+
+        Args:
+            index: Slot index of the parameter
+            value: Value to append
+        """
+        self.values_at(index).append(value)
 
     def append(self, key: str, value: Any) -> None:
         """
-        Appends a value to a parameter
+        Appends a value to a parameter given by name
 
-        No type checking is performed, be careful.
+        Handlers that know the parameter index should use :meth:`.append_at` instead.
 
         Args:
             key: Parameter name
             value: Value to append
         """
-        assert key in self.instances, f"{key} is not a Param name"
-        self.instances[key] = [*self.instances[key], value]
+        assert key in self.layout.indices, f"{key} is not a Param name"
+        self.append_at(self.layout.indices[key], value)
+
+    def values_at(self, index: int) -> List[Any]:
+        """
+        Returns the list of values of the parameter with the given slot index, for modification
+
+        The list is allocated, with the default values, if the parameter was untouched.
+
+        Args:
+            index: Slot index of the parameter
+        """
+        slot = self.slots[index]
+        if slot is None:
+            slot = [*self.layout.default_instances(index)]
+            self.slots[index] = slot
+        return slot
+
+    def instances_at(self, index: int) -> Sequence[Any]:
+        """
+        Returns the sequence of values of the parameter with the given slot index
+
+        Args:
+            index: Slot index of the parameter
+        """
+        slot = self.slots[index]
+        if slot is None:
+            if index in self.layout.copied:
+                return self.values_at(index)
+            return self.layout.defaults[index]
+        return slot
+
+    @property
+    def instances(self) -> MutableMapping[str, List[Any]]:
+        """
+        Lists of values for each parameter, by parameter name
+
+        This is a view over the slots: the lists can be modified in place, and assigning a
+        sequence to a parameter replaces its values.
+        """
+        return _StateInstances(self)
 
     @staticmethod
     def make(root_path: Optional[Path], params: Iterable[Param[Any]]) -> State:
         """
         Creates the initial state, populated with the default values when present
 
+        Processors create their states from a precomputed :class:`.StateLayout` instead.
+
         Args:
+            root_path: Base path to use to resolve relative config file paths
             params: Sequence of parameters
 
         Raises:
@@ -96,18 +287,31 @@ class State:
         Returns:
             The initial mutable state
         """
-        instances: Dict[str, List[Any]] = {}
+        return StateLayout.make(params).new_state(root_path)
 
-        for p in params:
-            assert p.name is not None, "Arguments have names after initialization"
-            if p.default_value is not None:
-                res = p.parser.parse(p.default_value)
-                if isinstance(res, Err):
-                    raise ValueError(f"Invalid default {p.default_value} for parameter {p.name}")
-                instances[p.name] = [res]
-            else:
-                instances[p.name] = []
-        return State(root_path, instances, config_files_to_process=[], special_action=None)
+
+class _StateInstances(MutableMapping[str, List[Any]]):
+    """
+    Writable view over the values of the parameters of a state, by parameter name
+    """
+
+    def __init__(self, state: State) -> None:
+        self.state = state
+
+    def __getitem__(self, name: str) -> List[Any]:
+        return self.state.values_at(self.state.layout.indices[name])
+
+    def __setitem__(self, name: str, values: Sequence[Any]) -> None:
+        self.state.slots[self.state.layout.indices[name]] = list(values)
+
+    def __delitem__(self, name: str) -> None:
+        raise TypeError("Parameters cannot be removed from the state")
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.state.layout.indices)
+
+    def __len__(self) -> int:
+        return len(self.state.layout.indices)
 
 
 @dataclass(frozen=True)
@@ -119,42 +323,169 @@ class IniProcessor:
     section_strict: Mapping[str, bool]  #: Sections and their strictness
     kv_handlers: Mapping[str, KVHandler]  #: Handler for key/value pairs
 
-    def _process(self, parser: ConfigParser, state: State) -> Sequence[Err]:
+    #: Streaming scanner reading the files, or None to use :class:`configparser.ConfigParser`
+    scanner: Optional[IniScanner] = None
+
+    #: Directory storing the parsed contents of the files, see :attr:`.Config.ini_cache_dir_`
+    cache_dir: Optional[Path] = None
+
+    def _process(self, contents: IniContents, state: State) -> Sequence[Err]:
         """
-        Processes a filled ConfigParser
+        Processes the contents of an INI file
+
+        The keys including other files are skipped, as included files are processed beforehand
+        by :meth:`.process_files`.
 
         Args:
-            parser: INI data to parse
+            contents: INI data to process
             state: Mutable state to update
 
         Returns:
             Errors that occurred, if any
         """
         errors: List[Err] = []
-        try:
-            for section_name in parser.sections():
-                if section_name in self.section_strict:
-                    for key, value in parser[section_name].items():
-                        err: Optional[Err] = None
-                        if key in self.kv_handlers:
-                            res = self.kv_handlers[key].handle(value, state)
-                            if isinstance(res, Err):
-                                err = res
-                        else:
-                            if self.section_strict[section_name]:
-                                err = Err.make(f"Unknown key {key}")
-                        if err is not None:
-                            errors.append(err.in_context(ini_section=section_name))
-        except configparser.Error:
-            errors.append(Err.make("Parse error"))
-        except IOError:
-            errors.append(Err.make("IO Error"))
+        origin = state.origin
+        for section_name, items in contents.sections:
+            if section_name in self.section_strict:
+                section_origin = (*origin, ("ini_section", section_name))
+                state.origin = section_origin
+                for key, value, line in items:
+                    err: Optional[Err] = None
+                    handler = self.kv_handlers.get(key)
+                    if isinstance(handler, KVConfigParam):
+                        continue
+                    if line is not None:
+                        state.origin = (*section_origin, ("ini_line", line))
+                    if handler is not None:
+                        res = handler.handle(value, state)
+                        if isinstance(res, Err):
+                            err = res
+                    else:
+                        if self.section_strict[section_name]:
+                            err = Err.make(f"Unknown key {key}")
+                    if err is not None:
+                        if line is not None:
+                            err = err.in_context(ini_line=line)
+                        errors.append(err.in_context(ini_section=section_name))
+        state.origin = origin
         return errors
 
+    def _includes(self, contents: IniContents) -> Res[Sequence[Path]]:
+        """
+        Returns the paths of the files included by the contents of an INI file
+
+        Args:
+            contents: INI data
+
+        Returns:
+            The paths, as written in the file, or an error
+        """
+        paths: List[Path] = []
+        errors: List[Err] = []
+        for section_name, items in contents.sections:
+            if section_name in self.section_strict:
+                for key, value, line in items:
+                    handler = self.kv_handlers.get(key)
+                    if isinstance(handler, KVConfigParam):
+                        res = handler.param.parser.parse(value)
+                        if isinstance(res, Err):
+                            err = res.in_context(param=handler.param.name)
+                            if line is not None:
+                                err = err.in_context(ini_line=line)
+                            errors.append(err.in_context(ini_section=section_name))
+                        else:
+                            paths.extend(res)
+        if errors:
+            return Err.collect1(*errors)
+        return paths
+
+    def process_files(self, files: Sequence[Tuple[Path, Path]], state: State) -> Optional[Err]:
+        """
+        Processes configuration files along with the files they include
+
+        The include graph is resolved first. Included files are processed before the file
+        including them, in the order of the includes, so that the including file overrides
+        their values. A file, identified by its device and inode, is processed once even when
+        it is included several times. Include cycles are reported as errors.
+
+        A directory or a glob pattern stands for the INI files it designates, in lexical order
+        (see :func:`~configpile.ini.fragments`). Those files, as the files included by a given
+        file, are read concurrently, while their values are applied in the same order as if they
+        were read one after the other.
+
+        Args:
+            files: Configuration files, as pairs of the path reported in errors and the path
+                   to read
+            state: Mutable state to update
+
+        Returns:
+            An optional error
+        """
+        from .ini import fragments, ini_cache  # pylint: disable=import-outside-toplevel
+
+        order: List[Tuple[Path, IniContents]] = []
+        errors: List[Err] = []
+        done: Set[Tuple[int, int]] = set()
+        chain: List[Tuple[Tuple[int, int], Path]] = []
+
+        def visit_all(items: Sequence[Tuple[Path, Path]]) -> None:
+            entries = ini_cache.entries([path for _, path in items], self.scanner, self.cache_dir)
+            # paths that cannot be read as files may be directories or glob patterns
+            expanded: List[Tuple[Path, Path, Optional[Res[Tuple[FileKey, IniContents]]]]] = []
+            for (name, path), entry in zip(items, entries):
+                parts = fragments(path) if isinstance(entry, Err) else None
+                if parts is None:
+                    expanded.append((name, path, entry))
+                elif isinstance(parts, Err):
+                    errors.append(parts.in_context(ini_file=name))
+                else:
+                    expanded.extend((part, part, None) for part in parts)
+            part_entries = iter(
+                ini_cache.entries(
+                    [path for _, path, e in expanded if e is None], self.scanner, self.cache_dir
+                )
+            )
+            for name, path, found in expanded:
+                visit(name, path, next(part_entries) if found is None else found)
+
+        def visit(name: Path, path: Path, entry: Res[Tuple[FileKey, IniContents]]) -> None:
+            if isinstance(entry, Err):
+                errors.append(entry.in_context(ini_file=name))
+                return
+            key, contents = entry
+            file_id = (key[0], key[1])
+            if file_id in done:
+                return
+            ids = [i for i, _ in chain]
+            if file_id in ids:
+                cycle = [str(n) for _, n in chain[ids.index(file_id) :]] + [str(name)]
+                errors.append(Err.make(f"Include cycle: {' -> '.join(cycle)}"))
+                return
+            chain.append((file_id, name))
+            includes = self._includes(contents)
+            if isinstance(includes, Err):
+                errors.append(includes.in_context(ini_file=name))
+            else:
+                included = [i if i.is_absolute() else path.parent / i for i in includes]
+                visit_all([(i, i) for i in included])
+            chain.pop()
+            done.add(file_id)
+            order.append((name, contents))
+
+        visit_all(files)
+        origin = state.origin
+        for name, contents in order:
+            state.origin = (*origin, ("ini_file", name))
+            errors.extend(e.in_context(ini_file=name) for e in self._process(contents, state))
+        state.origin = origin
+        return Err.collect(*errors)
+
     def process_string(self, ini_contents: str, state: State) -> Optional[Err]:
         """
         Processes a configuration file given as a string
 
+        Included files are resolved relative to the root path of the state.
+
         Args:
             ini_contents: Contents of the INI file
             state: Mutable state to update
@@ -162,23 +493,39 @@ class IniProcessor:
         Returns:
             An optional error
         """
-        errors: List[Err] = []
-        parser = ConfigParser()
-        try:
-            parser.read_string(ini_contents)
-            errors.extend(self._process(parser, state))
-        except configparser.Error:
-            errors.append(Err.make("Parse error"))
-        except IOError:
-            errors.append(Err.make("IO Error"))
-        if errors:
-            return Err.collect(*errors)
+        from .ini import IniContents  # pylint: disable=import-outside-toplevel
+
+        if self.scanner is not None:
+            scanner = dataclasses.replace(self.scanner, lowercase_keys=True)
+            contents = scanner.scan(ini_contents.splitlines())
         else:
-            return None
+            contents = IniContents.parse(ini_contents, lowercase_keys=True)
+        if isinstance(contents, Err):
+            return contents
+        includes = self._includes(contents)
+        if isinstance(includes, Err):
+            return includes
+        errors: List[Err] = []
+        files: List[Tuple[Path, Path]] = []
+        for p in includes:
+            if p.is_absolute():
+                files.append((p, p))
+            elif state.root_path is None:
+                errors.append(Err.make("Relative include path given with no root path known"))
+            else:
+                files.append((p, state.root_path / p))
+        err = self.process_files(files, state)
+        if err is not None:
+            errors.append(err)
+        errors.extend(self._process(contents, state))
+        return Err.collect(*errors)
 
     def process(self, ini_file_path: Path, state: State) -> Optional[Err]:
         """
-        Processes a configuration file
+        Processes a configuration file, along with the files it includes
+
+        The contents of the files are cached by :data:`~configpile.ini.ini_cache`, and the files
+        are only read again when they change.
 
         Args:
             ini_path: Path to the INI file
@@ -187,26 +534,7 @@ class IniProcessor:
         Returns:
             An optional error
         """
-        errors: List[Err] = []
-        if not ini_file_path.exists():
-            return Err.make(f"Config file {ini_file_path} does not exist")
-        if not ini_file_path.is_file():
-            return Err.make(f"Path {ini_file_path} is not a file")
-        parser = ConfigParser()
-        # disable conversion to lower-case
-        parser.optionxform = str  # type: ignore
-        try:
-            with open(ini_file_path, "r", encoding="utf-8") as file:
-                parser.read_file(file)
-                errors.extend(self._process(parser, state))
-        except configparser.Error:
-            errors.append(Err.make("Parse error"))
-        except IOError:
-            errors.append(Err.make("IO Error"))
-        if errors:
-            return Err.collect(*errors)
-        else:
-            return None
+        return self.process_files([(ini_file_path, ini_file_path)], state)
 
 
 @dataclass
@@ -220,18 +548,6 @@ class ProcessorFactory(Generic[_Config]):
     #: List of parameters indexed by their field name
     params_by_name: Dict[str, Param[Any]]
 
-    #: Argument parser to update, used to display help and for the Sphinx documentation
-    argument_parser: argparse.ArgumentParser
-
-    #: Argument parser group for commands
-    ap_commands: argparse._ArgumentGroup
-
-    #: Argument parser group for required parameters
-    ap_required: argparse._ArgumentGroup
-
-    #: Argument parser group for optional parameters
-    ap_optional: argparse._ArgumentGroup
-
     #: Handlers for environment variables
     env_handlers: Dict[str, KVHandler]  # = {}
 
@@ -249,6 +565,9 @@ class ProcessorFactory(Generic[_Config]):
 
     validators: List[Callable[[_Config], Optional[Err]]]
 
+    #: When the values of parameters keeping the last value are parsed
+    parse_mode: ParseMode
+
     @staticmethod
     def _trim_docstring(docstring: str) -> str:
         """Trims a docstring
@@ -294,6 +613,69 @@ class ProcessorFactory(Generic[_Config]):
         Returns:
             A processor factory
         """
+        return ProcessorFactory(
+            params_by_name={},
+            env_handlers={},
+            ini_section_strict={s.name: s.strict for s in config_type.ini_sections_()},
+            ini_handlers={},
+            cl_flag_handlers={},
+            cl_positionals=[],
+            validators=[*config_type.validators_()],
+            parse_mode=config_type.parse_mode_,
+        )
+
+    @staticmethod
+    def extending(config_type: Type[_Config], base: Processor[Any]) -> ProcessorFactory[_Config]:
+        """
+        Constructs a processor factory populated with the arguments of a base configuration
+
+        Args:
+            config_type: Configuration to process
+            base: Processor of the base class of the configuration
+
+        Returns:
+            A processor factory
+        """
+        params_by_name = dict(base.params_by_name)
+        return ProcessorFactory(
+            params_by_name=params_by_name,
+            env_handlers=dict(base.env_handlers),
+            ini_section_strict={s.name: s.strict for s in config_type.ini_sections_()},
+            ini_handlers=dict(base.ini_processor.kv_handlers),
+            cl_flag_handlers=dict(base.cl_handler.flags),
+            cl_positionals=[p for p in params_by_name.values() if p.positional is not None],
+            validators=[*config_type.validators_()],
+            parse_mode=config_type.parse_mode_,
+        )
+
+
+@dataclass(frozen=True)
+class ArgumentParserGroups:
+    """
+    Argument parser used to display help and for the Sphinx documentation, with its groups
+    """
+
+    parser: argparse.ArgumentParser  #: Argument parser
+
+    commands: argparse._ArgumentGroup  #: Argument parser group for commands
+
+    required: argparse._ArgumentGroup  #: Argument parser group for required parameters
+
+    optional: argparse._ArgumentGroup  #: Argument parser group for optional parameters
+
+    @staticmethod
+    def make(config_type: Type[Config]) -> ArgumentParserGroups:
+        """
+        Constructs an argument parser without arguments
+
+        Args:
+            config_type: Configuration to document
+
+        Returns:
+            The argument parser and its groups
+        """
+        import argparse  # pylint: disable=import-outside-toplevel
+
         # fill program name from script invocation
         prog = config_type.prog_
         if prog is None:
@@ -305,7 +687,9 @@ class ProcessorFactory(Generic[_Config]):
             description = config_type.__doc__
 
         if description is not None:
-            description = ProcessorFactory._trim_docstring(description)
+            description = ProcessorFactory._trim_docstring(  # pylint: disable=protected-access
+                description
+            )
 
         argument_parser = argparse.ArgumentParser(
             prog=prog,
@@ -314,19 +698,10 @@ class ProcessorFactory(Generic[_Config]):
             add_help=False,
         )
         argument_parser._action_groups.pop()  # pylint: disable=protected-access
-        return ProcessorFactory(
-            params_by_name={},
-            argument_parser=argument_parser,
-            ap_commands=argument_parser.add_argument_group("commands"),
-            ap_optional=argument_parser.add_argument_group("optional arguments"),
-            ap_required=argument_parser.add_argument_group("required arguments"),
-            env_handlers={},
-            ini_section_strict={s.name: s.strict for s in config_type.ini_sections_()},
-            ini_handlers={},
-            cl_flag_handlers={},
-            cl_positionals=[],
-            validators=[*config_type.validators_()],
-        )
+        commands = argument_parser.add_argument_group("commands")
+        optional = argument_parser.add_argument_group("optional arguments")
+        required = argument_parser.add_argument_group("required arguments")
+        return ArgumentParserGroups(argument_parser, commands, required, optional)
 
 
 @dataclass(frozen=True)
@@ -338,10 +713,14 @@ class Processor(Generic[_Config]):
     #: Configuration to parse
     config_type: Type[_Config]
 
-    #: Completed argument parser, used only for documentation purposes (CLI and Sphinx)
-    argument_parser: argparse.ArgumentParser
+    #: Arguments of the configuration by field name, in declaration order
+    #:
+    #: Only the help text provided explicitly is present, see :attr:`.documented_args`
+    args: Mapping[str, Arg]
 
-    #: Environment variable handlers
+    #: Environment variable handlers, in processing order
+    #:
+    #: Root paths come first, then configuration files, then the other parameters.
     env_handlers: Mapping[str, KVHandler]
 
     #: INI file processor
@@ -355,20 +734,80 @@ class Processor(Generic[_Config]):
 
     validators: Sequence[Callable[[_Config], Optional[Err]]]
 
+    #: Numbering of the parameters in the parsing state, with their default values
+    layout: StateLayout
+
+    #: Processor of the base class, when this processor was built by extending it
+    base: Optional[Processor[Any]] = None
+
+    @cached_property
+    def argument_parser(self) -> argparse.ArgumentParser:
+        """
+        Completed argument parser, used only for documentation purposes (CLI and Sphinx)
+
+        It is constructed on first access.
+        """
+        groups = ArgumentParserGroups.make(self.config_type)
+        for arg in self.documented_args.values():
+            arg.update_argument_parser(groups)
+        return groups.parser
+
     @staticmethod
-    def process_fields(config_type: Type[_Config]) -> Sequence[Arg]:
+    def _own_annotations(config_type: type) -> Mapping[str, Any]:
         """
-        Returns a sequence of the arguments present in a configuration, with updated data
+        Returns the annotations of a class, excluding those of its bases
+
+        Args:
+            config_type: Class to inspect
+
+        Returns:
+            The unresolved annotations
+        """
+        if sys.version_info >= (3, 10):
+            return inspect.get_annotations(config_type)
+        return config_type.__dict__.get("__annotations__", {})
+
+    @staticmethod
+    def _type_hints(config_type: Type[_Config], own_only: bool) -> Mapping[str, Any]:
+        """
+        Resolves the type hints of a configuration
 
         Args:
             config_type: Configuration to process
+            own_only: Whether to skip the annotations of the base classes
 
         Returns:
-            Sequence of arguments
+            Type hints by field name
+        """
+        if not own_only:
+            return get_type_hints(config_type, include_extras=True)
+        # a class without bases carrying the same annotations, resolved in the same namespaces
+        own = type(
+            config_type.__name__,
+            (),
+            {
+                "__annotations__": dict(Processor._own_annotations(config_type)),
+                "__module__": config_type.__module__,
+            },
+        )
+        return get_type_hints(own, localns=dict(vars(config_type)), include_extras=True)
+
+    @staticmethod
+    def _declared_fields(
+        config_type: Type[_Config], own_only: bool = False
+    ) -> Sequence[Tuple[str, Arg]]:
         """
-        args: List[Arg] = []
-        docs: ClassDoc[_Config] = ClassDoc.make(config_type)
-        th = get_type_hints(config_type, include_extras=True)
+        Returns the arguments declared in a configuration, as they appear in the declaration
+
+        Args:
+            config_type: Configuration to process
+            own_only: Whether to skip the arguments declared in the base classes
+
+        Returns:
+            Sequence of field names and arguments
+        """
+        fields: List[Tuple[str, Arg]] = []
+        th = Processor._type_hints(config_type, own_only)
         for name, typ in th.items():
             arg: Optional[Arg] = None
             if get_origin(typ) is ClassVar:
@@ -381,40 +820,213 @@ class Processor(Generic[_Config]):
                 if param is not None:
                     arg = param
             if arg is not None:
+                fields.append((name, arg))
+        return fields
+
+    @staticmethod
+    def process_fields(config_type: Type[_Config]) -> Sequence[Arg]:
+        """
+        Returns a sequence of the arguments present in a configuration, with updated data
+
+        The help text of the arguments is not extracted from the class source at this stage,
+        see :attr:`.documented_args`.
+
+        Args:
+            config_type: Configuration to process
+
+        Returns:
+            Sequence of arguments
+        """
+        return list(Processor._updated_fields(config_type).values())
+
+    @staticmethod
+    def _updated_fields(config_type: Type[_Config], own_only: bool = False) -> Mapping[str, Arg]:
+        """
+        Returns the arguments present in a configuration by field name, with updated data
+
+        Args:
+            config_type: Configuration to process
+            own_only: Whether to skip the arguments declared in the base classes
+
+        Returns:
+            Arguments by field name
+        """
+        env_prefix = config_type.env_prefix_
+        return {
+            name: arg.updated(name, None, env_prefix)
+            for name, arg in Processor._declared_fields(config_type, own_only)
+        }
+
+    @staticmethod
+    def extended_base(config_type: Type[_Config]) -> Optional[type]:
+        """
+        Returns the base class whose processor can be extended to process a configuration
+
+        This is the case when the configuration has a single base class, itself a strict
+        subclass of :class:`~configpile.config.Config`, with the same environment variable
+        prefix and parse mode. The configuration must also not redefine the fields of its base,
+        which is checked by :meth:`.make`.
+
+        Args:
+            config_type: Configuration to process
+
+        Returns:
+            The base class, or None if the processor must be built from scratch
+        """
+        from .config import Config  # pylint: disable=import-outside-toplevel
+
+        if len(config_type.__bases__) != 1:
+            return None
+        base = config_type.__bases__[0]
+        if base is Config or not issubclass(base, Config):
+            return None
+        if base.env_prefix_ != config_type.env_prefix_:
+            return None
+        if base.parse_mode_ != config_type.parse_mode_:
+            return None
+        return base
+
+    def _with_help(self, help_texts: Mapping[str, str]) -> Mapping[str, Arg]:
+        """
+        Returns the arguments of this processor, filling the missing help text
+
+        Args:
+            help_texts: Help text by field name
+
+        Returns:
+            Arguments by field name
+        """
+        return {
+            name: arg if arg.help is not None else dataclasses.replace(arg, help=help_texts[name])
+            for name, arg in self.args.items()
+        }
+
+    @cached_property
+    def documented_args(self) -> Mapping[str, Arg]:
+        """
+        Arguments of the configuration by field name, with their help text
+
+        The help text not provided explicitly is extracted from the class source on first
+        access, only looking at the classes that declare arguments. If the configuration enables
+        schema snapshots, the help text is read from an up-to-date snapshot when available,
+        otherwise the snapshot is written.
+        """
+        from .snapshot import SchemaSnapshot  # pylint: disable=import-outside-toplevel
+
+        missing = [name for name, arg in self.args.items() if arg.help is None]
+        if not missing:
+            return self.args
+        help_texts: Dict[str, str] = {}
+        if self.base is not None:
+            # the help text of the inherited arguments is shared with the base processor
+            inherited = self.base.documented_args
+            for name in missing:
+                if name in inherited:
+                    help_texts[name] = inherited[name].help or ""
+        snapshot_path = SchemaSnapshot.path_for(self.config_type)
+        if snapshot_path is not None:
+            snapshot = SchemaSnapshot.load(snapshot_path, self.config_type)
+            if snapshot is not None:
+                documented = self._with_help({name: snapshot.help(name) for name in missing})
+                if SchemaSnapshot.make(self.config_type, [*documented.items()]) == snapshot:
+                    return documented
+
+        own_missing = [name for name in missing if name not in help_texts]
+        if own_missing:
+            docs: ClassDoc[_Config] = ClassDoc.make(self.config_type, own_missing)
+            for name in own_missing:
                 help_lines = docs[name]
                 if help_lines is None:
-                    hlp = ""
+                    help_texts[name] = ""
                 else:
-                    hlp = "\n".join(help_lines)
-                arg = arg.updated(name, hlp, config_type.env_prefix_)
-                args.append(arg)
-        return args
+                    help_texts[name] = "\n".join(help_lines)
+        documented = self._with_help(help_texts)
+        if snapshot_path is not None:
+            SchemaSnapshot.make(self.config_type, [*documented.items()]).save(snapshot_path)
+        return documented
 
     @staticmethod
     def make(
         config_type: Type[_Config],
+        base: Optional[Processor[Any]] = None,
     ) -> Processor[_Config]:
         """
         Creates the processor corresponding to a configuration
-        """
 
-        pf = ProcessorFactory.make(config_type)
-        for arg in Processor.process_fields(config_type):
+        When the processor of the base class is provided (see :meth:`.extended_base`), its
+        handlers and help text are reused, and only the fields declared in the configuration
+        class itself are processed.
+
+        Args:
+            config_type: Configuration to process
+            base: Processor of the base class of the configuration
+
+        Raises:
+            ValueError: If a default value cannot be parsed correctly, if expanders form a
+                        cycle, or if repeated INI keys are enabled without the streaming scanner
+
+        Returns:
+            The processor
+        """
+        if base is not None:
+            own = {*Processor._own_annotations(config_type), *vars(config_type)}
+            if any(name in own for name in base.args):
+                base = None  # fields are redefined, the declaration order may change
+
+        if base is None:
+            pf = ProcessorFactory.make(config_type)
+            args = Processor._updated_fields(config_type)
+        else:
+            pf = ProcessorFactory.extending(config_type, base)
+            args = Processor._updated_fields(config_type, own_only=True)
+        for arg in args.values():
             arg.update_processor(pf)
+        # parses the default values, so that invalid defaults are reported when building
+        own_params = [p for name, p in pf.params_by_name.items() if base is None or name in args]
+        layout = StateLayout.make(own_params, None if base is None else base.layout)
+        if base is not None:
+            args = {**base.args, **args}
 
         # if these flags are no longer provided by default, update the overview concept notebook
         # in the documentation
         pf.cl_flag_handlers["-h"] = CLSpecialAction(SpecialAction.HELP)
         pf.cl_flag_handlers["--help"] = CLSpecialAction(SpecialAction.HELP)
+        flags = FlagTable.make(
+            CLExpansion.resolve(pf.cl_flag_handlers),
+            allow_abbrev=config_type.allow_abbrev_,
+            allow_clusters=config_type.allow_short_flag_clusters_,
+        )
+
+        scanner: Optional[IniScanner] = None
+        if config_type.ini_streaming_:
+            from .ini import IniScanner  # pylint: disable=import-outside-toplevel
+
+            scanner = IniScanner(
+                frozenset(pf.ini_section_strict), repeated_keys=config_type.ini_repeated_keys_
+            )
+        elif config_type.ini_repeated_keys_:
+            raise ValueError("Repeated INI keys require the streaming INI scanner")
+
+        # root paths, then configuration files given by environment variables are processed
+        # first, so that the values of the other variables take precedence
+        env_handlers: Dict[str, KVHandler] = {}
+        for kind in (KVRootParam, KVConfigParam, KVHandler):
+            env_handlers.update(
+                (name, h) for name, h in pf.env_handlers.items() if isinstance(h, kind)
+            )
 
         return Processor(
             config_type=config_type,
-            argument_parser=pf.argument_parser,
-            env_handlers=pf.env_handlers,
-            ini_processor=IniProcessor(pf.ini_section_strict, pf.ini_handlers),
-            cl_handler=CLStdHandler(pf.cl_flag_handlers, CLPos(pf.cl_positionals)),
+            args=args,
+            env_handlers=env_handlers,
+            ini_processor=IniProcessor(
+                pf.ini_section_strict, pf.ini_handlers, scanner, config_type.ini_cache_dir_
+            ),
+            cl_handler=CLStdHandler(flags, CLPos.make(pf.cl_positionals)),
             params_by_name=pf.params_by_name,
             validators=pf.validators,
+            layout=layout,
+            base=base,
         )
 
     def _process_config(self, state: State) -> Optional[Err]:
@@ -428,24 +1040,22 @@ class Processor(Generic[_Config]):
             An optional error
         """
         paths = state.config_files_to_process
+        if not paths:
+            return None
         state.config_files_to_process = []
         errors: List[Err] = []
+        files: List[Tuple[Path, Path]] = []
         for p in paths:
-            err: Optional[Err] = None
-            config_path: Optional[Path] = None
             if p.is_absolute():
-                config_path = p
+                files.append((p, p))
+            elif state.root_path is None:
+                msg = "Relative configuration file path given with no root path known"
+                errors.append(Err.make(msg, ini_file=p))
             else:
-                if state.root_path is None:
-                    err = Err.make(
-                        "Relative configuration file path given with no root path known"
-                    )
-                else:
-                    config_path = state.root_path / p
-            if config_path is not None:
-                err = self.ini_processor.process(config_path, state)
-            if err is not None:
-                errors.append(err.in_context(ini_file=p))
+                files.append((p, state.root_path / p))
+        err = self.ini_processor.process_files(files, state)
+        if err is not None:
+            errors.append(err)
         return Err.collect(*errors)
 
     def process_ini_contents(self, ini_contents: str) -> Res[_Config]:
@@ -517,8 +1127,17 @@ class Processor(Generic[_Config]):
         assert state.special_action is None
         errors: List[Err] = []
         collected: Dict[str, Any] = {}
+        parse_mode = self.config_type.parse_mode_
         for name, param in self.params_by_name.items():
-            instances = state.instances[name]
+            assert param.index is not None
+            instances = state.instances_at(param.index)
+            # only parameters keeping their last value record unparsed values
+            if parse_mode.is_lazy() and param.collector.keeps_last() and instances:
+                parsed = self._parse_unparsed(param, instances, parse_mode)
+                if isinstance(parsed, Err):
+                    errors.append(parsed)
+                    continue
+                instances = parsed
             res = param.collector.collect(instances)
             if isinstance(res, Err):
                 errors.append(res.in_context(param=name))
@@ -534,6 +1153,37 @@ class Processor(Generic[_Config]):
         else:
             return c
 
+    @staticmethod
+    def _parse_unparsed(
+        param: Param[Any], instances: Sequence[Any], parse_mode: ParseMode
+    ) -> Res[Sequence[Any]]:
+        """
+        Parses the values of a parameter that were recorded as strings
+
+        Args:
+            param: Parameter
+            instances: Values of the parameter, some of them possibly :class:`.Unparsed`
+            parse_mode: Lazy parse mode, telling whether all values are parsed
+
+        Returns:
+            The parsed values, only the last one if not all values are parsed, or an error
+        """
+        if parse_mode == ParseMode.LAST_ONLY:
+            instances = instances[-1:]
+        elif not any(isinstance(i, Unparsed) for i in instances):
+            return instances
+        values: List[Any] = []
+        errors: List[Err] = []
+        for i in instances:
+            res = i.parse(param) if isinstance(i, Unparsed) else i
+            if isinstance(res, Err):
+                errors.append(res)
+            else:
+                values.append(res)
+        if errors:
+            return Err.collect1(*errors)
+        return values
+
     def _state_with_default_values(self, root_path: Optional[Path]) -> State:
         """
         Returns a new state instance with default values populated
@@ -541,7 +1191,61 @@ class Processor(Generic[_Config]):
         Args:
             root_path: Optional root path used to resolve configuration file paths
         """
-        return State.make(root_path, self.params_by_name.values())
+        return self.layout.new_state(root_path)
+
+    def _process_chunks(
+        self,
+        cl_handler: CLStdHandler,
+        chunks: Iterator[Tuple[List[str], List[Origin]]],
+        state: State,
+        errors: List[Err],
+    ) -> None:
+        """
+        Processes command-line arguments provided by chunks, with their location
+
+        An argument starting with a hyphen that ends a chunk is processed with the next chunk,
+        so that the value of a flag is available.
+
+        Args:
+            cl_handler: Command line arguments handler
+            chunks: Chunks of arguments with their location, see :mod:`.responsefiles`
+            state: Mutable state to update
+            errors: Mutable list where errors are appended
+        """
+        from .responsefiles import in_origin  # pylint: disable=import-outside-toplevel
+
+        buffer: Sequence[str] = []
+        origins: Sequence[Origin] = []
+        chunk = next(chunks, None)
+        while chunk is not None:
+            next_chunk = next(chunks, None)
+            buffer = [*buffer, *chunk[0]]
+            origins = [*origins, *chunk[1]]
+            pos = 0
+            while pos < len(buffer):
+                if (
+                    pos == len(buffer) - 1
+                    and next_chunk is not None
+                    and buffer[pos].startswith("-")
+                ):
+                    break
+                new_buffer, new_pos, err = cl_handler.handle_at(buffer, pos, state)
+                if err is not None:
+                    # reported at the last argument consumed, usually the value of a flag
+                    last = new_pos - 1 if new_buffer is buffer and new_pos > pos else pos
+                    errors.append(in_origin(err, origins[last]))
+                if new_buffer is not buffer:
+                    # arguments were inserted, the unprocessed tail of the buffer is kept
+                    tail = min(len(new_buffer), len(buffer) - pos - 1)
+                    origins = [origins[pos]] * (len(new_buffer) - tail) + [
+                        *origins[len(origins) - tail :]
+                    ]
+                buffer, pos = new_buffer, new_pos
+                err = self._process_config(state)
+                if err is not None:
+                    errors.append(err)
+            buffer, origins = buffer[pos:], origins[pos:]
+            chunk = next_chunk
 
     def process_command_line(
         self,
@@ -552,6 +1256,9 @@ class Processor(Generic[_Config]):
         """
         Processes command-line arguments, configuration files and environment variables
 
+        If enabled by :attr:`~configpile.config.Config.response_file_prefix_`, the response
+        files present in the command-line arguments are read lazily.
+
         Args:
             cwd: Working directory, used as a base for configuration file relative paths
             args: Command line arguments to parse
@@ -562,25 +1269,37 @@ class Processor(Generic[_Config]):
         """
         errors: List[Err] = []
         state = self._state_with_default_values(cwd)
-        # process environment variables
-        for key, value in env.items():
-            handler = self.env_handlers.get(key)
-            if handler is not None:
-                err = handler.handle(value, state)
-                if err is not None:
-                    errors.append(err.in_context(environment_variable=key))
-            err = self._process_config(state)
+        cl_handler = self.cl_handler
+        # process environment variables, looking up only the registered names
+        for key, handler in self.env_handlers.items():
+            value = env.get(key)
+            if value is None:
+                continue
+            state.origin = (("environment_variable", key),)
+            err = handler.handle(value, state)
             if err is not None:
                 errors.append(err.in_context(environment_variable=key))
+            if state.config_files_to_process:
+                err = self._process_config(state)
+                if err is not None:
+                    errors.append(err.in_context(environment_variable=key))
+        state.origin = ()
         # process command line arguments
-        rest_args: Sequence[str] = args
-        while rest_args:
-            rest_args, err = self.cl_handler.handle(rest_args, state)
-            if err is not None:
-                errors.append(err)
-            err = self._process_config(state)
-            if err is not None:
-                errors.append(err)
+        from .responsefiles import ResponseFileReader  # pylint: disable=import-outside-toplevel
+
+        reader = ResponseFileReader.make(self.config_type, cwd)
+        if reader is not None:
+            self._process_chunks(cl_handler, reader.chunks(args, errors), state, errors)
+        else:
+            buffer: Sequence[str] = args
+            pos = 0
+            while pos < len(buffer):
+                buffer, pos, err = cl_handler.handle_at(buffer, pos, state)
+                if err is not None:
+                    errors.append(err)
+                err = self._process_config(state)
+                if err is not None:
+                    errors.append(err)
 
         if state.special_action is not None:
             return state.special_action
@@ -589,3 +1308,146 @@ class Processor(Generic[_Config]):
             return Err.collect1(*errors)
 
         return self._finish_processing_state(state)
+
+
+class CacheInfo(NamedTuple):
+    """
+    Statistics about a :class:`.ProcessorCache`
+    """
+
+    hits: int  #: Number of processor builds avoided
+    misses: int  #: Number of processor builds performed
+    currsize: int  #: Number of processors currently stored
+
+
+class ProcessorCache:
+    """
+    Thread-safe cache of processors, indexed by configuration type
+
+    Processors are built once per configuration class. If a class is modified at runtime,
+    its processor must be discarded using :meth:`.invalidate`.
+
+    A processor is stored in an attribute of its configuration class, and the cache only keeps
+    weak references to the classes, so that classes created dynamically, for example by
+    :func:`~configpile.config.make_config`, can be garbage collected along with their
+    processor.
+    """
+
+    _instances = itertools.count()
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        # name of the class attribute storing the processor, in the class dictionary
+        self._attribute = f"_configpile_processor_{next(ProcessorCache._instances)}"
+        self._types: weakref.WeakSet[type] = weakref.WeakSet()
+        self._build_locks: weakref.WeakKeyDictionary[type, threading.Lock] = (
+            weakref.WeakKeyDictionary()
+        )
+        self._generation = 0  # incremented by invalidate, so that stale builds are not stored
+        self._hits = 0
+        self._misses = 0
+
+    def _cached(self, config_type: type) -> Optional[Processor[Any]]:
+        """
+        Returns the processor stored for a configuration, ignoring the ones of its parents
+
+        Must be called with the lock held.
+        """
+        return cast(Optional[Processor[Any]], vars(config_type).get(self._attribute))
+
+    def get(self, config_type: Type[_Config]) -> Processor[_Config]:
+        """
+        Returns the processor of a configuration, building it if necessary
+
+        Concurrent requests for the same configuration type build the processor only once. A
+        processor whose build overlaps with a call to :meth:`.invalidate` is returned but not
+        stored.
+
+        Args:
+            config_type: Configuration to process
+
+        Returns:
+            The processor
+        """
+        with self._lock:
+            processor = self._cached(config_type)
+            if processor is not None:
+                self._hits += 1
+                return processor
+            build_lock = self._build_locks.setdefault(config_type, threading.Lock())
+        with build_lock:
+            with self._lock:
+                processor = self._cached(config_type)
+                if processor is not None:  # built by another thread in the meantime
+                    self._hits += 1
+                    return processor
+                generation = self._generation
+            try:
+                base_type = Processor.extended_base(config_type)
+                base: Optional[Processor[Any]] = None
+                if base_type is not None:
+                    base = self.get(base_type)
+                processor = Processor.make(config_type, base)
+            finally:
+                with self._lock:
+                    if self._build_locks.get(config_type) is build_lock:
+                        del self._build_locks[config_type]
+            with self._lock:
+                self._misses += 1
+                if self._generation == generation:
+                    setattr(config_type, self._attribute, processor)
+                    self._types.add(config_type)
+            return processor
+
+    def warm_up(self, config_type: Type[_Config]) -> threading.Thread:
+        """
+        Builds the processor of a configuration in a background thread
+
+        A later call to :meth:`.get` waits for the build to finish instead of starting another
+        one. If the build fails, the error is ignored in the background thread, and raised again
+        by :meth:`.get`.
+
+        Args:
+            config_type: Configuration to process
+
+        Returns:
+            The started daemon thread
+        """
+
+        def build() -> None:
+            try:
+                self.get(config_type)
+            except Exception:  # pylint: disable=broad-except
+                pass
+
+        thread = threading.Thread(
+            target=build, name=f"configpile warm-up of {config_type.__name__}", daemon=True
+        )
+        thread.start()
+        return thread
+
+    def invalidate(self, config_type: Optional[type] = None) -> None:
+        """
+        Discards cached processors
+
+        Args:
+            config_type: Configuration whose processor, and the processors of its subclasses,
+                         are discarded; if omitted, the whole cache is cleared
+        """
+        with self._lock:
+            self._generation += 1
+            for t in list(self._types):
+                if config_type is None or issubclass(t, config_type):
+                    delattr(t, self._attribute)
+                    self._types.discard(t)
+
+    def info(self) -> CacheInfo:
+        """
+        Returns statistics about the cache usage
+        """
+        with self._lock:
+            return CacheInfo(self._hits, self._misses, len(self._types))
+
+
+#: Processor cache used by :meth:`.Config.processor_`
+processor_cache = ProcessorCache()
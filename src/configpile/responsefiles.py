@@ -0,0 +1,187 @@
+"""
+Response files
+
+A response file contains command-line arguments, and is referenced on the command line by its
+path with a prefix, for example ``@args.txt``. This is used when the argument list is too long
+to be passed on the command line.
+
+Response files are read lazily, and their arguments are provided in chunks to the
+command-line handlers, so that the whole argument list is never materialized. Response files
+can reference other response files, up to a maximal depth.
+
+Response files are enabled by setting :attr:`~configpile.config.Config.response_file_prefix_`.
+
+.. rubric:: Types
+
+This module uses the following types.
+
+.. py:data:: Origin
+
+    Location of an argument: the response file path and the line number, or None for
+    arguments present on the command line
+"""
+
+from __future__ import annotations
+
+import itertools
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Iterator, List, Optional, Sequence, Tuple, Type
+
+from .enums import ResponseFileSyntax
+from .userr import Err
+
+if TYPE_CHECKING:
+    from .config import Config
+
+Origin = Optional[Tuple[Path, int]]
+
+
+def in_origin(err: Err, origin: Origin) -> Err:
+    """
+    Adds the location of an argument to an error
+
+    Args:
+        err: Error that occurred when processing the argument
+        origin: Location of the argument
+
+    Returns:
+        The updated error
+    """
+    if origin is None:
+        return err
+    return err.in_context(response_file=origin[0], line=origin[1])
+
+
+@dataclass(frozen=True)
+class ResponseFileReader:
+    """
+    Expands the response files present in command-line arguments
+    """
+
+    prefix: str  #: Prefix of the arguments that name response files
+    syntax: ResponseFileSyntax  #: Syntax of the response files
+    max_depth: int  #: Maximal nesting depth of response files
+    cwd: Path  #: Directory used as a base for relative response file paths
+    chunk_size: int = 4096  #: Number of arguments provided at once to the handlers
+
+    @staticmethod
+    def make(config_type: Type[Config], cwd: Path) -> Optional[ResponseFileReader]:
+        """
+        Creates the response file reader of a configuration
+
+        Args:
+            config_type: Configuration whose settings are used
+            cwd: Directory used as a base for relative response file paths
+
+        Returns:
+            The reader, or None if response files are disabled
+        """
+        prefix = config_type.response_file_prefix_
+        if prefix is None:
+            return None
+        return ResponseFileReader(
+            prefix, config_type.response_file_syntax_, config_type.response_file_max_depth_, cwd
+        )
+
+    def _split(self, line: str) -> Sequence[str]:
+        """
+        Splits a line of a response file into arguments
+
+        Args:
+            line: Line, including the line terminator
+
+        Raises:
+            ValueError: If the line cannot be split
+
+        Returns:
+            The arguments
+        """
+        if self.syntax == ResponseFileSyntax.LINES:
+            arg = line.rstrip("\r\n")
+            return [arg] if arg else []
+        elif self.syntax == ResponseFileSyntax.SHELL:
+            import shlex  # pylint: disable=import-outside-toplevel
+
+            return shlex.split(line, comments=True)
+        else:
+            raise NotImplementedError
+
+    def _file_args(
+        self, name: str, depth: int, origin: Origin, errors: List[Err]
+    ) -> Iterator[Tuple[str, Origin]]:
+        """
+        Yields the arguments of a response file, expanding nested response files
+
+        Args:
+            name: Path of the response file, as given in the argument
+            depth: Nesting depth of the response file, starting at 1
+            origin: Location of the argument that references the response file
+            errors: Mutable list where errors are appended
+
+        Returns:
+            An iterator over the arguments and their location
+        """
+        if depth > self.max_depth:
+            err = Err.make(f"Response files are nested more than {self.max_depth} levels deep")
+            errors.append(in_origin(err, origin))
+            return
+        path = Path(name)
+        if not path.is_absolute():
+            path = self.cwd / path
+        try:
+            with open(path, "r", encoding="utf-8") as file:
+                for line_number, line in enumerate(file, start=1):
+                    try:
+                        args = self._split(line)
+                    except ValueError as e:
+                        err = Err.make(f"Cannot split line: {e}")
+                        errors.append(in_origin(err, (path, line_number)))
+                        continue
+                    for arg in args:
+                        if arg.startswith(self.prefix):
+                            yield from self._file_args(
+                                arg[len(self.prefix) :], depth + 1, (path, line_number), errors
+                            )
+                        else:
+                            yield (arg, (path, line_number))
+        except OSError as e:
+            err = Err.make(f"Cannot read response file {name}: {e.strerror}")
+            errors.append(in_origin(err, origin))
+
+    def args(self, args: Sequence[str], errors: List[Err]) -> Iterator[Tuple[str, Origin]]:
+        """
+        Yields command-line arguments, replacing response files by their contents
+
+        Args:
+            args: Command-line arguments
+            errors: Mutable list where errors are appended
+
+        Returns:
+            An iterator over the arguments and their location
+        """
+        for arg in args:
+            if arg.startswith(self.prefix):
+                yield from self._file_args(arg[len(self.prefix) :], 1, None, errors)
+            else:
+                yield (arg, None)
+
+    def chunks(
+        self, args: Sequence[str], errors: List[Err]
+    ) -> Iterator[Tuple[List[str], List[Origin]]]:
+        """
+        Yields command-line arguments by chunks, replacing response files by their contents
+
+        Args:
+            args: Command-line arguments
+            errors: Mutable list where errors are appended
+
+        Returns:
+            An iterator over chunks of arguments with their location
+        """
+        it = self.args(args, errors)
+        while True:
+            chunk = list(itertools.islice(it, self.chunk_size))
+            if not chunk:
+                return
+            yield ([arg for arg, _ in chunk], [origin for _, origin in chunk])
@@ -0,0 +1,192 @@
+"""
+Schema snapshots
+
+Building a :class:`~configpile.processor.Processor` requires extracting the documentation of
+the configuration fields from the source code of the configuration class, which is slow.
+
+This module stores the resolved schema of a configuration (parameter names, flags,
+environment variable names, configuration keys, positional layout, help text and default values)
+in a JSON file. The file is keyed on the source of the modules defining the configuration class
+and its bases, and on the configpile version. Later processes read the help text from the
+snapshot instead of parsing the class source.
+
+Snapshots are enabled by setting :attr:`~configpile.config.Config.schema_cache_dir_`. Missing,
+stale or corrupt snapshots are silently rebuilt.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import sys
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, Mapping, Optional, Sequence, Tuple, Type
+
+from .arg import Arg, Expander, Param
+
+if TYPE_CHECKING:
+    from .config import Config
+
+
+def _describe(arg: Arg) -> Mapping[str, Any]:
+    """
+    Returns a JSON-compatible description of an argument
+
+    Args:
+        arg: Argument, updated from its declaration context
+
+    Returns:
+        A description of the argument
+    """
+    res: Dict[str, Any] = {"help": arg.help, "flags": list(arg.all_flags())}
+    if isinstance(arg, Param):
+        res["env_var_names"] = list(arg.all_env_var_names())
+        res["config_key_names"] = list(arg.all_config_key_names())
+        res["positional"] = None if arg.positional is None else arg.positional.name
+        res["default_value"] = arg.default_value
+    if isinstance(arg, Expander):
+        res["inserts"] = list(arg.inserts())
+    return res
+
+
+@dataclass(frozen=True)
+class SchemaSnapshot:
+    """
+    Resolved schema of a configuration
+    """
+
+    version: str  #: Version of configpile that wrote the snapshot
+    source_hash: str  #: Hash of the source of the modules defining the configuration
+    fields: Mapping[str, Mapping[str, Any]]  #: Description of the arguments by field name
+
+    def help(self, name: str) -> str:
+        """
+        Returns the help text of a field
+
+        Args:
+            name: Field name
+
+        Returns:
+            Help text, or an empty string if unknown
+        """
+        field = self.fields.get(name)
+        if field is None or field.get("help") is None:
+            return ""
+        return str(field["help"])
+
+    @staticmethod
+    def source_hash_of(config_type: Type[Config]) -> Optional[str]:
+        """
+        Computes the hash of the source files of the modules defining a configuration class
+
+        Args:
+            config_type: Configuration class
+
+        Returns:
+            The hash, or None if a source file cannot be read
+        """
+        from . import __version__  # pylint: disable=import-outside-toplevel
+
+        h = hashlib.sha256(__version__.encode("utf-8"))
+        seen = set()
+        for c in config_type.mro():
+            module = sys.modules.get(c.__module__)
+            file_name = getattr(module, "__file__", None)
+            if file_name is None or file_name in seen:
+                continue
+            seen.add(file_name)
+            try:
+                h.update(Path(file_name).read_bytes())
+            except OSError:
+                return None
+        return h.hexdigest()
+
+    @staticmethod
+    def path_for(config_type: Type[Config]) -> Optional[Path]:
+        """
+        Returns the path of the snapshot file of a configuration
+
+        Args:
+            config_type: Configuration class
+
+        Returns:
+            The snapshot path, or None if snapshots are disabled for this configuration
+        """
+        cache_dir = config_type.schema_cache_dir_
+        if cache_dir is None:
+            return None
+        return Path(cache_dir) / f"{config_type.__module__}.{config_type.__qualname__}.json"
+
+    @staticmethod
+    def make(config_type: Type[Config], fields: Sequence[Tuple[str, Arg]]) -> SchemaSnapshot:
+        """
+        Creates the snapshot of a configuration
+
+        Args:
+            config_type: Configuration class
+            fields: Arguments by field name, updated with their help text
+
+        Returns:
+            The snapshot
+        """
+        from . import __version__  # pylint: disable=import-outside-toplevel
+
+        source_hash = SchemaSnapshot.source_hash_of(config_type)
+        return SchemaSnapshot(
+            version=__version__,
+            source_hash="" if source_hash is None else source_hash,
+            fields={name: _describe(arg) for name, arg in fields},
+        )
+
+    @staticmethod
+    def load(path: Path, config_type: Type[Config]) -> Optional[SchemaSnapshot]:
+        """
+        Loads a snapshot if it is present and up-to-date
+
+        Args:
+            path: Path of the snapshot file
+            config_type: Configuration class the snapshot describes
+
+        Returns:
+            The snapshot, or None if it is missing, stale or corrupt
+        """
+        from . import __version__  # pylint: disable=import-outside-toplevel
+
+        try:
+            with open(path, "r", encoding="utf-8") as file:
+                data = json.load(file)
+            snapshot = SchemaSnapshot(data["version"], data["source_hash"], data["fields"])
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+        if snapshot.version != __version__:
+            return None
+        source_hash = SchemaSnapshot.source_hash_of(config_type)
+        if source_hash is None or snapshot.source_hash != source_hash:
+            return None
+        return snapshot
+
+    def save(self, path: Path) -> None:
+        """
+        Writes the snapshot to disk
+
+        The file is replaced atomically; failures are logged and otherwise ignored.
+
+        Args:
+            path: Path of the snapshot file
+        """
+        data = {"version": self.version, "source_hash": self.source_hash, "fields": self.fields}
+        tmp: Optional[str] = None
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as file:
+                json.dump(data, file)
+            os.replace(tmp, path)
+        except (OSError, TypeError, ValueError) as e:
+            logging.info("Could not write schema snapshot %s: %s", path, e)
+            if tmp is not None and os.path.exists(tmp):
+                os.remove(tmp)
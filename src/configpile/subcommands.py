@@ -0,0 +1,240 @@
+"""
+Subcommands
+
+This module dispatches a command line between subcommands, each subcommand being described by
+its own :class:`~configpile.config.Config` subclass.
+
+Subcommands are registered by the path of the configuration class, in the form
+``package.module:ClassName``. The module of a subcommand is only imported when the subcommand
+is selected on the command line, and only its processor is built. The top-level help is
+formatted from the summaries given at registration, without importing any subcommand, so
+that the startup time does not depend on the number of subcommands.
+
+Example:
+    .. code-block:: python
+
+        cli = Subcommands.make(
+            Subcommand.make("sum", "mytool.sum:SumConfig", "Sums values"),
+            Subcommand.make("mul", "mytool.mul:MulConfig", "Multiplies values"),
+            prog="mytool",
+        )
+        name, config = cli.from_command_line()
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+from dataclasses import dataclass, replace
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Mapping, Optional, Sequence, Tuple, Type, Union
+
+from .enums import SpecialAction
+from .userr import Err, Res
+
+if TYPE_CHECKING:
+    from .config import Config
+
+
+@dataclass(frozen=True)
+class Subcommand:
+    """
+    Describes a subcommand, without importing its configuration class
+    """
+
+    name: str  #: Name of the subcommand on the command line
+    target: str  #: Path to the configuration class, as ``package.module:ClassName``
+    summary: str  #: One-line description displayed in the top-level help
+
+    def load(self) -> Type[Config]:
+        """
+        Imports the configuration class of this subcommand
+
+        Raises:
+            ImportError: If the module cannot be imported
+            TypeError: If the target is not a subclass of :class:`~configpile.config.Config`
+
+        Returns:
+            The configuration class
+        """
+        import importlib  # pylint: disable=import-outside-toplevel
+
+        from .config import Config  # pylint: disable=import-outside-toplevel
+
+        module_name, _, qualname = self.target.partition(":")
+        obj: Any = importlib.import_module(module_name)
+        for attr in qualname.split("."):
+            obj = getattr(obj, attr)
+        if not isinstance(obj, type) or not issubclass(obj, Config):
+            raise TypeError(f"Subcommand {self.name} target {self.target} is not a Config")
+        return obj
+
+    @staticmethod
+    def make(name: str, target: str, summary: str = "") -> Subcommand:
+        """
+        Creates a subcommand
+
+        Args:
+            name: Name of the subcommand on the command line
+            target: Path to the configuration class, as ``package.module:ClassName``
+            summary: One-line description displayed in the top-level help
+
+        Raises:
+            ValueError: If the target is not given as ``package.module:ClassName``
+
+        Returns:
+            The subcommand
+        """
+        if ":" not in target:
+            raise ValueError("The target must be given as package.module:ClassName")
+        return Subcommand(name, target, summary)
+
+
+@dataclass(frozen=True)
+class Subcommands:
+    """
+    Command-line interface dispatching to subcommands
+    """
+
+    commands: Mapping[str, Subcommand]  #: Subcommands by name, in registration order
+    prog: Optional[str]  #: Program name, taken from the script invocation if None
+    description: Optional[str]  #: Text displayed before the list of subcommands
+
+    @staticmethod
+    def make(
+        *commands: Subcommand, prog: Optional[str] = None, description: Optional[str] = None
+    ) -> Subcommands:
+        """
+        Creates a subcommand dispatcher
+
+        Args:
+            commands: Subcommands
+
+        Keyword Args:
+            prog: Program name, taken from the script invocation if omitted
+            description: Text displayed before the list of subcommands
+
+        Raises:
+            ValueError: If several subcommands have the same name
+
+        Returns:
+            The dispatcher
+        """
+        if len({c.name for c in commands}) != len(commands):
+            raise ValueError("Duplicate subcommand names")
+        return Subcommands({c.name: c for c in commands}, prog, description)
+
+    def with_summaries(self) -> Subcommands:
+        """
+        Returns a dispatcher whose missing summaries are taken from the configuration classes
+
+        This imports every subcommand, and is meant to be used when generating the
+        registration code or documentation, not at runtime.
+        """
+        commands = {}
+        for name, command in self.commands.items():
+            summary = command.summary
+            if not summary:
+                doc = command.load().__doc__ or ""
+                summary = next((line.strip() for line in doc.splitlines() if line.strip()), "")
+            commands[name] = replace(command, summary=summary)
+        return replace(self, commands=commands)
+
+    def format_help(self) -> str:
+        """
+        Returns the top-level help, listing the subcommands with their summary
+        """
+        prog = self.prog if self.prog is not None else os.path.basename(sys.argv[0])
+        lines = [f"usage: {prog} [-h] <command> [<args>]", ""]
+        if self.description:
+            lines.extend([self.description, ""])
+        lines.append("commands:")
+        width = max([len(name) for name in self.commands], default=0)
+        for name, command in self.commands.items():
+            lines.append(f"  {name:<{width}}  {command.summary}".rstrip())
+        lines.append("")
+        lines.append(f"Use {prog} <command> -h to display the help of a command.")
+        return "\n".join(lines)
+
+    def select(self, args: Sequence[str]) -> Res[Union[Subcommand, SpecialAction]]:
+        """
+        Selects the subcommand from the first command-line argument
+
+        Args:
+            args: Command line arguments
+
+        Returns:
+            The selected subcommand, a request for the top-level help, or an error
+        """
+        if not args:
+            return Err.make("A subcommand is required")
+        if args[0] in ["-h", "--help"]:
+            return SpecialAction.HELP
+        command = self.commands.get(args[0])
+        if command is None:
+            choices = ", ".join(self.commands)
+            return Err.make(f"Unknown subcommand {args[0]}, choose among: {choices}")
+        return command
+
+    def parse_command_line(
+        self,
+        cwd: Optional[Path] = None,
+        args: Optional[Sequence[str]] = None,
+        env: Optional[Mapping[str, str]] = None,
+    ) -> Res[Tuple[str, Union[Config, SpecialAction]]]:
+        """
+        Parses the command line of the selected subcommand
+
+        Only the module of the selected subcommand is imported.
+
+        Args:
+            cwd: Directory used as a base for the configuration file relative paths
+            args: Command line arguments, starting with the subcommand name
+            env: Environment variables
+
+        Returns:
+            The name of the subcommand with its parsed configuration or special action, or an
+            error. A request for the top-level help is returned with an empty name.
+        """
+        if args is None:
+            args = sys.argv[1:]
+        selected = self.select(args)
+        if isinstance(selected, Err):
+            return selected
+        if isinstance(selected, SpecialAction):
+            return ("", selected)
+        res = selected.load().parse_command_line_(cwd, args[1:], env)
+        if isinstance(res, Err):
+            return res.in_context(subcommand=selected.name)
+        return (selected.name, res)
+
+    def from_command_line(
+        self,
+        cwd: Optional[Path] = None,
+        args: Optional[Sequence[str]] = None,
+        env: Optional[Mapping[str, str]] = None,
+    ) -> Tuple[str, Config]:
+        """
+        Parses the command line of the selected subcommand and display help on error
+
+        Args:
+            cwd: Directory used as a base for the configuration file relative paths
+            args: Command line arguments, starting with the subcommand name
+            env: Environment variables
+
+        Returns:
+            The name of the subcommand and its parsed configuration
+        """
+        if args is None:
+            args = sys.argv[1:]
+        selected = self.select(args)
+        if isinstance(selected, Err):
+            print("Encountered errors:")
+            selected.pretty_print()
+            print(" ")
+            print(self.format_help())
+            sys.exit(1)
+        if isinstance(selected, SpecialAction):
+            print(self.format_help())
+            sys.exit(0)
+        return (selected.name, selected.load().from_command_line_(cwd, args[1:], env))
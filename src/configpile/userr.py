@@ -51,7 +51,6 @@ Errors have an associated context, see the description for :class:`.Err1`.
 
 from __future__ import annotations
 
-import shutil
 import textwrap
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
@@ -118,6 +117,8 @@ class Err(ABC):
             md = Markdown("\n".join(self.markdown()))
             console.print(md)
         except ImportError:
+            import shutil  # pylint: disable=import-outside-toplevel
+
             sz = shutil.get_terminal_size()
             t = self.markdown()
             print(textwrap.fill("\n".join(t), width=sz.columns))
@@ -11,17 +11,26 @@ Module defining utility functions
 
 .. py:data:: _Type
 """
+
 from __future__ import annotations
 
-import logging
 import textwrap
 from collections import OrderedDict
 from dataclasses import dataclass
-from typing import Any, Callable, Dict, Generic, List, Mapping, NoReturn, Optional
+from typing import (
+    Any,
+    Callable,
+    Collection,
+    Dict,
+    Generic,
+    Iterator,
+    List,
+    Mapping,
+    NoReturn,
+    Optional,
+)
 from typing import OrderedDict as OrderedDictT
-from typing import Sequence, Tuple, Type, TypeVar
-
-from class_doc import extract_docs_from_cls_obj
+from typing import Sequence, Tuple, Type, TypeVar, Union, overload
 
 _Key = TypeVar("_Key")
 _Value = TypeVar("_Value")
@@ -72,18 +81,32 @@ class ClassDoc(Generic[_Class]):
         return textwrap.dedent("\n".join(res)).split("\n")
 
     @staticmethod
-    def make(t: Type[_Class]) -> ClassDoc[_Class]:
+    def make(
+        t: Type[_Class], attribute_names: Optional[Collection[str]] = None
+    ) -> ClassDoc[_Class]:
         """
         Retrieves the documentation for the attributes of a class
 
         Args:
             t: Class type to investigate
+            attribute_names: If provided, the classes in the Method Resolution Order that
+                             do not declare any of those attributes are skipped
 
         Returns:
             A ClassDoc instance
         """
+        import logging  # pylint: disable=import-outside-toplevel
+
+        from class_doc import (  # pylint: disable=import-outside-toplevel
+            extract_docs_from_cls_obj,
+        )
+
         docs: List[Mapping[str, Sequence[str]]] = []
         for c in t.mro():
+            if attribute_names is not None:
+                annotations = c.__dict__.get("__annotations__", {})
+                if not any(n in annotations or n in c.__dict__ for n in attribute_names):
+                    continue
             try:
                 docs.append(extract_docs_from_cls_obj(c))
             except Exception as e:  # pylint: disable=broad-except
@@ -92,6 +115,57 @@ class ClassDoc(Generic[_Class]):
         return ClassDoc(docs)
 
 
+@dataclass(frozen=True)
+class SequenceView(Sequence[_Value]):
+    """
+    Read-only view over a range of a sequence, which does not copy the elements
+
+    The viewed sequence must not be modified while the view is in use. A view compares equal
+    to any sequence with the same elements.
+    """
+
+    seq: Sequence[_Value]  #: Viewed sequence
+    start: int  #: Index of the first element
+    stop: int  #: Index following the last element
+
+    def __len__(self) -> int:
+        return self.stop - self.start
+
+    @overload
+    def __getitem__(self, index: int) -> _Value:
+        pass
+
+    @overload
+    def __getitem__(self, index: slice) -> Sequence[_Value]:
+        pass
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[_Value, Sequence[_Value]]:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("SequenceView index out of range")
+        return self.seq[self.start + index]
+
+    def __iter__(self) -> Iterator[_Value]:
+        return (self.seq[i] for i in range(self.start, self.stop))
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Sequence) or isinstance(other, str):
+            return NotImplemented
+        return len(self) == len(other) and all([a == b for a, b in zip(self, other)])
+
+    def __ne__(self, other: object) -> bool:
+        res = self.__eq__(other)
+        return res if res is NotImplemented else not res
+
+    __hash__ = None  # type: ignore
+
+    def __repr__(self) -> str:
+        return repr(list(self))
+
+
 def dict_from_multiple_keys(pairs: Sequence[Tuple[Sequence[_Key], _Value]]) -> Dict[_Key, _Value]:
     """
     Constructs a dict from a list of items where a value can have multiple keys
@@ -0,0 +1,53 @@
+# pylint: disable=missing-class-docstring,missing-function-docstring,missing-module-docstring
+from __future__ import annotations
+
+import types
+from dataclasses import dataclass
+from pathlib import Path
+from typing import ClassVar, Optional, Sequence
+
+from typing_extensions import Annotated
+
+from configpile import Config, Err, Expander, Param, Positional, parsers
+from configpile.codegen import check_equivalence, generate_source, is_up_to_date
+
+
+@dataclass(frozen=True)
+class Compiled(Config):
+    config: Annotated[Sequence[Path], Param.config()]
+    a: Annotated[int, Param.store(parsers.int_parser, default_value="2", env_var_name="A")]
+    flag: Annotated[bool, Param.store(parsers.bool_parser, default_value="false")]
+    name: Annotated[str, Param.store(parsers.stripped_str_parser.validated(bool, "Empty"))]
+    values: Annotated[
+        Sequence[float],
+        Param.append1(parsers.float_parser, positional=Positional.ZERO_OR_MORE),
+    ]
+    set_flag: ClassVar[Expander] = Expander.make("--flag", "true")
+
+    def validate_a(self) -> Optional[Err]:
+        return Err.check(self.a < 100, "a is too large")
+
+
+def compile_module() -> types.ModuleType:
+    module = types.ModuleType("compiled")
+    exec(compile(generate_source(Compiled), "compiled", "exec"), module.__dict__)
+    return module
+
+
+def test_generated_module_matches_processor() -> None:
+    module = compile_module()
+    assert module.config_type is Compiled
+    assert is_up_to_date(module)
+    cases = [
+        (["--name", "x"], {}),
+        (["--name", "x", "1", "2.5", "--a", "3", "4"], {"A": "5"}),
+        (["--name", "x", "--set-flag"], {"A": "7"}),
+        (["--name", " ", "--a", "200"], {}),
+        (["--name", "x", "--a", "200"], {}),
+        (["--name", "x", "-1"], {}),
+        (["--a", "invalid", "--unknown"], {"A": "invalid"}),
+        (["--name"], {}),
+        (["-h", "--name", "x"], {}),
+        (["--config", "missing.ini", "--name", "x"], {}),
+    ]
+    assert check_equivalence(Compiled, module.process_command_line, cases) == []
@@ -0,0 +1,98 @@
+# pylint: disable=missing-class-docstring,missing-function-docstring,missing-module-docstring
+from __future__ import annotations
+
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Sequence, Set
+
+import pytest
+from typing_extensions import Annotated
+
+from configpile import Config, Err, Param, parsers
+from configpile.ini import IniContents, ini_cache
+
+
+@dataclass(frozen=True)
+class Fragments(Config):
+    config: Annotated[Sequence[Path], Param.config(config_key_name="include")]
+    a: Annotated[int, Param.store(parsers.int_parser, default_value="0")]
+    seen: Annotated[Sequence[str], Param.append1(parsers.stripped_str_parser)]
+
+
+def make_conf_d(directory: Path, n: int) -> None:
+    directory.mkdir()
+    for i in reversed(range(n)):
+        (directory / f"{i:02d}-fragment.ini").write_text(f"[common]\na = {i}\nseen = {i}\n")
+    (directory / "README").write_text("not a fragment\n")
+
+
+def test_directory_fragments_are_applied_in_order(tmp_path: Path) -> None:
+    make_conf_d(tmp_path / "app.d", 50)
+    res = Fragments.parse_command_line_(args=["--config", str(tmp_path / "app.d")], env={})
+    assert isinstance(res, Fragments)
+    assert res.a == 49
+    assert res.seen == [str(i) for i in range(50)]
+
+
+def test_glob_and_include(tmp_path: Path) -> None:
+    make_conf_d(tmp_path / "app.d", 12)
+    (tmp_path / "main.ini").write_text("[common]\ninclude = app.d/0*.ini\nseen = main\n")
+    res = Fragments.parse_command_line_(args=["--config", str(tmp_path / "main.ini")], env={})
+    assert isinstance(res, Fragments)
+    assert res.seen == [str(i) for i in range(10)] + ["main"]
+
+
+def test_fragments_are_read_concurrently(tmp_path: Path, monkeypatch: Any) -> None:
+    make_conf_d(tmp_path / "slow.d", 8)
+    threads: Set[int] = set()
+    # the first two fragments wait for each other, which fails unless they are read concurrently
+    barrier = threading.Barrier(2, timeout=10)
+    read = IniContents.read
+
+    def concurrent_read(path: Path, scanner: Any = None, cache_dir: Any = None) -> Any:
+        threads.add(threading.get_ident())
+        if path.name in ("00-fragment.ini", "01-fragment.ini"):
+            barrier.wait()
+        return read(path, scanner, cache_dir)
+
+    monkeypatch.setattr(IniContents, "read", staticmethod(concurrent_read))
+    ini_cache.invalidate()
+    res = Fragments.parse_command_line_(args=["--config", str(tmp_path / "slow.d")], env={})
+    assert isinstance(res, Fragments) and res.a == 7
+    assert not barrier.broken
+    assert len(threads) > 1
+
+
+@pytest.mark.parametrize("n", [0, 1])
+def test_small_directories(tmp_path: Path, n: int) -> None:
+    make_conf_d(tmp_path / "app.d", n)
+    res = Fragments.parse_command_line_(args=["--config", str(tmp_path / "app.d")], env={})
+    assert isinstance(res, Fragments) and len(res.seen) == n
+
+
+def test_literal_path_with_pattern_characters(tmp_path: Path) -> None:
+    (tmp_path / "run[1].ini").write_text("[common]\na = 5\n")
+    res = Fragments.parse_command_line_(args=["--config", str(tmp_path / "run[1].ini")], env={})
+    assert isinstance(res, Fragments) and res.a == 5
+
+
+def test_pattern_matching_nothing(tmp_path: Path) -> None:
+    res = Fragments.parse_command_line_(args=["--config", str(tmp_path / "*.ini")], env={})
+    assert isinstance(res, Err)
+
+
+def test_directory_larger_than_cache(tmp_path: Path, monkeypatch: Any) -> None:
+    make_conf_d(tmp_path / "large.d", 200)
+    args = ["--config", str(tmp_path / "large.d")]
+    ini_cache.invalidate()
+    assert Fragments.parse_command_line_(args=args, env={}) == Fragments.parse_command_line_(
+        args=args, env={}
+    )
+
+    def no_read(path: Path, scanner: Any = None, cache_dir: Any = None) -> Any:
+        raise AssertionError("Cached fragments should not be read again")
+
+    monkeypatch.setattr(IniContents, "read", staticmethod(no_read))
+    res = Fragments.parse_command_line_(args=args, env={})
+    assert isinstance(res, Fragments) and len(res.seen) == 200
@@ -0,0 +1,37 @@
+# pylint: disable=missing-class-docstring,missing-function-docstring,missing-module-docstring
+from __future__ import annotations
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Sequence
+
+from typing_extensions import Annotated
+
+from configpile import Config, Param, parsers
+
+
+@dataclass(frozen=True)
+class FromEnv(Config):
+    config: Annotated[Sequence[Path], Param.config(env_var_name="APP_CONFIG")]
+    a: Annotated[int, Param.store(parsers.int_parser, default_value="0", env_var_name="APP_A")]
+    b: Annotated[int, Param.store(parsers.int_parser, default_value="0", env_var_name="APP_B")]
+    root: Annotated[Path, Param.root_path(env_var_name="APP_ROOT")]
+
+
+def test_variables_take_precedence_over_config_files(tmp_path: Path) -> None:
+    (tmp_path / "app.ini").write_text("[common]\na = 1\nb = 2\n")
+    unrelated = {f"UNRELATED_{i}": str(i) for i in range(500)}
+    for env in [
+        {"APP_A": "3", "APP_CONFIG": "app.ini", "APP_ROOT": str(tmp_path), **unrelated},
+        {**unrelated, "APP_ROOT": str(tmp_path), "APP_CONFIG": "app.ini", "APP_A": "3"},
+    ]:
+        res = FromEnv.parse_command_line_(args=[], env=env)
+        assert isinstance(res, FromEnv)
+        assert (res.a, res.b) == (3, 2)
+
+
+def test_command_line_takes_precedence(tmp_path: Path) -> None:
+    (tmp_path / "app.ini").write_text("[common]\na = 1\n")
+    env = {"APP_CONFIG": "app.ini", "APP_A": "3", "APP_ROOT": str(tmp_path)}
+    res = FromEnv.parse_command_line_(args=["--a", "4"], env=env)
+    assert isinstance(res, FromEnv) and res.a == 4
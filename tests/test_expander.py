@@ -2,11 +2,14 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import ClassVar
+from typing import ClassVar, Sequence
 
+import pytest
 from typing_extensions import Annotated
 
-from configpile import Config, Expander, Param, parsers
+from configpile import Config, Expander, Param, Positional, parsers
+from configpile.handlers import CLExpansion
+from configpile.processor import Processor
 
 
 @dataclass(frozen=True)
@@ -19,3 +22,40 @@ def test_expander() -> None:
     res = A.from_command_line_(args=["--set-a-to-zero"], env={})
     assert isinstance(res, A)
     assert res.a == 0
+
+
+@dataclass(frozen=True)
+class Chained(Config):
+    a: Annotated[int, Param.store(parsers.int_parser, default_value="2")]
+    values: Annotated[
+        Sequence[int],
+        Param.append1(parsers.int_parser, positional=Positional.ZERO_OR_MORE, long_flag_name=None),
+    ]
+    set_a_to_zero: ClassVar[Expander] = Expander.make("--a", "0")
+    alias: ClassVar[Expander] = Expander.make("--set-a-to-zero", "7")
+
+
+def test_chain_is_resolved_when_building() -> None:
+    handler = Chained.processor_().cl_handler.flags["--alias"]
+    assert isinstance(handler, CLExpansion) and handler.closed
+    assert handler.inserted_args == ["--a", "0", "7"]
+    res = Chained.parse_command_line_(args=["1", "--alias", "2"], env={})
+    assert res == Chained(a=0, values=[1, 7, 2])
+
+
+def test_closed_expansion_keeps_arguments() -> None:
+    processor = Chained.processor_()
+    state = processor._state_with_default_values(None)  # pylint: disable=protected-access
+    args = ["--alias", "3"]
+    buffer, pos, err = processor.cl_handler.handle_at(args, 0, state)
+    assert buffer is args and pos == 1 and err is None
+
+
+def test_cycle_is_detected() -> None:
+    @dataclass(frozen=True)
+    class Cycle(Config):
+        first: ClassVar[Expander] = Expander.make("--second", "1")
+        second: ClassVar[Expander] = Expander.make("--first", "2")
+
+    with pytest.raises(ValueError, match="cycle"):
+        Processor.make(Cycle)
@@ -0,0 +1,52 @@
+# pylint: disable=missing-class-docstring,missing-function-docstring,missing-module-docstring
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import ClassVar
+
+from typing_extensions import Annotated
+
+from configpile import Config, Err, Expander, Param, parsers
+
+
+@dataclass(frozen=True)
+class Flags(Config):
+    verbose: Annotated[
+        int, Param.store(parsers.int_parser, short_flag_name="-v", default_value="0")
+    ]
+    version: Annotated[int, Param.store(parsers.int_parser, default_value="0")]
+    output: Annotated[str, Param.store(parsers.stripped_str_parser, short_flag_name="-o")]
+    quiet: ClassVar[Expander] = Expander.make("--verbose", "-1", short_flag_name="-q")
+    fast: ClassVar[Expander] = Expander.make("--version", "2", short_flag_name="-f")
+
+
+@dataclass(frozen=True)
+class Abbreviated(Flags):
+    allow_abbrev_ = True
+    allow_short_flag_clusters_ = True
+
+
+def test_inline_values() -> None:
+    res = Flags.parse_command_line_(args=["--output=a=b", "--verbose=2"], env={})
+    assert res == Flags(verbose=2, version=0, output="a=b")
+    assert isinstance(Flags.parse_command_line_(args=["--output=x", "--quiet=1"], env={}), Err)
+
+
+def test_abbreviations_are_opt_in() -> None:
+    assert isinstance(Flags.parse_command_line_(args=["--out", "x"], env={}), Err)
+    res = Abbreviated.parse_command_line_(args=["--out", "x", "--verb=3"], env={})
+    assert res == Abbreviated(verbose=3, version=0, output="x")
+
+
+def test_ambiguous_prefix() -> None:
+    res = Abbreviated.parse_command_line_(args=["--out", "x", "--ver", "1"], env={})
+    assert isinstance(res, Err)
+    assert "--verbose, --version" in str(res.markdown())
+
+
+def test_short_flag_clusters() -> None:
+    res = Abbreviated.parse_command_line_(args=["-qfox"], env={})
+    assert res == Abbreviated(verbose=-1, version=2, output="x")
+    res = Abbreviated.parse_command_line_(args=["-fo", "y"], env={})
+    assert res == Abbreviated(verbose=0, version=2, output="y")
+    assert isinstance(Abbreviated.parse_command_line_(args=["-o", "x", "-fz"], env={}), Err)
@@ -0,0 +1,77 @@
+# pylint: disable=missing-class-docstring,missing-function-docstring,missing-module-docstring
+from __future__ import annotations
+
+from dataclasses import dataclass, replace
+from pathlib import Path
+from typing import List, Optional, Sequence, Tuple
+
+import pytest
+from typing_extensions import Annotated
+
+from configpile import Config, Err, Param, parsers
+from configpile.handlers import CLHandler
+from configpile.processor import State
+
+
+@dataclass(frozen=True)
+class Tagged(Config):
+    tag: Annotated[Sequence[str], Param.append1(parsers.stripped_str_parser)]
+
+
+class Twice(CLHandler):
+    """
+    Legacy handler, implementing only handle, that records its argument twice
+    """
+
+    def handle(self, args: Sequence[str], state: State) -> Tuple[Sequence[str], Optional[Err]]:
+        state.append("tag", [args[0]])
+        state.append("tag", [args[0]])
+        return (args[1:], None)
+
+
+def test_legacy_handler_through_adapter() -> None:
+    processor = Tagged.processor_()
+    flags = {**processor.cl_handler.flags, "--twice": Twice()}
+    processor = replace(processor, cl_handler=replace(processor.cl_handler, flags=flags))
+    res = processor.process_command_line(Path.cwd(), ["--tag", "a", "--twice", "b"], {})
+    assert res == Tagged(tag=["a", "b", "b"])
+
+
+def test_handle_at_advances_position() -> None:
+    processor = Tagged.processor_()
+    state = processor._state_with_default_values(None)  # pylint: disable=protected-access
+    args = ["--tag", "a", "--tag", "b"]
+    buffer, pos, err = processor.cl_handler.handle_at(args, 2, state)
+    assert buffer is args and pos == 4 and err is None
+    assert state.instances["tag"] == [["b"]]
+
+
+def test_long_command_line() -> None:
+    args = [a for i in range(50000) for a in ["--tag", str(i)]]
+    res = Tagged.parse_command_line_(args=args, env={})
+    assert isinstance(res, Tagged) and len(res.tag) == 50000
+
+
+@dataclass(frozen=True)
+class Separated(Config):
+    vals: Annotated[
+        List[int], Param.store(parsers.int_parser.separated_by(","), default_value="1,2")
+    ]
+
+
+def test_defaults_are_not_shared() -> None:
+    a = Separated.parse_command_line_(args=[], env={})
+    assert isinstance(a, Separated)
+    a.vals.append(99)
+    b = Separated.parse_command_line_(args=[], env={})
+    assert b == Separated(vals=[1, 2]) and b.vals is not a.vals
+
+
+def test_instances_write_through() -> None:
+    processor = Tagged.processor_()
+    state = processor._state_with_default_values(None)  # pylint: disable=protected-access
+    state.instances["tag"].append(["a"])
+    state.instances["tag"] = [*state.instances["tag"], ["b"]]
+    assert state.instances_at(processor.params_by_name["tag"].index or 0) == [["a"], ["b"]]
+    with pytest.raises(TypeError):
+        del state.instances["tag"]
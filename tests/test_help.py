@@ -0,0 +1,44 @@
+# pylint: disable=missing-class-docstring,missing-function-docstring,missing-module-docstring
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+import pytest
+from typing_extensions import Annotated
+
+from configpile import Config, Param, parsers
+from configpile.util import ClassDoc
+
+
+@dataclass(frozen=True)
+class Base(Config):
+    a: Annotated[int, Param.store(parsers.int_parser)]  #: Help for a
+
+
+@dataclass(frozen=True)
+class Documented(Base):
+    b: Annotated[int, Param.store(parsers.int_parser, help="Explicit help for b")]
+
+
+def test_parsing_does_not_extract_docs(monkeypatch: pytest.MonkeyPatch) -> None:
+    def fail(t: type, attribute_names: object = None) -> ClassDoc[object]:
+        raise AssertionError("Source should not be parsed")
+
+    monkeypatch.setattr(ClassDoc, "make", fail)
+    Documented.invalidate_processor_()
+    res = Documented.from_command_line_(args=["--a", "1", "--b", "2"], env={})
+    assert res.a == 1 and res.b == 2
+
+
+def test_help_is_extracted_on_demand() -> None:
+    Documented.invalidate_processor_()
+    processor = Documented.processor_()
+    assert processor.args["a"].help is None
+    assert processor.documented_args["a"].help == "Help for a"
+    assert processor.documented_args["b"].help == "Explicit help for b"
+    assert "Help for a" in processor.argument_parser.format_help()
+
+
+def test_classes_without_params_are_skipped() -> None:
+    docs = ClassDoc.make(Documented, ["a", "b"])
+    assert len(docs.docs) == 2
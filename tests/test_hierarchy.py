@@ -0,0 +1,69 @@
+# pylint: disable=missing-class-docstring,missing-function-docstring,missing-module-docstring
+from __future__ import annotations
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Sequence
+
+from typing_extensions import Annotated
+
+from configpile import Config, Expander, Param, Positional, parsers
+from configpile.processor import Processor
+
+
+@dataclass(frozen=True)
+class Shared(Config):
+    a: Annotated[int, Param.store(parsers.int_parser, default_value="1")]  #: Help for a
+    values: Annotated[
+        Sequence[int],
+        Param.append1(parsers.int_parser, positional=Positional.ZERO_OR_MORE, long_flag_name=None),
+    ]
+
+
+@dataclass(frozen=True)
+class Extended(Shared):
+    b: Annotated[int, Param.store(parsers.int_parser, default_value="2")]  #: Help for b
+    set_b = Expander.make("--b", "5")
+
+
+@dataclass(frozen=True)
+class Overriding(Shared):
+    a: Annotated[int, Param.store(parsers.int_parser, default_value="3")]  #: Help for a
+
+
+@dataclass(frozen=True)
+class Prefixed(Shared):
+    env_prefix_ = "PREFIXED"
+
+
+def test_subclass_extends_parent_processor() -> None:
+    Shared.invalidate_processor_()
+    parent = Shared.processor_()
+    child = Extended.processor_()
+    assert child.base is parent
+    assert child.cl_handler.flags["--a"] is parent.cl_handler.flags["--a"]
+    assert [*child.args] == [*Processor.make(Extended).args]
+
+
+def test_extended_processor_parses_like_full_build() -> None:
+    full = Processor.make(Extended)
+    incremental = Extended.processor_()
+    for args in [["--a", "3", "4", "5"], ["--set-b"], ["--b", "x"], ["--c"]]:
+        cwd = Path.cwd()
+        assert incremental.process_command_line(cwd, args, {}) == full.process_command_line(
+            cwd, args, {}
+        )
+
+
+def test_extended_processor_reuses_help() -> None:
+    Shared.invalidate_processor_()
+    child = Extended.processor_()
+    assert child.documented_args["a"].help == "Help for a"
+    assert child.documented_args["b"].help == "Help for b"
+    assert child.base is not None and "documented_args" in child.base.__dict__
+
+
+def test_redefined_fields_and_prefixes_are_built_from_scratch() -> None:
+    assert Overriding.processor_().base is None
+    assert Overriding.parse_command_line_(args=[], env={}) == Overriding(a=3, values=[])
+    assert Prefixed.processor_().base is None
@@ -0,0 +1,100 @@
+# pylint: disable=missing-class-docstring,missing-function-docstring,missing-module-docstring
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+from typing import Set
+
+import configpile
+
+#: Modules only needed to display help, read INI files or pretty-print errors
+ON_DEMAND_MODULES = {"argparse", "configparser", "class_doc", "rich"}
+
+PARSE_SCRIPT = """
+from dataclasses import dataclass
+from typing_extensions import Annotated
+from configpile import Config, Param, parsers
+
+@dataclass(frozen=True)
+class C(Config):
+    a: Annotated[int, Param.store(parsers.int_parser)]
+
+assert C.from_command_line_(args=["--a", "1"], env={}).a == 1
+"""
+
+
+def imported_modules(code: str) -> Set[str]:
+    """
+    Returns the top-level modules imported when running some code in a fresh interpreter
+    """
+    src = str(Path(configpile.__file__).parent.parent)
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join([src, os.environ.get("PYTHONPATH", "")])}
+    res = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    modules: Set[str] = set()
+    for line in res.stderr.splitlines():
+        if line.startswith("import time:") and "|" in line:
+            name = line.split("|")[-1].strip()
+            modules.add(name)
+    return modules
+
+
+def test_import_is_cheap() -> None:
+    modules = imported_modules("import configpile")
+    assert "configpile.config" not in modules
+    assert not modules & ON_DEMAND_MODULES
+
+
+def test_parsing_imports_no_help_machinery() -> None:
+    modules = imported_modules(PARSE_SCRIPT)
+    assert "configpile.config" in modules
+    assert not {m.split(".")[0] for m in modules} & ON_DEMAND_MODULES
+
+
+CONFIG_MODULE = """
+from dataclasses import dataclass
+from typing_extensions import Annotated
+from configpile import Config, Param, parsers
+
+@dataclass(frozen=True)
+class App(Config):
+    a: Annotated[int, Param.store(parsers.int_parser, default_value="0")]
+"""
+
+
+def test_generated_module_imports(tmp_path: Path) -> None:
+    (tmp_path / "appconf.py").write_text(CONFIG_MODULE)
+    src = str(Path(configpile.__file__).parent.parent)
+    subprocess.run(
+        [sys.executable, "-m", "configpile.codegen", "appconf:App", "appcli.py"],
+        cwd=tmp_path,
+        env={**os.environ, "PYTHONPATH": os.pathsep.join([src, str(tmp_path)])},
+        check=True,
+    )
+    code = f"""
+import sys
+sys.path.insert(0, {str(tmp_path)!r})
+from pathlib import Path
+import appcli
+assert appcli.process_command_line(Path.cwd(), ["--a", "1"], {{}}).a == 1
+"""
+    modules = imported_modules(code)
+    # the processor and the INI, snapshot and code generation modules are not loaded
+    assert {m for m in modules if m.startswith("configpile")} == {
+        "configpile",
+        "configpile.arg",
+        "configpile.collector",
+        "configpile.config",
+        "configpile.enums",
+        "configpile.handlers",
+        "configpile.parsers",
+        "configpile.userr",
+        "configpile.util",
+    }
@@ -0,0 +1,70 @@
+# pylint: disable=missing-class-docstring,missing-function-docstring,missing-module-docstring
+from __future__ import annotations
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Sequence
+
+from typing_extensions import Annotated
+
+from configpile import Config, Err, Param, parsers
+from configpile.ini import ini_cache
+
+
+@dataclass(frozen=True)
+class Layered(Config):
+    config: Annotated[Sequence[Path], Param.config(config_key_name="include")]
+    a: Annotated[int, Param.store(parsers.int_parser, default_value="0")]
+    b: Annotated[int, Param.store(parsers.int_parser, default_value="0")]
+    seen: Annotated[Sequence[str], Param.append1(parsers.stripped_str_parser)]
+
+
+def write(path: Path, *lines: str) -> Path:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text("\n".join(["[common]", *lines]) + "\n")
+    return path
+
+
+def parse(path: Path) -> Layered:
+    res = Layered.parse_command_line_(args=["--config", str(path)], env={})
+    assert isinstance(res, Layered), res
+    return res
+
+
+def test_layers_override_included_files(tmp_path: Path) -> None:
+    write(tmp_path / "base.ini", "a = 1", "b = 1", "seen = base")
+    write(tmp_path / "site" / "site.ini", "include = ../base.ini", "a = 2", "seen = site")
+    write(tmp_path / "team.ini", "include = site/site.ini", "b = 3", "seen = team")
+    job = write(tmp_path / "job.ini", "include = team.ini", "a = 4", "seen = job")
+    res = parse(job)
+    assert (res.a, res.b) == (4, 3)
+    assert res.seen == ["base", "site", "team", "job"]
+
+
+def test_shared_files_are_processed_once(tmp_path: Path) -> None:
+    write(tmp_path / "base.ini", "seen = base")
+    write(tmp_path / "site.ini", "include = base.ini", "seen = site")
+    write(tmp_path / "team.ini", "include = base.ini", "seen = team")
+    (tmp_path / "alias.ini").symlink_to(tmp_path / "base.ini")
+    job = write(tmp_path / "job.ini", "include = site.ini, team.ini, alias.ini", "seen = job")
+    assert parse(job).seen == ["base", "site", "team", "job"]
+
+
+def test_cycles_are_reported(tmp_path: Path) -> None:
+    write(tmp_path / "a.ini", "include = b.ini")
+    write(tmp_path / "b.ini", "include = a.ini")
+    res = Layered.parse_command_line_(args=["--config", str(tmp_path / "a.ini")], env={})
+    assert isinstance(res, Err)
+    messages: List[str] = [e.msg for e in res.errors()]
+    assert any(m.startswith("Include cycle") for m in messages)
+
+
+def test_aliases_are_read_once(tmp_path: Path) -> None:
+    write(tmp_path / "base.ini", "seen = base")
+    (tmp_path / "alias.ini").symlink_to(tmp_path / "base.ini")
+    (tmp_path / "sub").mkdir()
+    job = write(tmp_path / "job.ini", "include = alias.ini, sub/../base.ini", "seen = job")
+    ini_cache.invalidate()
+    before = ini_cache.info()
+    assert parse(job).seen == ["base", "job"]
+    assert ini_cache.info().misses - before.misses == 2
@@ -0,0 +1,63 @@
+# pylint: disable=missing-class-docstring,missing-function-docstring,missing-module-docstring
+from __future__ import annotations
+
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Sequence
+
+from typing_extensions import Annotated
+
+from configpile import Config, Err, Param, parsers
+from configpile.ini import IniCache, IniContents, ini_cache
+
+
+@dataclass(frozen=True)
+class Cached(Config):
+    config: Annotated[Sequence[Path], Param.config()]
+    a: Annotated[int, Param.store(parsers.int_parser, default_value="0")]
+
+
+def test_files_are_read_once(tmp_path: Path) -> None:
+    path = tmp_path / "cached.ini"
+    path.write_text("[common]\na = 1\n")
+    before = ini_cache.info()
+    for _ in range(3):
+        res = Cached.parse_command_line_(args=["--config", str(path)], env={})
+        assert isinstance(res, Cached) and res.a == 1
+    after = ini_cache.info()
+    assert (after.misses - before.misses, after.hits - before.hits) == (1, 2)
+
+
+def test_changes_are_detected(tmp_path: Path) -> None:
+    cache = IniCache()
+    path = tmp_path / "changed.ini"
+    path.write_text("[common]\na = 1\n")
+    assert cache.get(path) == IniContents([("common", [("a", "1", None)])])
+    path.write_text("[common]\na = 22\n")
+    os.utime(path, ns=(0, 1))
+    assert cache.get(path) == IniContents([("common", [("a", "22", None)])])
+    assert cache.info().misses == 2
+
+
+def test_invalidate_and_eviction(tmp_path: Path) -> None:
+    cache = IniCache(maxsize=2)
+    paths = [tmp_path / f"{i}.ini" for i in range(3)]
+    for path in paths:
+        path.write_text("[common]\n")
+        cache.get(path)
+    assert cache.info().currsize == 2
+    cache.get(paths[2])
+    assert cache.info().hits == 1
+    cache.invalidate(paths[2])
+    assert cache.info().currsize == 1
+    cache.invalidate()
+    assert cache.info().currsize == 0
+
+
+def test_errors(tmp_path: Path) -> None:
+    cache = IniCache()
+    assert isinstance(cache.get(tmp_path / "missing.ini"), Err)
+    assert isinstance(cache.get(tmp_path), Err)
+    (tmp_path / "invalid.ini").write_text("no section\n")
+    assert isinstance(cache.get(tmp_path / "invalid.ini"), Err)
@@ -0,0 +1,91 @@
+# pylint: disable=missing-class-docstring,missing-function-docstring,missing-module-docstring
+from __future__ import annotations
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import ClassVar, Optional
+
+import pytest
+from typing_extensions import Annotated
+
+from configpile import Config, Err, Param, parsers
+from configpile.ini import IniContents, IniScanner, ini_cache
+
+
+def fail_parse(text: str, lowercase_keys: bool = False) -> IniContents:
+    raise AssertionError("The file should not be parsed")
+
+
+def test_stored_contents(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    path = tmp_path / "app.ini"
+    path.write_text("[common]\nvalue = 1\n")
+    cache_dir = tmp_path / "cache"
+    expected = IniContents([("common", [("value", "1", None)])])
+    assert IniContents.read(path, cache_dir=cache_dir) == expected
+    assert len(list(cache_dir.glob("*.pickle"))) == 1
+    with monkeypatch.context() as m:
+        m.setattr(IniContents, "parse", staticmethod(fail_parse))
+        assert IniContents.read(path, cache_dir=cache_dir) == expected
+    path.write_text("[common]\nvalue = 2\n")
+    assert IniContents.read(path, cache_dir=cache_dir) == IniContents(
+        [("common", [("value", "2", None)])]
+    )
+    assert len(list(cache_dir.glob("*.pickle"))) == 2
+
+
+def test_scanner_settings(tmp_path: Path) -> None:
+    path = tmp_path / "app.ini"
+    path.write_text("[common]\nvalue = 1\n[other]\nvalue = 2\n")
+    cache_dir = tmp_path / "cache"
+    IniContents.read(path, cache_dir=cache_dir)
+    all_sections = IniContents.read(path, IniScanner(None), cache_dir)
+    common = IniContents.read(path, IniScanner(frozenset(["common"])), cache_dir)
+    assert all_sections == IniContents(
+        [("common", [("value", "1", 2)]), ("other", [("value", "2", 4)])]
+    )
+    assert common == IniContents([("common", [("value", "1", 2)])])
+    assert len(list(cache_dir.glob("*.pickle"))) == 3
+
+
+def test_corrupt_entry(tmp_path: Path) -> None:
+    path = tmp_path / "app.ini"
+    path.write_text("[common]\nvalue = 1\n")
+    cache_dir = tmp_path / "cache"
+    expected = IniContents.read(path, cache_dir=cache_dir)
+    (entry,) = cache_dir.glob("*.pickle")
+    entry.write_bytes(b"garbage")
+    assert IniContents.read(path, cache_dir=cache_dir) == expected
+    assert IniContents.read(path) == expected
+
+
+def test_errors_not_stored(tmp_path: Path) -> None:
+    path = tmp_path / "app.ini"
+    path.write_text("value = 1\n")
+    cache_dir = tmp_path / "cache"
+    assert isinstance(IniContents.read(path, IniScanner(None), cache_dir), Err)
+    assert not cache_dir.exists()
+
+
+def test_config(tmp_path: Path) -> None:
+    @dataclass(frozen=True)
+    class App(Config):
+        ini_cache_dir_: ClassVar[Optional[Path]] = tmp_path / "cache"
+        value: Annotated[int, Param.store(parsers.int_parser, default_value="0")]
+
+    path = tmp_path / "app.ini"
+    path.write_text("[common]\nvalue = 3\n")
+    ini_cache.invalidate()
+    assert App.parse_ini_file_(path) == App(value=3)
+    assert len(list((tmp_path / "cache").glob("*.pickle"))) == 1
+
+
+def test_same_lines_as_uncached(tmp_path: Path) -> None:
+    path = tmp_path / "app.ini"
+    path.write_bytes("[common]\r\na = x y\x0cz\r\nb = 2\rc = 3\n".encode("utf-8"))
+    scanner = IniScanner(None)
+    uncached = IniContents.read(path, scanner)
+    assert uncached == IniContents(
+        [("common", [("a", "x y\x0cz", 2), ("b", "2", 3), ("c", "3", 4)])]
+    )
+    assert IniContents.read(path, scanner, tmp_path / "cache") == uncached
+    assert IniContents.read(path, scanner, tmp_path / "cache") == uncached
@@ -0,0 +1,75 @@
+# pylint: disable=missing-class-docstring,missing-function-docstring,missing-module-docstring
+from __future__ import annotations
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import ClassVar, Sequence
+
+import pytest
+from typing_extensions import Annotated
+
+from configpile import Config, Err, Param, parsers
+from configpile.ini import IniContents, IniScanner
+
+TEXT = """# header comment
+[skipped]
+a = [not parsed
+[common]
+a = 1
+; comment
+b: first
+  second
+
+c = %(a)s
+"""
+
+
+def test_scanner() -> None:
+    res = IniScanner(frozenset(["common"])).scan(TEXT.splitlines())
+    assert res == IniContents(
+        [("common", [("a", "1", 5), ("b", "first\nsecond", 7), ("c", "%(a)s", 10)])]
+    )
+
+
+def test_scanner_errors() -> None:
+    scanner = IniScanner(None)
+    assert scanner.scan(["[s]", "a = 1", "a = 2"]) == Err.make("Duplicate key a", ini_line=3)
+    assert scanner.scan(["a = 1"]) == Err.make("Key outside of a section", ini_line=1)
+    assert scanner.scan(["[s]", "novalue"]) == Err.make("Expected key = value", ini_line=2)
+    repeated = IniScanner(None, repeated_keys=True).scan(["[s]", "a = 1", "a = 2"])
+    assert repeated == IniContents([("s", [("a", "1", 2), ("a", "2", 3)])])
+
+
+@dataclass(frozen=True)
+class Streamed(Config):
+    ini_streaming_: ClassVar[bool] = True
+    ini_repeated_keys_: ClassVar[bool] = True
+    ini_strict_sections_: ClassVar[Sequence[str]] = ["strict"]
+    value: Annotated[int, Param.store(parsers.int_parser, default_value="0")]
+    tag: Annotated[Sequence[str], Param.append1(parsers.stripped_str_parser)]
+
+
+def test_repeated_keys(tmp_path: Path) -> None:
+    path = tmp_path / "streamed.ini"
+    path.write_text("[common]\ntag = a\ntag = b\nvalue = 2\n[other]\ntag = c\n")
+    assert Streamed.parse_ini_file_(path) == Streamed(value=2, tag=["a", "b"])
+
+
+def test_line_numbers_in_errors(tmp_path: Path) -> None:
+    path = tmp_path / "invalid.ini"
+    path.write_text("[common]\nvalue = 1\n\nvalue = x\n[strict]\nunknown = 1\n")
+    res = Streamed.parse_ini_file_(path)
+    assert isinstance(res, Err)
+    lines = {e.msg: dict(e.contexts)["ini_line"] for e in res.errors()}
+    assert lines["Unknown key unknown"] == 6
+    assert [line for msg, line in lines.items() if msg != "Unknown key unknown"] == [4]
+
+
+def test_repeated_keys_require_streaming() -> None:
+    @dataclass(frozen=True)
+    class Invalid(Config):
+        ini_repeated_keys_: ClassVar[bool] = True
+        value: Annotated[int, Param.store(parsers.int_parser, default_value="0")]
+
+    with pytest.raises(ValueError):
+        Invalid.processor_()
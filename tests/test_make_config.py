@@ -0,0 +1,55 @@
+# pylint: disable=missing-class-docstring,missing-function-docstring,missing-module-docstring
+from __future__ import annotations
+
+import pytest
+
+from configpile import Config, Derived, Param, parsers
+from configpile.config import make_config
+from configpile.util import ClassDoc
+
+Schema = make_config(
+    "Schema",
+    [
+        (
+            "alpha",
+            Param.store(
+                parsers.float_parser,
+                default_value="0.5",
+                env_var_name=Derived.SNAKE_CASE_UPPER_CASE,
+            ),
+            "Learning rate",
+        ),
+        ("steps", Param.store(parsers.int_parser), None),
+    ],
+    description="Hyperparameters",
+    env_prefix_="HP_",
+)
+
+
+def test_parse() -> None:
+    res = Schema.parse_command_line_(args=["--steps", "3"], env={"HP_ALPHA": "0.1"})
+    assert res == Schema(alpha=0.1, steps=3)
+    assert repr(res) == "Schema(alpha=0.1, steps=3)"
+    assert hash(res) == hash(Schema(0.1, 3))
+    assert issubclass(Schema, Config)
+
+
+def test_help_without_source(monkeypatch: pytest.MonkeyPatch) -> None:
+    def fail(t: type, attribute_names: object = None) -> ClassDoc[object]:
+        raise AssertionError("Source should not be parsed")
+
+    monkeypatch.setattr(ClassDoc, "make", fail)
+    help_text = Schema.processor_().argument_parser.format_help()
+    assert "Hyperparameters" in help_text and "Learning rate" in help_text
+
+
+def test_constructor_errors() -> None:
+    with pytest.raises(TypeError):
+        Schema(alpha=0.5)
+    with pytest.raises(TypeError):
+        Schema(0.5, 3, beta=2)
+
+
+def test_bases_must_include_config() -> None:
+    with pytest.raises(TypeError):
+        make_config("NotConfig", [], bases=(object,))
@@ -0,0 +1,80 @@
+# pylint: disable=missing-class-docstring,missing-function-docstring,missing-module-docstring
+from __future__ import annotations
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import ClassVar, List, Sequence
+
+from typing_extensions import Annotated
+
+from configpile import Config, Err, Param, parsers
+from configpile.enums import ParseMode
+
+parsed: List[str] = []
+
+
+def counting_int(value: str) -> int:
+    parsed.append(value)
+    return int(value)
+
+
+counting_parser = parsers.Parser.from_function_that_raises(counting_int, ValueError)
+
+
+@dataclass(frozen=True)
+class LastOnly(Config):
+    parse_mode_: ClassVar[ParseMode] = ParseMode.LAST_ONLY
+    a: Annotated[int, Param.store(counting_parser, default_value="0", env_var_name="LAZY_A")]
+    config: Annotated[Sequence[Path], Param.config()]
+
+
+@dataclass(frozen=True)
+class ValidateAll(LastOnly):
+    parse_mode_: ClassVar[ParseMode] = ParseMode.VALIDATE_ALL
+
+
+def test_only_the_last_value_is_parsed() -> None:
+    LastOnly.processor_()
+    parsed.clear()
+    res = LastOnly.parse_command_line_(args=["--a", "x", "--a", "2"], env={"LAZY_A": "y"})
+    assert res == LastOnly(a=2, config=[])
+    assert parsed == ["2"]
+
+
+def test_all_values_are_validated() -> None:
+    res = ValidateAll.parse_command_line_(args=["--a", "x", "--a", "2"], env={"LAZY_A": "y"})
+    assert isinstance(res, Err)
+    contexts = [dict(e.contexts) for e in res.errors()]
+    assert {"environment_variable": "LAZY_A", "param": "a"} in contexts
+    assert {"flag": "--a", "param": "a"} in contexts
+
+
+def test_errors_keep_their_origin(tmp_path: Path) -> None:
+    (tmp_path / "lazy.ini").write_text("[common]\na = z\n")
+    res = LastOnly.parse_command_line_(args=["--config", str(tmp_path / "lazy.ini")], env={})
+    assert isinstance(res, Err)
+    assert dict(res.errors()[0].contexts) == {
+        "ini_file": tmp_path / "lazy.ini",
+        "ini_section": "common",
+        "param": "a",
+    }
+
+
+@dataclass(frozen=True)
+class LastOnlyTags(Config):
+    parse_mode_: ClassVar[ParseMode] = ParseMode.LAST_ONLY
+    tags: Annotated[Sequence[int], Param.append1(parsers.int_parser)]
+
+
+@dataclass(frozen=True)
+class ValidateAllTags(LastOnlyTags):
+    parse_mode_: ClassVar[ParseMode] = ParseMode.VALIDATE_ALL
+
+
+def test_appended_values_are_all_kept() -> None:
+    for config in [LastOnlyTags, ValidateAllTags]:
+        res = config.parse_command_line_(args=["--tags", "1", "--tags", "2"], env={})
+        assert res == config(tags=[1, 2])
+        assert isinstance(
+            config.parse_command_line_(args=["--tags", "x", "--tags", "2"], env={}), Err
+        )
@@ -6,7 +6,7 @@ from typing import Sequence
 
 from typing_extensions import Annotated
 
-from configpile import Config, Param, Positional, parsers
+from configpile import Config, Err, Param, Positional, parsers
 
 
 @dataclass(frozen=True)
@@ -34,5 +34,84 @@ def test_positional() -> None:
     assert res.strings == ["beautiful", "life"]
 
 
+@dataclass(frozen=True)
+class Files(Config):
+    first: Annotated[int, Param.store(parsers.int_parser, positional=Positional.ONCE)]
+    verbose: Annotated[int, Param.store(parsers.int_parser, default_value="0")]
+    files: Annotated[
+        Sequence[str],
+        Param.append1(parsers.str_parser, positional=Positional.ZERO_OR_MORE, long_flag_name=None),
+    ]
+    numbers: Annotated[Sequence[int], Param.append1(parsers.int_parser)]
+
+
+def test_end_of_flags() -> None:
+    res = Files.parse_command_line_(args=["1", "a", "--verbose", "2", "--", "--verbose"], env={})
+    assert res == Files(first=1, verbose=2, files=["a", "--verbose"], numbers=[])
+    res = Files.parse_command_line_(args=["--", "3", "-1", "b"], env={})
+    assert res == Files(first=3, verbose=0, files=["-1", "b"], numbers=[])
+
+
+def test_runs_are_collected_in_lists() -> None:
+    args = ["1", "a", "b", "c"]
+    res = Files.parse_command_line_(args=args, env={})
+    assert isinstance(res, Files) and res.files == ["a", "b", "c"]
+    assert type(res.files) is list  # pylint: disable=unidiomatic-typecheck
+
+
+@dataclass(frozen=True)
+class Ints(Config):
+    flag: Annotated[int, Param.store(parsers.int_parser, default_value="0")]
+    values: Annotated[
+        Sequence[int],
+        Param.append1(parsers.int_parser, positional=Positional.ONE_OR_MORE, long_flag_name=None),
+    ]
+
+
+def test_parsed_runs() -> None:
+    res = Ints.parse_command_line_(args=["1", "2", "--flag", "3", "4"], env={})
+    assert res == Ints(flag=3, values=[1, 2, 4])
+    assert isinstance(Ints.parse_command_line_(args=["1", "x", "3"], env={}), Err)
+
+
 def test_argparse() -> None:
     WithPositional.processor_().argument_parser  # pylint: disable=expression-not-assigned
+
+
+class CountingArgs(Sequence[str]):
+    def __init__(self, args: Sequence[str]) -> None:
+        self.args = args
+        self.reads = 0
+
+    def __len__(self) -> int:
+        return len(self.args)
+
+    def __getitem__(self, index):  # type: ignore
+        self.reads += 1
+        return self.args[index]
+
+
+def test_interleaved_runs_are_linear() -> None:
+    n = 2000
+    args = CountingArgs(["0"] + [a for i in range(n) for a in ["--numbers", str(i), f"f{i}"]])
+    res = Files.parse_command_line_(args=args, env={})
+    assert res == Files(
+        first=0, verbose=0, files=[f"f{i}" for i in range(n)], numbers=list(range(n))
+    )
+    assert args.reads < 10 * len(args)
+
+
+@dataclass(frozen=True)
+class Tupled(Config):
+    y: Annotated[
+        Sequence[int],
+        Param.append(parsers.int_parser.map(lambda v: (v,)), short_flag_name="-y"),
+    ]
+
+
+def test_appended_values_are_lists() -> None:
+    for args in [[], ["-y", "1"], ["-y", "1", "-y", "2"]]:
+        res = Tupled.parse_command_line_(args=args, env={})
+        assert (
+            isinstance(res, Tupled) and type(res.y) is list
+        )  # pylint: disable=unidiomatic-typecheck
@@ -0,0 +1,44 @@
+# pylint: disable=missing-class-docstring,missing-function-docstring,missing-module-docstring
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+import pytest
+from typing_extensions import Annotated
+
+from configpile import Config, Param, parsers
+from configpile.config import precompiled
+from configpile.processor import processor_cache
+
+
+@precompiled
+@dataclass(frozen=True)
+class Eager(Config):
+    a: Annotated[int, Param.store(parsers.int_parser, default_value="1")]
+
+
+def test_processor_is_built_at_definition() -> None:
+    hits = processor_cache.info().hits
+    Eager.processor_()
+    assert processor_cache.info().hits == hits + 1
+
+
+def test_invalid_default_fails_at_definition() -> None:
+    with pytest.raises(ValueError):
+
+        @precompiled
+        @dataclass(frozen=True)
+        class Invalid(Config):  # pylint: disable=unused-variable
+            a: Annotated[int, Param.store(parsers.int_parser, default_value="x")]
+
+
+def test_background_warm_up() -> None:
+    @dataclass(frozen=True)
+    class Background(Config):
+        a: Annotated[int, Param.store(parsers.int_parser, default_value="1")]
+
+    processor_cache.warm_up(Background).join()
+    hits = processor_cache.info().hits
+    assert Background.parse_command_line_(args=["--a", "2"], env={}) == Background(a=2)
+    assert processor_cache.info().hits == hits + 1
+    assert precompiled(background=True)(Background) is Background
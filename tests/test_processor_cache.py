@@ -0,0 +1,77 @@
+# pylint: disable=missing-class-docstring,missing-function-docstring,missing-module-docstring
+from __future__ import annotations
+
+import gc
+import weakref
+from dataclasses import dataclass
+from typing import Any, Sequence
+
+import pytest
+from typing_extensions import Annotated
+
+from configpile import Config, Param, Positional, parsers
+from configpile.config import make_config
+from configpile.processor import Processor, processor_cache
+
+
+@dataclass(frozen=True)
+class Cached(Config):
+    a: Annotated[int, Param.store(parsers.int_parser, default_value="1")]
+    values: Annotated[
+        Sequence[int],
+        Param.append1(parsers.int_parser, positional=Positional.ONCE, long_flag_name=None),
+    ]
+
+
+@dataclass(frozen=True)
+class CachedChild(Cached):
+    b: Annotated[int, Param.store(parsers.int_parser, default_value="2")]
+
+
+def test_processor_is_cached() -> None:
+    first = Cached.processor_()
+    hits = processor_cache.info().hits
+    assert Cached.processor_() is first
+    assert processor_cache.info().hits == hits + 1
+
+
+def test_invalidate() -> None:
+    parent = Cached.processor_()
+    child = CachedChild.processor_()
+    Cached.invalidate_processor_()
+    assert Cached.processor_() is not parent
+    assert CachedChild.processor_() is not child
+
+
+def test_cached_processor_reuses_positionals() -> None:
+    for _ in range(2):
+        res = Cached.parse_command_line_(args=["3"], env={})
+        assert isinstance(res, Cached)
+        assert res.values == [3]
+
+
+def test_invalidate_during_build(monkeypatch: pytest.MonkeyPatch) -> None:
+    @dataclass(frozen=True)
+    class Modified(Config):
+        a: Annotated[int, Param.store(parsers.int_parser, default_value="1")]
+
+    make = Processor.make
+
+    def make_and_invalidate(config_type: Any, base: Any = None) -> Any:
+        processor = make(config_type, base)
+        processor_cache.invalidate(config_type)
+        return processor
+
+    with monkeypatch.context() as m:
+        m.setattr(Processor, "make", staticmethod(make_and_invalidate))
+        stale = Modified.processor_()
+    assert Modified.processor_() is not stale
+
+
+def test_dynamic_classes_are_collected() -> None:
+    config_type = make_config("Dynamic", [("a", Param.store(parsers.int_parser), None)])
+    config_type.processor_()
+    ref = weakref.ref(config_type)
+    del config_type
+    gc.collect()
+    assert ref() is None
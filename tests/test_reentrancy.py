@@ -0,0 +1,39 @@
+# pylint: disable=missing-class-docstring,missing-function-docstring,missing-module-docstring
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import List, Sequence
+
+from typing_extensions import Annotated
+
+from configpile import Config, Param, Positional, parsers
+
+
+@dataclass(frozen=True)
+class Request(Config):
+    verbose: Annotated[int, Param.store(parsers.int_parser, default_value="0")]
+    first: Annotated[int, Param.store(parsers.int_parser, positional=Positional.ONCE)]
+    second: Annotated[int, Param.store(parsers.int_parser, positional=Positional.ONCE)]
+    rest: Annotated[
+        Sequence[int],
+        Param.append1(parsers.int_parser, positional=Positional.ZERO_OR_MORE, long_flag_name=None),
+    ]
+
+
+def check(i: int) -> bool:
+    args: List[str] = [str(i), "--verbose", str(i % 3), str(i + 1), *[str(i)] * (i % 5)]
+    return Request.parse_command_line_(args=args, env={}) == Request(
+        verbose=i % 3, first=i, second=i + 1, rest=[i] * (i % 5)
+    )
+
+
+def test_processor_is_reusable() -> None:
+    assert check(1)
+    assert check(2)
+
+
+def test_concurrent_parses() -> None:
+    Request.processor_()
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        assert all(executor.map(check, range(2000)))
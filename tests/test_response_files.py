@@ -0,0 +1,68 @@
+# pylint: disable=missing-class-docstring,missing-function-docstring,missing-module-docstring
+from __future__ import annotations
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Sequence
+
+from typing_extensions import Annotated
+
+from configpile import Config, Param, Positional, parsers
+from configpile.enums import ResponseFileSyntax
+from configpile.userr import Err1
+
+
+@dataclass(frozen=True)
+class Files(Config):
+    response_file_prefix_ = "@"
+
+    count: Annotated[int, Param.store(parsers.int_parser, default_value="0")]
+    tag: Annotated[Sequence[str], Param.append1(parsers.stripped_str_parser)]
+    inputs: Annotated[
+        Sequence[str],
+        Param.append1(
+            parsers.stripped_str_parser, positional=Positional.ZERO_OR_MORE, long_flag_name=None
+        ),
+    ]
+
+
+@dataclass(frozen=True)
+class ShellFiles(Files):
+    response_file_syntax_ = ResponseFileSyntax.SHELL
+
+
+def test_response_file(tmp_path: Path) -> None:
+    (tmp_path / "args.txt").write_text("--tag\na b\n\nin1\n@nested.txt\n")
+    (tmp_path / "nested.txt").write_text("--count\n3\n")
+    res = Files.parse_command_line_(cwd=tmp_path, args=["in0", "@args.txt", "in2"], env={})
+    assert res == Files(count=3, tag=["a b"], inputs=["in0", "in1", "in2"])
+
+
+def test_flags_across_chunks(tmp_path: Path) -> None:
+    lines = ["in0"] + [line for i in range(3000) for line in ["--tag", f"t{i}"]]
+    (tmp_path / "args.txt").write_text("\n".join(lines))
+    res = Files.parse_command_line_(cwd=tmp_path, args=["@args.txt"], env={})
+    assert isinstance(res, Files)
+    assert res.tag == [f"t{i}" for i in range(3000)]
+
+
+def test_shell_syntax(tmp_path: Path) -> None:
+    (tmp_path / "args.txt").write_text("--tag 'a b' in1  # comment\n")
+    res = ShellFiles.parse_command_line_(cwd=tmp_path, args=["@args.txt"], env={})
+    assert res == ShellFiles(count=0, tag=["a b"], inputs=["in1"])
+
+
+def test_errors_report_file_and_line(tmp_path: Path) -> None:
+    (tmp_path / "args.txt").write_text("--count\nx\n")
+    res = Files.parse_command_line_(cwd=tmp_path, args=["@args.txt"], env={})
+    assert isinstance(res, Err1)
+    assert ("line", 2) in res.contexts
+    assert ("response_file", tmp_path / "args.txt") in res.contexts
+
+
+def test_nesting_depth_and_missing_files(tmp_path: Path) -> None:
+    (tmp_path / "loop.txt").write_text("@loop.txt\n")
+    res = Files.parse_command_line_(cwd=tmp_path, args=["@loop.txt"], env={})
+    assert isinstance(res, Err1) and "nested" in res.msg
+    res = Files.parse_command_line_(cwd=tmp_path, args=["@missing.txt"], env={})
+    assert isinstance(res, Err1) and "Cannot read" in res.msg
@@ -0,0 +1,52 @@
+# pylint: disable=missing-class-docstring,missing-function-docstring,missing-module-docstring
+from __future__ import annotations
+
+from dataclasses import dataclass
+from pathlib import Path
+
+import pytest
+from typing_extensions import Annotated
+
+from configpile import Config, Param, parsers
+from configpile.snapshot import SchemaSnapshot
+from configpile.util import ClassDoc
+
+
+@dataclass(frozen=True)
+class Snapshotted(Config):
+    a: Annotated[int, Param.store(parsers.int_parser)]  #: Help for a
+
+
+def _help_of_a() -> str:
+    Snapshotted.invalidate_processor_()
+    help_a = Snapshotted.processor_().documented_args["a"].help
+    assert help_a is not None
+    return help_a
+
+
+def test_snapshot_skips_source_extraction(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(Snapshotted, "schema_cache_dir_", tmp_path)
+    assert _help_of_a() == "Help for a"
+    path = SchemaSnapshot.path_for(Snapshotted)
+    assert path is not None and path.exists()
+
+    def fail(t: type) -> ClassDoc[object]:
+        raise AssertionError("Source should not be parsed")
+
+    monkeypatch.setattr(ClassDoc, "make", fail)
+    assert _help_of_a() == "Help for a"
+
+
+def test_corrupt_snapshot_is_rebuilt(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(Snapshotted, "schema_cache_dir_", tmp_path)
+    path = SchemaSnapshot.path_for(Snapshotted)
+    assert path is not None
+    path.write_text("{not json", encoding="utf-8")
+    assert _help_of_a() == "Help for a"
+    assert SchemaSnapshot.load(path, Snapshotted) is not None
+
+
+def test_failed_save_leaves_no_file(tmp_path: Path) -> None:
+    snapshot = SchemaSnapshot("0", "hash", {"a": {"help": object()}})
+    snapshot.save(tmp_path / "snapshot.json")
+    assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,56 @@
+# pylint: disable=missing-class-docstring,missing-function-docstring,missing-module-docstring
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+import pytest
+
+from configpile import Err
+from configpile.enums import SpecialAction
+from configpile.subcommands import Subcommand, Subcommands
+
+cli = Subcommands.make(
+    Subcommand.make("calc", "configpile.calculator:Calc", "Sums values"),
+    Subcommand.make("missing", "configpile_missing_module:Missing", "Never imported"),
+    prog="tool",
+)
+
+
+def test_only_selected_subcommand_is_imported() -> None:
+    res = cli.parse_command_line(cwd=Path.cwd(), args=["calc", "1", "2"], env={})
+    assert not isinstance(res, Err)
+    name, config = res
+    assert name == "calc"
+    assert config.values == [1.0, 2.0]  # type: ignore[union-attr]
+    assert "configpile_missing_module" not in sys.modules
+
+
+def test_top_level_help_does_not_import() -> None:
+    assert cli.parse_command_line(args=["-h"], env={}) == ("", SpecialAction.HELP)
+    text = cli.format_help()
+    assert "calc     Sums values" in text
+    assert "missing  Never imported" in text
+    assert "configpile_missing_module" not in sys.modules
+
+
+def test_errors() -> None:
+    assert isinstance(cli.parse_command_line(args=[], env={}), Err)
+    assert isinstance(cli.parse_command_line(args=["unknown"], env={}), Err)
+    assert isinstance(cli.parse_command_line(args=["calc", "--digits", "x"], env={}), Err)
+    with pytest.raises(ImportError):
+        cli.parse_command_line(args=["missing"], env={})
+
+
+def test_summaries_from_docstrings() -> None:
+    filled = Subcommands.make(
+        Subcommand.make("calc", "configpile.calculator:Calc")
+    ).with_summaries()
+    assert filled.commands["calc"].summary.startswith("Command-line tool that sums")
+
+
+def test_invalid_registrations() -> None:
+    with pytest.raises(ValueError):
+        Subcommand.make("calc", "configpile.calculator.Calc")
+    with pytest.raises(ValueError):
+        Subcommands.make(cli.commands["calc"], cli.commands["calc"])